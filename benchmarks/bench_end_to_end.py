@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Benchmark a full sync against a local stand-in API.
+
+Starts `mock_api.py` in a child process, runs `TapRestApiPost.sync_all()` against
+it with Singer output sent to a counting sink, and reports records/sec,
+requests/sec, peak RSS of the tap process and the time spent in each stage:
+
+- request:   sending requests and validating responses (network and server time)
+- parse:     extracting records from response bodies
+- transform: `post_process`
+- emit:      serializing and writing Singer messages
+
+With `--page-concurrency` above 1, requests run on worker threads (or as tasks
+with `--engine asyncio`) and their time is summed across them, so stages can add
+up to more than the wall time.
+
+Run from the repository root:
+
+    python benchmarks/bench_end_to_end.py --pages 200 --page-size 100 --latency 0.02
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import mock_api  # noqa: E402
+
+from tap_rest_api_post.tap import TapRestApiPost  # noqa: E402
+
+STAGES = ("request", "parse", "transform", "emit")
+
+
+def serve(options: Dict[str, Any], connection: Any) -> None:
+    """Run the mock API until the parent closes `connection`."""
+    server = mock_api.start_server(mock_api.settings_from_args(argparse.Namespace(**options)))
+    connection.send(server.server_address[1])
+    try:
+        connection.recv()
+    except EOFError:
+        pass
+    server.shutdown()
+
+
+def make_config(port: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Build a tap config with one Luganodes-style stream against the mock API."""
+    return {
+        "start_date": "2025-01-01",
+        "current_date": "2025-01-15",
+        "streams": [
+            {
+                "name": "bench_rewards",
+                "api_url": f"http://127.0.0.1:{port}",
+                "path": "/rewards/daily",
+                "api_key": "bench",
+                "primary_keys": ["epoch"],
+                "records_path": "$.data.rewards[*]",
+                "stream_parsing": args.stream_parsing,
+                "engine": args.engine,
+                **({"spool": {"threshold_mb": args.spool_threshold_mb}} if args.spool_threshold_mb is not None else {}),
+                "batch_transformations": args.batch_transformations,
+                "compression": {"response_encodings": ["gzip"], "request_body_gzip": True} if args.compression else {},
+                "body": {"stake_account_address": "bench", "start_date": "", "end_date": ""},
+                "date_handling": {"type": "date_string", "start_field": "start_date", "end_field": "end_date"},
+                "pagination": {
+                    "strategy": "total_pages",
+                    "page_param": "page",
+                    "page_size_param": "limit",
+                    "page_size": args.page_size,
+                    "total_pages_path": "$.data.pagination.totalPages",
+                    "concurrency": args.page_concurrency,
+                    "auto_page_size": {
+                        "enabled": args.auto_page_size,
+                        "min_page_size": args.min_page_size,
+                        "max_page_size": args.max_page_size,
+                    },
+                },
+                "transformations": {
+                    "field_mappings": {"stakeAccount": "stake_account"},
+                    "value_transformations": {
+                        "principal": {"type": "divide", "divisor": 1000000000},
+                        "epochReward": {"type": "divide", "divisor": 1000000000},
+                        "totalRewards": {"type": "divide", "divisor": 1000000000},
+                    },
+                    "field_extractions": {
+                        "protocol_rewards": {"source_field": "rewards", "type": "nested_array", "filter_type": "protocol"},
+                        "mev_rewards": {"source_field": "rewards", "type": "nested_array", "filter_type": "mev"},
+                        "balance": {"source_field": "balances", "type": "first_array_item"},
+                    },
+                },
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "date": {"type": "string", "format": "date"},
+                        "epoch": {"type": "integer"},
+                        "timestamp": {"type": "string", "format": "date-time"},
+                        "stake_account": {"type": "string"},
+                        "validator": {"type": "string"},
+                        "principal": {"type": ["number", "null"]},
+                        "epochReward": {"type": ["number", "null"]},
+                        "totalRewards": {"type": ["number", "null"]},
+                        "protocol_rewards": {"type": ["number", "null"]},
+                        "mev_rewards": {"type": ["number", "null"]},
+                        "balance": {"type": ["number", "null"]},
+                        "rewards": {"type": ["array", "null"]},
+                        "balances": {"type": ["array", "null"]},
+                    },
+                },
+            }
+        ],
+    }
+
+
+class StageTimer:
+    """Accumulates time per stage from any thread."""
+
+    def __init__(self) -> None:
+        self.seconds = {stage: 0.0 for stage in STAGES}
+        self.calls = {stage: 0 for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.calls[stage] += 1
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        """Time every call of `func`."""
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - started)
+
+        return timed
+
+    def wrap_async(self, stage: str, func: Callable) -> Callable:
+        """Time every call of the coroutine function `func`."""
+        async def timed(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.add(stage, time.perf_counter() - started)
+
+        return timed
+
+    def wrap_iterator(self, stage: str, func: Callable[..., Iterable]) -> Callable[..., Iterator]:
+        """Time the work done producing each item of the iterable `func` returns."""
+        def timed(*args: Any, **kwargs: Any) -> Iterator:
+            items = iter(func(*args, **kwargs))
+            elapsed = 0.0
+            try:
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    finally:
+                        elapsed += time.perf_counter() - started
+                    yield item
+            finally:
+                self.add(stage, elapsed)
+
+        return timed
+
+
+class CountingSink:
+    """Stands in for stdout, counting what the tap writes."""
+
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.lines = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text)
+        self.lines += text.count("\n")
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MiB, or -1 if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return -1.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def run_sync(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Sync every stream of `config` and return the measurements."""
+    timer = StageTimer()
+    records = 0
+    records_lock = threading.Lock()
+
+    tap = TapRestApiPost(config=config)
+    tap.write_message = timer.wrap("emit", tap.write_message)  # type: ignore[method-assign]
+    for stream in tap.streams.values():
+        stream._request = timer.wrap("request", stream._request)  # type: ignore[method-assign]
+        stream._async_request = timer.wrap_async("request", stream._async_request)  # type: ignore[method-assign]
+        stream.parse_response = timer.wrap_iterator("parse", stream.parse_response)  # type: ignore[method-assign]
+        post_process = timer.wrap("transform", stream.post_process)
+
+        def counted_post_process(row: dict, context: Any = None, post_process: Callable = post_process) -> Any:
+            nonlocal records
+            with records_lock:
+                records += 1
+            return post_process(row, context)
+
+        stream.post_process = counted_post_process  # type: ignore[method-assign]
+
+    sink = CountingSink()
+    stdout = sys.stdout
+    sys.stdout = sink  # type: ignore[assignment]
+    started = time.perf_counter()
+    try:
+        tap.sync_all()
+    finally:
+        wall = time.perf_counter() - started
+        sys.stdout = stdout
+
+    return {
+        "records": records,
+        "requests": timer.calls["request"],
+        "wall_seconds": wall,
+        "records_per_second": records / wall if wall else 0.0,
+        "requests_per_second": timer.calls["request"] / wall if wall else 0.0,
+        "output_mib": sink.bytes / 1024 / 1024,
+        "output_lines": sink.lines,
+        "peak_rss_mib": peak_rss_mb(),
+        "stage_seconds": timer.seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mock_api.add_arguments(parser)
+    parser.add_argument("--page-concurrency", type=int, default=1, help="pagination.concurrency of the stream")
+    parser.add_argument(
+        "--engine", choices=["requests", "asyncio"], default="requests", help="Request engine of the stream"
+    )
+    parser.add_argument(
+        "--spool-threshold-mb", type=float, help="Spool response bodies larger than this many MiB to disk"
+    )
+    parser.add_argument("--stream-parsing", action="store_true", help="Enable stream_parsing")
+    parser.add_argument("--batch-transformations", action="store_true", help="Enable batch_transformations")
+    parser.add_argument("--auto-page-size", action="store_true", help="Tune the page size, starting from --page-size")
+    parser.add_argument("--min-page-size", type=int, default=10, help="pagination.auto_page_size.min_page_size")
+    parser.add_argument("--max-page-size", type=int, default=10000, help="pagination.auto_page_size.max_page_size")
+    parser.add_argument(
+        "--compression", action="store_true", help="Request gzip responses and gzip request bodies (pair with --gzip)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Keep the tap's INFO logs")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.INFO)
+
+    server_options = {
+        key: getattr(args, key)
+        for key in (
+            "pages", "page_size", "latency", "error_rate", "error_status", "seed", "gzip", "max_limit", "descending"
+        )
+    }
+    parent_connection, child_connection = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(server_options, child_connection), daemon=True)
+    server.start()
+    try:
+        port = parent_connection.recv()
+        results = run_sync(make_config(port, args))
+    finally:
+        parent_connection.close()
+        server.join(timeout=5)
+
+    expected = args.pages * args.page_size
+    if results["records"] != expected:
+        print(f"WARNING: synced {results['records']} records, expected {expected}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"records:      {results['records']:,} in {results['wall_seconds']:.2f}s")
+    print(f"records/sec:  {results['records_per_second']:,.0f}")
+    print(f"requests/sec: {results['requests_per_second']:,.1f} ({results['requests']} requests)")
+    print(f"output:       {results['output_mib']:.1f} MiB in {results['output_lines']:,} lines")
+    print(f"peak RSS:     {results['peak_rss_mib']:.1f} MiB")
+    print("stages:")
+    for stage, seconds in results["stage_seconds"].items():
+        share = seconds / results["wall_seconds"] if results["wall_seconds"] else 0.0
+        print(f"  {stage:<10} {seconds:>8.2f}s {share:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
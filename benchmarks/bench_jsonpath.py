@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-page JSONPath overhead.
+
+Times the two lookups DynamicStream does on every page, `records_path` and the
+paginator's `total_pages_path`, through the SDK's `extract_jsonpath` and through
+the precompiled paths, for a few page sizes.
+
+Run from the repository root:
+
+    python benchmarks/bench_jsonpath.py
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath  # noqa: E402
+
+from tap_rest_api_post.jsonpath import compile_jsonpath  # noqa: E402
+
+RECORDS_PATH = "$.data.rewards[*]"
+TOTAL_PAGES_PATH = "$.data.pagination.totalPages"
+
+
+def make_page(page_size: int) -> dict:
+    """Build a parsed Luganodes-style page."""
+    return {
+        "data": {
+            "rewards": [{"date": f"2025-01-{i % 28 + 1:02d}", "epoch": i, "principal": "1"} for i in range(page_size)],
+            "pagination": {"totalPages": 500, "page": 1},
+        }
+    }
+
+
+def time_per_call(func: Callable[[], Any], iterations: int) -> float:
+    """Return the mean time of `func()` in microseconds."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2_000, help="Pages per measurement")
+    args = parser.parse_args()
+
+    records_jsonpath = compile_jsonpath(RECORDS_PATH)
+    total_pages_jsonpath = compile_jsonpath(TOTAL_PAGES_PATH)
+
+    print(f"{'page size':>10} {'extract_jsonpath':>18} {'compiled':>12} {'speedup':>9}")
+    for page_size in (1, 100, 1_000, 10_000):
+        page = make_page(page_size)
+        assert list(records_jsonpath.find(page)) == list(extract_jsonpath(RECORDS_PATH, page))
+        assert total_pages_jsonpath.find(page) == list(extract_jsonpath(TOTAL_PAGES_PATH, page))
+
+        iterations = max(10, args.iterations * 100 // max(page_size, 100))
+        before = time_per_call(
+            lambda: (list(extract_jsonpath(RECORDS_PATH, page)), list(extract_jsonpath(TOTAL_PAGES_PATH, page))),
+            iterations,
+        )
+        after = time_per_call(
+            lambda: (list(records_jsonpath.find(page)), total_pages_jsonpath.find(page)),
+            iterations,
+        )
+        print(f"{page_size:>10} {before:>15.1f} us {after:>9.1f} us {before / after:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark RECORD message serialization and output.
+
+Serializes transformed Luganodes-style records the way the SDK does
+(`Tap.format_message`, simplejson) and through `RecordSerializer` with the
+standard library encoder and, when installed, orjson. Every path must produce
+the same bytes. Then writes the messages through `SingerLineWriter` to
+/dev/null unbuffered, as the tap does by default, and with `output.buffer_size`.
+
+Run from the repository root:
+
+    python benchmarks/bench_serializer.py --records 200000
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import mock_api  # noqa: E402
+from bench_transformations import TRANSFORMATIONS  # noqa: E402
+from singer_sdk._singerlib import RecordMessage  # noqa: E402
+from singer_sdk._singerlib.encoding import SimpleSingerWriter  # noqa: E402
+
+from tap_rest_api_post import serialization  # noqa: E402
+from tap_rest_api_post.serialization import RecordSerializer  # noqa: E402
+from tap_rest_api_post.transformations import compile_transformations  # noqa: E402
+from tap_rest_api_post.writer import SingerLineWriter  # noqa: E402
+
+
+def make_messages(count: int) -> List[RecordMessage]:
+    """Build `count` RECORD messages carrying transformed records."""
+    steps = compile_transformations(TRANSFORMATIONS)
+    messages = []
+    for index in range(count):
+        record = mock_api.make_record(index)
+        for step in steps:
+            step(record)
+        messages.append(
+            RecordMessage(stream="bench_rewards", record=record, time_extracted=datetime.now(timezone.utc))
+        )
+    return messages
+
+
+def run(name: str, serialize: Callable[[RecordMessage], object], messages: List[RecordMessage]) -> float:
+    """Serialize every message and return messages per second."""
+    started = time.perf_counter()
+    for message in messages:
+        serialize(message)
+    elapsed = time.perf_counter() - started
+    per_second = len(messages) / elapsed
+    print(f"{name:<18} {len(messages):>9,} msgs  {elapsed:7.2f}s  {per_second:>11,.0f} msgs/sec")
+    return per_second
+
+
+def run_output(name: str, write: Callable[[], None], writer: SingerLineWriter, count: int) -> float:
+    """Time writing all messages to /dev/null through `write` and return messages per second."""
+    stdout = sys.stdout
+    with open(os.devnull, "w") as devnull:
+        sys.stdout = devnull
+        started = time.perf_counter()
+        try:
+            write()
+            writer.flush()
+        finally:
+            elapsed = time.perf_counter() - started
+            sys.stdout = stdout
+    per_second = count / elapsed
+    print(f"{name:<18} {count:>9,} msgs  {elapsed:7.2f}s  {per_second:>11,.0f} msgs/sec")
+    return per_second
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200_000, help="RECORD messages to serialize")
+    parser.add_argument("--buffer-size", type=int, default=1048576, help="output.buffer_size for the buffered run")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    messages = make_messages(args.records)
+    sdk = SimpleSingerWriter()
+
+    def sdk_line(message: RecordMessage) -> bytes:
+        return (sdk.format_message(message) + "\n").encode("utf-8")
+
+    stdlib = RecordSerializer(sdk.format_message, use_orjson=False)
+    serializers = [("fast (json)", stdlib)]
+    if serialization.orjson is not None:
+        serializers.append(("fast (orjson)", RecordSerializer(sdk.format_message)))
+    else:
+        print("orjson is not installed; only the standard library encoder is compared")
+
+    # Every path must write exactly what the SDK writes
+    for message in messages[:1000]:
+        expected = sdk_line(message)
+        for name, serializer in serializers:
+            assert serializer.serialize(message) == expected, f"{name} output differs from the SDK"
+
+    print("serialization:")
+    before = run("sdk (simplejson)", sdk_line, messages)
+    for name, serializer in serializers:
+        after = run(name, serializer.serialize, messages)
+        print(f"{'':<18} {after / before:.2f}x, {serializer.fallbacks} records through the SDK's encoder")
+
+    fastest = serializers[-1][1]
+    unbuffered = SingerLineWriter()
+    buffered = SingerLineWriter(buffer_size=args.buffer_size)
+
+    def write_sdk() -> None:
+        for message in messages:
+            unbuffered.write_line(sdk.format_message(message) + "\n")
+
+    def write_fast() -> None:
+        for message in messages:
+            buffered.write_record(fastest.serialize(message))
+
+    print("serialization and output to /dev/null:")
+    before = run_output("sdk, unbuffered", write_sdk, unbuffered, len(messages))
+    after = run_output("fast, buffered", write_fast, buffered, len(messages))
+    print(f"speedup            {after / before:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
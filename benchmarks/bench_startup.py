@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup for short scheduled runs.
+
+Times fresh `tap-rest-api-post --about` and `--discover` processes against two
+floors: a bare interpreter and `import singer_sdk`, which every run pays. The
+difference between a command and the SDK floor is what the tap itself costs.
+`--imports` adds the import time of each tap_rest_api_post module, from
+`python -X importtime`.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py --runs 10 --streams 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import bench_end_to_end  # noqa: E402
+
+CLI = "from tap_rest_api_post.tap import TapRestApiPost; TapRestApiPost.cli()"
+
+
+def make_config(streams: int) -> Dict[str, Any]:
+    """Build a config with `streams` copies of the end-to-end benchmark's stream."""
+    options = argparse.Namespace(
+        page_size=100,
+        page_concurrency=1,
+        stream_parsing=False,
+        engine="requests",
+        spool_threshold_mb=None,
+        batch_transformations=False,
+        compression=False,
+        auto_page_size=False,
+        min_page_size=10,
+        max_page_size=10000,
+    )
+    config = bench_end_to_end.make_config(8000, options)
+    stream = config["streams"][0]
+    config["streams"] = [dict(stream, name=f"bench_rewards_{index}") for index in range(streams)]
+    return config
+
+
+def environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def time_command(argv: List[str], runs: int) -> List[float]:
+    """Run `argv` `runs` times and return the wall time of each run in milliseconds."""
+    import time
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(argv, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=environment())
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def module_import_times(argv: List[str]) -> Dict[str, float]:
+    """Return the self import time of each tap_rest_api_post module, in milliseconds."""
+    result = subprocess.run(
+        [argv[0], "-X", "importtime", *argv[1:]],
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=environment(),
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "tap_rest_api_post" not in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        times[name] = times.get(name, 0.0) + int(self_us) / 1000
+    return times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Processes started per command")
+    parser.add_argument("--streams", type=int, default=10, help="Streams in the --discover config")
+    parser.add_argument("--imports", action="store_true", help="Also report per-module import times")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = Path(directory) / "config.json"
+        config_path.write_text(json.dumps(make_config(args.streams)))
+        commands = {
+            "python": [sys.executable, "-c", "pass"],
+            "import singer_sdk": [sys.executable, "-c", "import singer_sdk"],
+            "--about": [sys.executable, "-c", CLI, "--about"],
+            "--about --format json": [sys.executable, "-c", CLI, "--about", "--format", "json"],
+            "--discover": [sys.executable, "-c", CLI, "--config", str(config_path), "--discover"],
+        }
+        results: Dict[str, Any] = {}
+        for name, argv in commands.items():
+            timings = time_command(argv, args.runs)
+            results[name] = {
+                "min_ms": round(min(timings), 1),
+                "median_ms": round(statistics.median(timings), 1),
+                "max_ms": round(max(timings), 1),
+            }
+        if args.imports:
+            results["imports_ms"] = {
+                "--about": module_import_times(commands["--about"]),
+                "--discover": module_import_times(commands["--discover"]),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    floor = results["import singer_sdk"]["median_ms"]
+    print(f"{'command':<22} {'min':>8} {'median':>8} {'max':>8} {'over SDK':>9}")
+    for name in commands:
+        timing = results[name]
+        over = f"{timing['median_ms'] - floor:+.1f}" if name.startswith("--") else ""
+        print(f"{name:<22} {timing['min_ms']:>8.1f} {timing['median_ms']:>8.1f} {timing['max_ms']:>8.1f} {over:>9}")
+    for command, times in results.get("imports_ms", {}).items():
+        print(f"tap_rest_api_post imports for {command}: {sum(times.values()):.1f} ms")
+        for module, milliseconds in sorted(times.items(), key=lambda item: -item[1]):
+            print(f"  {module:<40} {milliseconds:>6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Benchmark the record transformation pipeline.
+
+Compares the original per-row interpretation of the `transformations` config
+with the compiled pipeline used by DynamicStream, and with the column-wise
+`batch_transformations` pipeline (pure Python, and NumPy when installed), on
+synthetic Figment/Luganodes style pages.
+
+Run from the repository root:
+
+    python benchmarks/bench_transformations.py --rows 1000000
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tap_rest_api_post.transformations import (  # noqa: E402
+    compile_batch_transformations,
+    compile_transformations,
+    load_numpy,
+)
+
+TRANSFORMATIONS = {
+    "field_mappings": {"stakeAccount": "stake_account", "systemAccount": "system_account"},
+    "value_transformations": {
+        "principal": {"type": "divide", "divisor": 1000000000},
+        "epochReward": {"type": "divide", "divisor": 1000000000},
+        "totalRewards": {"type": "divide", "divisor": 1000000000},
+    },
+    "field_extractions": {
+        "protocol_rewards": {"source_field": "rewards", "type": "nested_array", "filter_type": "protocol"},
+        "mev_rewards": {"source_field": "rewards", "type": "nested_array", "filter_type": "mev"},
+        "balance": {"source_field": "balances", "type": "first_array_item"},
+    },
+}
+
+
+def legacy_post_process(row: dict, transformations: Dict[str, Any]) -> dict:
+    """The per-row implementation DynamicStream.post_process used before compilation."""
+    if "field_mappings" in transformations:
+        for old_field, new_field in transformations["field_mappings"].items():
+            if old_field in row:
+                row[new_field] = row.pop(old_field)
+
+    if "value_transformations" in transformations:
+        for field, transform_config in transformations["value_transformations"].items():
+            if field in row and transform_config.get("type") == "divide":
+                try:
+                    divisor = transform_config["divisor"]
+                    original_value = row[field]
+                    if isinstance(original_value, (int, float, str)):
+                        row[field] = float(original_value) / divisor
+                    else:
+                        row[field] = None
+                except (ValueError, TypeError, ZeroDivisionError):
+                    row[field] = None
+
+    if "field_extractions" in transformations:
+        for new_field, extraction_config in transformations["field_extractions"].items():
+            source_field = extraction_config.get("source_field")
+            extraction_type = extraction_config.get("type")
+
+            if source_field in row and extraction_type == "nested_array":
+                array_data = row.get(source_field, [])
+                if isinstance(array_data, list):
+                    for item in array_data:
+                        if isinstance(item, dict):
+                            if item.get("type", "") == extraction_config.get("filter_type", ""):
+                                if "numeric" in item and "exp" in item:
+                                    row[new_field] = item["numeric"] / (10 ** item["exp"])
+                                elif "text" in item:
+                                    row[new_field] = float(item["text"])
+                                break
+            elif source_field in row and extraction_type == "first_array_item":
+                array_data = row.get(source_field, [])
+                if isinstance(array_data, list) and len(array_data) > 0:
+                    item = array_data[0]
+                    if isinstance(item, dict):
+                        if "numeric" in item and "exp" in item:
+                            row[new_field] = item["numeric"] / (10 ** item["exp"])
+                        elif "text" in item:
+                            row[new_field] = float(item["text"])
+    return row
+
+
+def make_page(page_size: int) -> List[dict]:
+    """Build one synthetic page of rows."""
+    return [
+        {
+            "stakeAccount": f"stake-{i}",
+            "systemAccount": f"system-{i % 7}",
+            "epoch": 600 + i,
+            "principal": str(1_500_000_000_000 + i),
+            "epochReward": 12_345_678 + i,
+            "totalRewards": "98765432100",
+            "rewards": [
+                {"type": "inflation", "numeric": 11, "exp": 9},
+                {"type": "protocol", "numeric": 4_200_000 + i, "exp": 9},
+                {"type": "fees", "text": "0.0001"},
+                {"type": "mev", "numeric": 310_000 + i, "exp": 9},
+            ],
+            "balances": [{"numeric": 1_500_000_000_000 + i, "exp": 9}],
+        }
+        for i in range(page_size)
+    ]
+
+
+def run(name: str, transform_page: Callable[[List[dict]], None], page: List[dict], pages: int) -> float:
+    """Transform `pages` fresh copies of `page` and return rows per second."""
+    elapsed = 0.0
+    for _ in range(pages):
+        rows = [dict(row) for row in page]
+        started = time.perf_counter()
+        transform_page(rows)
+        elapsed += time.perf_counter() - started
+    rows_per_sec = len(page) * pages / elapsed
+    print(f"{name:<14} {len(page) * pages:>10,} rows  {elapsed:8.2f}s  {rows_per_sec:>12,.0f} rows/sec")
+    return rows_per_sec
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Total rows to transform")
+    parser.add_argument("--page-size", type=int, default=1_000, help="Rows per synthetic page")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    page = make_page(args.page_size)
+    pages = max(1, args.rows // args.page_size)
+    steps = compile_transformations(TRANSFORMATIONS)
+
+    batch_pipelines = {"batch": compile_batch_transformations(TRANSFORMATIONS, use_numpy=False)}
+    if load_numpy() is not None:
+        batch_pipelines["batch (numpy)"] = compile_batch_transformations(TRANSFORMATIONS)
+    else:
+        print("NumPy is not installed; only the pure Python batch pipeline is compared")
+
+    # Every implementation must produce the same rows
+    expected = [legacy_post_process(dict(row), TRANSFORMATIONS) for row in page]
+    actual = [dict(row) for row in page]
+    for row in actual:
+        for step in steps:
+            step(row)
+    assert actual == expected, "compiled pipeline output differs from the legacy implementation"
+    for name, batch_steps in batch_pipelines.items():
+        actual = [dict(row) for row in page]
+        for batch_step in batch_steps:
+            batch_step(actual)
+        assert actual == expected, f"{name} pipeline output differs from the legacy implementation"
+
+    def legacy(rows: List[dict]) -> None:
+        for row in rows:
+            legacy_post_process(row, TRANSFORMATIONS)
+
+    def compiled(rows: List[dict]) -> None:
+        for row in rows:
+            for step in steps:
+                step(row)
+
+    def batched(batch_steps: List[Callable[[List[dict]], None]]) -> Callable[[List[dict]], None]:
+        def transform_page(rows: List[dict]) -> None:
+            for batch_step in batch_steps:
+                batch_step(rows)
+
+        return transform_page
+
+    before = run("before", legacy, page, pages)
+    after = run("after", compiled, page, pages)
+    print(f"speedup        {after / before:.2f}x")
+    for name, batch_steps in batch_pipelines.items():
+        batch = run(name, batched(batch_steps), page, pages)
+        print(f"speedup        {batch / before:.2f}x ({batch / after:.2f}x over per-row compiled)")
+
+
+if __name__ == "__main__":
+    main()
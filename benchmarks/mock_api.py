@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+A local stand-in for the POST rewards APIs the tap is used against.
+
+Serves Luganodes-style pages (`$.data.rewards[*]` with `$.data.pagination.totalPages`)
+whose records also carry Figment-style nested `rewards` and `balances` arrays.
+Every request is a POST; `page` and `limit` are read from the query string.
+Page count, page size, latency, error rate and gzip responses are configurable, and
+`--max-limit` makes requests for larger pages fail like an overloaded server.
+
+Run it on its own to point a local tap config at it:
+
+    python benchmarks/mock_api.py --port 8000 --pages 200 --page-size 100
+"""
+
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Collection, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+# Solana epochs last about 2.5 days
+EPOCH_SECONDS = 216_000
+FIRST_EPOCH = datetime(2020, 11, 7, tzinfo=timezone.utc)
+
+
+class MockAPISettings:
+    """What the mock API serves and how it misbehaves."""
+
+    def __init__(
+        self,
+        pages: int = 200,
+        page_size: int = 100,
+        latency: float = 0.02,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+        gzip: bool = False,
+        max_limit: Optional[int] = None,
+        descending: bool = False,
+        fail_pages: Collection[int] = (),
+    ):
+        """Initialize the settings."""
+        self.pages = pages
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.gzip = gzip
+        self.max_limit = max_limit
+        self.descending = descending
+        # Pages that always get an error response
+        self.fail_pages = set(fail_pages)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        # JSON request bodies received, in order
+        self.bodies: List[Any] = []
+
+    @property
+    def total_records(self) -> int:
+        """Return the number of records across all pages at the default page size."""
+        return self.pages * self.page_size
+
+    def count_request(self) -> None:
+        """Count a request received."""
+        with self.lock:
+            self.requests += 1
+
+    def record_body(self, body: bytes) -> None:
+        """Keep a request's JSON body."""
+        with self.lock:
+            self.bodies.append(json.loads(body) if body else None)
+
+    def should_fail(self) -> bool:
+        """Return whether the next request gets an error response."""
+        if not self.error_rate:
+            return False
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+
+def make_record(index: int) -> Dict[str, Any]:
+    """Build the record at `index`, the same on every request."""
+    timestamp = FIRST_EPOCH + timedelta(seconds=index * EPOCH_SECONDS)
+    return {
+        "date": timestamp.date().isoformat(),
+        "epoch": index,
+        "timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "stakeAccount": f"stake{index % 97:04d}",
+        "validator": f"validator{index % 13:02d}",
+        "principal": str(1_000_000_000_000 + index * 1_000),
+        "epochReward": str(index * 7_919),
+        "totalRewards": str(index * 104_729),
+        "rewards": [
+            {"type": "protocol", "numeric": index * 5_003, "exp": 9},
+            {"type": "mev", "numeric": index * 211, "exp": 9},
+            {"type": "fee", "text": "0.000005"},
+        ],
+        "balances": [{"numeric": index * 1_000_003, "exp": 9}, {"numeric": 0, "exp": 9}],
+    }
+
+
+def make_page(settings: MockAPISettings, page: int, limit: int) -> Dict[str, Any]:
+    """Build a page response body."""
+    total = settings.total_records
+    total_pages = max(1, (total + limit - 1) // limit)
+    start = (page - 1) * limit
+    indexes = range(start, min(start + limit, total))
+    if settings.descending:
+        indexes = range(total - 1 - start, max(total - 1 - start - limit, -1), -1)
+    rewards: List[Dict[str, Any]] = [make_record(index) for index in indexes]
+    return {
+        "data": {
+            "rewards": rewards,
+            "pagination": {"page": page, "limit": limit, "total": total, "totalPages": total_pages},
+        }
+    }
+
+
+class MockAPIHandler(BaseHTTPRequestHandler):
+    """Request handler; `settings` is set on a subclass per server."""
+
+    settings: MockAPISettings
+    protocol_version = "HTTP/1.1"
+    # Write each response in one piece, so keep-alive clients are not held up by delayed ACKs
+    wbufsize = 64 * 1024
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep the benchmark output quiet."""
+
+    def _reply(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        """Serve one page of records."""
+        self.settings.count_request()
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.settings.record_body(body)
+        if self.settings.latency:
+            time.sleep(self.settings.latency)
+        if self.settings.should_fail():
+            self._reply(self.settings.error_status, b'{"error": "injected failure"}', {"Retry-After": "0"})
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        page = max(1, int(query.get("page", ["1"])[0]))
+        limit = max(1, int(query.get("limit", [str(self.settings.page_size)])[0]))
+        if page in self.settings.fail_pages:
+            self._reply(self.settings.error_status, b'{"error": "injected failure"}')
+            return
+        if self.settings.max_limit and limit > self.settings.max_limit:
+            self._reply(self.settings.error_status, b'{"error": "page too large"}', {"Retry-After": "0"})
+            return
+        content = json.dumps(make_page(self.settings, page, limit)).encode("utf-8")
+        if self.settings.gzip and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            self._reply(200, gzip.compress(content, compresslevel=6), {"Content-Encoding": "gzip"})
+        else:
+            self._reply(200, content)
+
+
+def start_server(settings: MockAPISettings, port: int = 0) -> ThreadingHTTPServer:
+    """Start the mock API on a background thread and return the server."""
+    handler = type("BoundMockAPIHandler", (MockAPIHandler,), {"settings": settings})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the mock API's settings to a command line parser."""
+    parser.add_argument("--pages", type=int, default=200, help="Number of pages at the default page size")
+    parser.add_argument("--page-size", type=int, default=100, help="Records per page")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds each request takes to answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status code of failed requests")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the injected failures")
+    parser.add_argument("--gzip", action="store_true", help="Gzip responses for clients that accept it")
+    parser.add_argument("--max-limit", type=int, default=None, help="Fail requests for pages larger than this")
+    parser.add_argument("--descending", action="store_true", help="Serve records newest-first")
+
+
+def settings_from_args(args: argparse.Namespace) -> MockAPISettings:
+    """Build settings from parsed `add_arguments` options."""
+    return MockAPISettings(
+        pages=args.pages,
+        page_size=args.page_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+        gzip=args.gzip,
+        max_limit=args.max_limit,
+        descending=args.descending,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_server(settings_from_args(args), args.port)
+    print(f"Mock API listening on http://127.0.0.1:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,15 @@
 
 __version__ = "0.3.1"
 
-from tap_rest_api_post.tap import TapRestApiPost
+from typing import Any
 
-__all__ = ["TapRestApiPost"]
\ No newline at end of file
+__all__ = ["TapRestApiPost"]
+
+
+def __getattr__(name: str) -> Any:
+    # Importing a submodule should not import the SDK along with the tap
+    if name == "TapRestApiPost":
+        from tap_rest_api_post.tap import TapRestApiPost
+
+        return TapRestApiPost
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
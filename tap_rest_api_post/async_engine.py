@@ -0,0 +1,150 @@
+# tap_rest_api_post/async_engine.py
+"""Asyncio request engine for tap-rest-api-post."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from tap_rest_api_post.connections import DEFAULT_POOL_MAXSIZE
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+
+class AsyncEngine:
+    """
+    Sends requests with aiohttp from one event loop, running on one background thread.
+
+    Streams still build `requests.PreparedRequest`s, with their payload, URL
+    parameters and auth, and get regular `requests.Response`s back with the body
+    read, so validation, parsing and pagination work unchanged. Every stream on
+    the engine shares one aiohttp session, with up to `pool_maxsize` connections
+    per host; requests beyond that wait for a free connection.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, keep_alive: bool = True):
+        """Start the event loop thread and open the session."""
+        import aiohttp
+
+        self._aiohttp = aiohttp
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        self.requests = 0
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-engine", daemon=True)
+        self._thread.start()
+        self._session = self.run(self._open_session())
+
+    @staticmethod
+    def available() -> bool:
+        """Return whether aiohttp is installed."""
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["AsyncEngine"]:
+        """Build an engine sized by the tap's `connection_pool` config, if aiohttp is installed."""
+        if not cls.available():
+            logger.warning("engine 'asyncio' requires the 'aiohttp' package. Falling back to requests.")
+            return None
+        config = config or {}
+        return cls(
+            pool_maxsize=int(config.get("pool_maxsize") or DEFAULT_POOL_MAXSIZE),
+            keep_alive=config.get("keep_alive", True),
+        )
+
+    async def _open_session(self) -> Any:
+        """Create the aiohttp session; it must be created on the loop."""
+        aiohttp = self._aiohttp
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        connector = aiohttp.TCPConnector(limit=0, limit_per_host=self.pool_maxsize, force_close=not self.keep_alive)
+        return aiohttp.ClientSession(connector=connector, trace_configs=[trace_config])
+
+    async def _on_connection_created(self, session: Any, context: Any, params: Any) -> None:
+        self.connections += 1
+
+    def submit(self, coroutine: Awaitable[R]) -> "Future[R]":
+        """Schedule `coroutine` on the loop and return a future for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)  # type: ignore[arg-type]
+
+    def run(self, coroutine: Awaitable[R]) -> R:
+        """Run `coroutine` on the loop and wait for its result."""
+        return self.submit(coroutine).result()
+
+    async def send(
+        self,
+        request: requests.PreparedRequest,
+        timeout: Union[None, float, Tuple[float, float]] = None,
+    ) -> requests.Response:
+        """Send a prepared request and return the response with its body read."""
+        aiohttp = self._aiohttp
+        connect_timeout: Optional[float]
+        read_timeout: Optional[float]
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = read_timeout = timeout
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=connect_timeout, sock_read=read_timeout)
+
+        started = time.perf_counter()
+        try:
+            async with self._session.request(
+                request.method or "GET",
+                request.url or "",
+                headers=dict(request.headers),
+                data=request.body,
+                timeout=client_timeout,
+                allow_redirects=False,
+            ) as aiohttp_response:
+                content = await aiohttp_response.read()
+        except asyncio.TimeoutError as e:
+            raise requests.exceptions.ReadTimeout(str(e) or "Request timed out", request=request) from e
+        except aiohttp.ClientError as e:
+            raise requests.exceptions.ConnectionError(str(e), request=request) from e
+
+        self.requests += 1
+
+        response = requests.Response()
+        response.status_code = aiohttp_response.status
+        response.headers = CaseInsensitiveDict(aiohttp_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = aiohttp_response.reason
+        response.url = str(aiohttp_response.url)
+        response.request = request
+        response.elapsed = timedelta(seconds=time.perf_counter() - started)
+        # The body is already decoded, so iter_content() serves it from memory
+        response._content = content
+        response._content_consumed = True
+        return response
+
+    def log_stats(self) -> None:
+        """Log connection reuse."""
+        reuse = max(0, self.requests - self.connections) / self.requests if self.requests else 0.0
+        logger.info(
+            f"Async engine: {self.requests} requests over {self.connections} connections ({reuse:.0%} reused)"
+        )
+
+    def close(self) -> None:
+        """Close the session and stop the loop."""
+        if self.loop.is_closed():
+            return
+        try:
+            self.run(self._session.close())
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=5)
+            self.loop.close()
@@ -0,0 +1,128 @@
+# tap_rest_api_post/batches.py
+"""Singer BATCH file output for tap-rest-api-post."""
+
+import gzip
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from uuid import uuid4
+
+from singer_sdk.batch import BaseBatcher, Batcher, lazy_chunked_generator
+from singer_sdk.helpers._batch import BatchConfig
+
+from tap_rest_api_post.serialization import serialize_json
+
+logger = logging.getLogger(__name__)
+
+# Fast enough to keep up with the API, and within a few percent of level 9's size
+GZIP_COMPRESSLEVEL = 6
+
+
+def parquet_available() -> bool:
+    """Return whether pyarrow, which writes Parquet batches, is installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def stream_batch_config(stream_name: str, raw: Optional[Dict[str, Any]]) -> Optional[BatchConfig]:
+    """
+    Build a stream's batch config from the tap's `batch_config`, if one is set.
+
+    Parquet batches fall back to JSON Lines, with the same compression, when
+    pyarrow is not installed.
+    """
+    if not raw:
+        return None
+    encoding = dict(raw.get("encoding") or {})
+    if encoding.get("format") == "parquet" and not parquet_available():
+        logger.warning(
+            f"Parquet batches of stream '{stream_name}' require the 'pyarrow' package. Writing JSON Lines instead."
+        )
+        encoding["format"] = "jsonl"
+        raw = dict(raw, encoding=encoding)
+    return BatchConfig.from_dict(dict(raw))
+
+
+def _encode_record(record: Dict[str, Any]) -> bytes:
+    return (serialize_json(record) + "\n").encode("utf-8")
+
+
+class JSONLinesBatcher(BaseBatcher):
+    """
+    Writes batches of records to JSON Lines files, one file per batch.
+
+    Unlike the SDK's JSON Lines batcher, honours `encoding.compression`, so
+    `none` writes plain `.jsonl` files. Records are encoded with `encode`,
+    which defaults to the SDK's encoder.
+    """
+
+    def __init__(
+        self,
+        tap_name: str,
+        stream_name: str,
+        batch_config: BatchConfig,
+        encode: Optional[Callable[[Dict[str, Any]], bytes]] = None,
+    ):
+        """Initialize the batcher."""
+        super().__init__(tap_name, stream_name, batch_config)
+        self.encode = encode or _encode_record
+
+    def get_batches(self, records: Iterator[dict]) -> Iterator[List[str]]:
+        """Write each batch to a file and yield its manifest."""
+        sync_id = f"{self.tap_name}--{self.stream_name}-{uuid4()}"
+        prefix = self.batch_config.storage.prefix or ""
+        compress = self.batch_config.encoding.compression == "gzip"
+        extension = ".jsonl.gz" if compress else ".jsonl"
+        for number, chunk in enumerate(lazy_chunked_generator(records, self.batch_config.batch_size), start=1):
+            filename = f"{prefix}{sync_id}-{number}{extension}"
+            lines = (self.encode(record) for record in chunk)
+            with self.batch_config.storage.fs(create=True) as fs:
+                with fs.open(filename, "wb") as file:
+                    if compress:
+                        with gzip.GzipFile(fileobj=file, mode="wb", compresslevel=GZIP_COMPRESSLEVEL) as gz:
+                            gz.writelines(lines)
+                    else:
+                        file.writelines(lines)
+                file_url = fs.geturl(filename)
+            yield [file_url]
+
+
+def batcher_for(
+    tap_name: str,
+    stream_name: str,
+    batch_config: BatchConfig,
+    encode: Optional[Callable[[Dict[str, Any]], bytes]] = None,
+) -> BaseBatcher:
+    """Return the batcher for the configured format; formats other than JSON Lines use the SDK's."""
+    if batch_config.encoding.format == "jsonl":
+        return JSONLinesBatcher(tap_name, stream_name, batch_config, encode)
+    return Batcher(tap_name, stream_name, batch_config)
+
+
+class BatchStats:
+    """Counts the BATCH files and records a stream wrote."""
+
+    def __init__(self, stream_name: str):
+        """Initialize the counters."""
+        self.stream_name = stream_name
+        self.batches = 0
+        self.records = 0
+
+    def count(self, records: Iterator[dict]) -> Iterator[dict]:
+        """Count records as they are written."""
+        for record in records:
+            self.records += 1
+            yield record
+
+    def add_batch(self) -> None:
+        """Count a written batch."""
+        self.batches += 1
+
+    def log_stats(self) -> None:
+        """Log how many records went out as BATCH files."""
+        if self.batches:
+            logger.info(
+                f"Wrote {self.records} records of stream '{self.stream_name}' in {self.batches} BATCH files"
+            )
@@ -0,0 +1,228 @@
+# tap_rest_api_post/cache.py
+"""On-disk response cache for tap-rest-api-post."""
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# Headers that describe the wire encoding, which no longer applies to the stored body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class ResponseCache:
+    """
+    A gzip-compressed response store keyed by request fingerprint.
+
+    Each entry is one file: a JSON metadata line followed by the decoded body.
+    Entries older than `ttl_seconds` are ignored and removed when read. Unless
+    `closed_windows_only` is turned off, only requests for date ranges that have
+    ended are cached, so recent data is always fetched again. When the
+    directory grows past `max_bytes`, the least recently used entries are evicted;
+    hits touch the file, so recency survives across runs.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        closed_windows_only: bool = True,
+    ):
+        """Open (or create) the cache directory and index its entries."""
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.closed_windows_only = closed_windows_only
+        self.hits = 0
+        self.misses = 0
+        self.stored = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+        # fingerprint -> compressed size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        paths = sorted(self.directory.glob("*.json.gz"), key=lambda path: path.stat().st_mtime)
+        for path in paths:
+            size = path.stat().st_size
+            self._entries[path.name[: -len(".json.gz")]] = size
+            self._total_bytes += size
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["ResponseCache"]:
+        """Build a cache from the tap's `response_cache` config, if one is configured."""
+        if not config or not config.get("directory"):
+            return None
+        max_size_mb = config.get("max_size_mb")
+        closed_windows_only = config.get("closed_windows_only") is not False
+        if not closed_windows_only and not config.get("ttl_seconds"):
+            logger.warning(
+                "The response cache has neither closed_windows_only nor ttl_seconds set, so cached responses "
+                "are served until they are evicted, however much the API's data has changed"
+            )
+        return cls(
+            directory=config["directory"],
+            ttl_seconds=config.get("ttl_seconds"),
+            max_bytes=int(max_size_mb * 1024 * 1024) if max_size_mb else None,
+            closed_windows_only=closed_windows_only,
+        )
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json.gz"
+
+    def get(self, fingerprint: str, request: requests.PreparedRequest, stream: bool = False) -> Optional[requests.Response]:
+        """
+        Return the cached response for `fingerprint`, or None on a miss.
+
+        With `stream=True` the body is left in the compressed file and read as
+        it is consumed; otherwise it is loaded and the file is closed.
+        """
+        path = self._path(fingerprint)
+        try:
+            cache_file = gzip.open(path, "rb")
+        except FileNotFoundError:
+            self._record_miss(fingerprint)
+            return None
+
+        try:
+            metadata = json.loads(cache_file.readline())
+            if self.ttl_seconds and time.time() - metadata["created"] > self.ttl_seconds:
+                cache_file.close()
+                self._remove(fingerprint)
+                self._record_miss(fingerprint)
+                return None
+            response = self._build_response(metadata, request)
+            if stream:
+                response.raw = cache_file
+            else:
+                response._content = cache_file.read()
+                cache_file.close()
+        except (OSError, ValueError, KeyError) as e:
+            cache_file.close()
+            logger.warning(f"Discarding unreadable cache entry '{path.name}': {e}")
+            self._remove(fingerprint)
+            self._record_miss(fingerprint)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if fingerprint in self._entries:
+                self._entries.move_to_end(fingerprint)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return response
+
+    def put(self, fingerprint: str, response: requests.Response, stream: bool = False) -> requests.Response:
+        """
+        Store `response` and return the response the caller should use from now on.
+
+        A streamed body is copied to disk chunk by chunk and then served from the
+        cache file, so it is never held in memory whole.
+        """
+        metadata = {
+            "created": time.time(),
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "encoding": response.encoding,
+            "headers": {
+                key: value for key, value in response.headers.items() if key.lower() not in _DROPPED_HEADERS
+            },
+        }
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as raw_file, gzip.GzipFile(fileobj=raw_file, mode="wb") as cache_file:
+                cache_file.write(json.dumps(metadata).encode("utf-8") + b"\n")
+                if stream:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        cache_file.write(chunk)
+                else:
+                    cache_file.write(response.content)
+            path = self._path(fingerprint)
+            os.replace(temp_path, path)
+        except BaseException:
+            response.close()
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        size = path.stat().st_size
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(fingerprint, 0)
+            self._entries[fingerprint] = size
+            self.stored += 1
+        self._evict()
+
+        if not stream:
+            return response
+        response.close()
+        cached = self.get(fingerprint, response.request, stream=True)
+        if cached is None:
+            raise RuntimeError(f"Response cache entry '{fingerprint}' vanished right after being written")
+        with self._lock:
+            # Serving the body back from disk is not a real hit
+            self.hits -= 1
+        return cached
+
+    @staticmethod
+    def _build_response(metadata: Dict[str, Any], request: requests.PreparedRequest) -> requests.Response:
+        response = requests.Response()
+        response.status_code = metadata["status_code"]
+        response.reason = metadata.get("reason", "")
+        response.url = metadata.get("url", "")
+        response.encoding = metadata.get("encoding")
+        response.headers = CaseInsensitiveDict(metadata.get("headers") or {})
+        response.request = request
+        return response
+
+    def _record_miss(self, fingerprint: str) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _remove(self, fingerprint: str) -> None:
+        with self._lock:
+            self._total_bytes -= self._entries.pop(fingerprint, 0)
+        try:
+            self._path(fingerprint).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        if not self.max_bytes:
+            return
+        while True:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes or len(self._entries) <= 1:
+                    return
+                fingerprint, size = self._entries.popitem(last=False)
+                self._total_bytes -= size
+                self.evicted += 1
+            try:
+                self._path(fingerprint).unlink()
+            except FileNotFoundError:
+                pass
+
+    def log_stats(self) -> None:
+        """Log hit, miss and eviction counts."""
+        logger.info(
+            f"Response cache '{self.directory}': {self.hits} hits, {self.misses} misses, "
+            f"{self.stored} stored, {self.evicted} evicted, {self._total_bytes / 1024 / 1024:.1f} MiB on disk"
+        )
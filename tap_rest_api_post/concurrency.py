@@ -0,0 +1,281 @@
+# tap_rest_api_post/concurrency.py
+"""Concurrency helpers for tap-rest-api-post."""
+
+import asyncio
+import logging
+import pickle
+import queue
+import struct
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Deque, Generic, Iterable, Iterator, List, Optional, TypeVar, cast
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int,
+    thread_name_prefix: str = "",
+) -> Iterator[R]:
+    """
+    Apply `func` to `items` on a bounded thread pool, yielding results in input order.
+
+    At most `max_workers` calls are in flight (or waiting to be consumed) at any
+    time, so memory stays bounded no matter how many items there are. Closing the
+    iterator early cancels everything that has not started yet.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+    pending: Deque[Future] = deque()
+    items_iter = iter(items)
+    try:
+        for item in items_iter:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers:
+                break
+
+        while pending:
+            result = pending.popleft().result()
+            for item in items_iter:
+                pending.append(executor.submit(func, item))
+                break
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group `items` into lists of at most `size` elements."""
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _Failure:
+    """Carries an exception raised by a producer thread over to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_DONE = object()
+
+
+class BufferedIterator(Generic[T]):
+    """
+    Drain an iterable on a background thread into a bounded queue.
+
+    The producer blocks once `maxsize` items are waiting, so at most that many
+    items are held in memory. Exceptions raised by the producer are re-raised
+    to the consumer, and `close()` stops the producer at its next item.
+    """
+
+    def __init__(self, items: Iterable[T], maxsize: int, name: str = ""):
+        """Start draining `items` in a daemon thread."""
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, maxsize))
+        self._stopped = threading.Event()
+        self._finished = False
+        self._thread = threading.Thread(target=self._run, args=(items,), name=name or None, daemon=True)
+        self._thread.start()
+
+    def _run(self, items: Iterable[T]) -> None:
+        """Producer loop."""
+        items_iter = iter(items)
+        try:
+            for item in items_iter:
+                if not self._put(item):
+                    return
+            self._put(_DONE)
+        except BaseException as e:  # noqa: BLE001 - handed over to the consumer
+            self._put(_Failure(e))
+        finally:
+            close = getattr(items_iter, "close", None)
+            if close is not None:
+                close()
+
+    def _put(self, item: Any) -> bool:
+        """Queue an item, giving up if the consumer has closed the iterator."""
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> "BufferedIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._finished:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _DONE:
+            self._finished = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.error
+        return cast(T, item)
+
+    def close(self) -> None:
+        """Stop the producer and drop anything still buffered."""
+        self._finished = True
+        self._stopped.set()
+
+
+class SpooledIterator(Generic[T]):
+    """
+    Drain an iterable on a background thread into a temporary file.
+
+    Unlike `BufferedIterator`, the producer never waits for the consumer: items
+    are pickled into a `SpooledTemporaryFile`, which stays in memory up to
+    `max_memory` bytes and moves to disk beyond, so the producer can run to the
+    end while the consumer is busy with something else. Exceptions raised by the
+    producer are re-raised to the consumer once it has read every item before
+    them, and `close()` stops the producer and removes the file.
+    """
+
+    _LENGTH = struct.Struct("<Q")
+
+    def __init__(self, items: Iterable[T], max_memory: int, name: str = ""):
+        """Start draining `items` in a daemon thread."""
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._condition = threading.Condition()
+        self._written = 0
+        self._read = 0
+        self._write_offset = 0
+        self._read_offset = 0
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(items,), name=name or None, daemon=True)
+        self._thread.start()
+
+    def _run(self, items: Iterable[T]) -> None:
+        """Producer loop."""
+        items_iter = iter(items)
+        try:
+            for item in items_iter:
+                if self._stopped.is_set():
+                    return
+                data = pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL)
+                with self._condition:
+                    if self._file.closed:
+                        return
+                    self._file.seek(self._write_offset)
+                    self._file.write(self._LENGTH.pack(len(data)))
+                    self._file.write(data)
+                    self._write_offset = self._file.tell()
+                    self._written += 1
+                    self._condition.notify()
+        except BaseException as e:  # noqa: BLE001 - handed over to the consumer
+            with self._condition:
+                self._error = e
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify()
+            close = getattr(items_iter, "close", None)
+            if close is not None:
+                close()
+
+    def __iter__(self) -> "SpooledIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        with self._condition:
+            while self._read == self._written and not self._done:
+                self._condition.wait()
+            if self._read == self._written or self._file.closed:
+                if self._error is not None:
+                    error, self._error = self._error, None
+                    raise error
+                raise StopIteration
+            self._file.seek(self._read_offset)
+            (length,) = self._LENGTH.unpack(self._file.read(self._LENGTH.size))
+            data = self._file.read(length)
+            self._read_offset = self._file.tell()
+            self._read += 1
+        return cast(T, pickle.loads(data))
+
+    def close(self) -> None:
+        """Stop the producer and remove the file, with anything still in it."""
+        self._stopped.set()
+        with self._condition:
+            self._file.close()
+            self._condition.notify_all()
+
+
+class AsyncBufferedIterator(Generic[T]):
+    """
+    Drain an async iterator on an event loop into a bounded queue, for a consumer on another thread.
+
+    The asyncio counterpart of `BufferedIterator`: instead of a thread per
+    producer, each producer is a task on `loop`, so many of them share one
+    thread. It must not be consumed from the loop's own thread.
+    """
+
+    def __init__(self, items: AsyncIterator[T], loop: asyncio.AbstractEventLoop, maxsize: int):
+        """Start draining `items` in a task on `loop`."""
+        self._loop = loop
+        self._finished = False
+        self._queue: Optional["asyncio.Queue[Any]"] = None
+        self._task: Optional["asyncio.Future[None]"] = None
+        asyncio.run_coroutine_threadsafe(self._start(items, max(1, maxsize)), loop).result()
+
+    async def _start(self, items: AsyncIterator[T], maxsize: int) -> None:
+        """Create the queue and the producer task on the loop."""
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._task = asyncio.ensure_future(self._run(items))
+
+    async def _run(self, items: AsyncIterator[T]) -> None:
+        """Producer task."""
+        assert self._queue is not None
+        try:
+            async for item in items:
+                await self._queue.put(item)
+            await self._queue.put(_DONE)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:  # noqa: BLE001 - handed over to the consumer
+            await self._queue.put(_Failure(e))
+        finally:
+            close = getattr(items, "aclose", None)
+            if close is not None:
+                await close()
+
+    def __iter__(self) -> "AsyncBufferedIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._finished:
+            raise StopIteration
+        assert self._queue is not None
+        item = asyncio.run_coroutine_threadsafe(self._queue.get(), self._loop).result()
+        if item is _DONE:
+            self._finished = True
+            raise StopIteration
+        if isinstance(item, _Failure):
+            self._finished = True
+            raise item.error
+        return cast(T, item)
+
+    def close(self) -> None:
+        """Cancel the producer and drop anything still buffered."""
+        self._finished = True
+        if self._task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
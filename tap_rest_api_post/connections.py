@@ -0,0 +1,311 @@
+# tap_rest_api_post/connections.py
+"""Shared HTTP connection pools for tap-rest-api-post."""
+
+import io
+import logging
+import os
+import ssl
+import threading
+from typing import Any, Dict, Optional, Tuple, Union, cast
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers, select_proxy
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_MAXSIZE = 10
+
+# Headers that describe the wire encoding, which httpx has already decoded
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def _host_prefix(url: str) -> str:
+    """Return the `scheme://host[:port]/` prefix adapters are mounted on."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}/"
+
+
+class ConnectionManager:
+    """
+    Hands out one connection pool per API host, shared by every stream.
+
+    Streams keep their own requests session (and so their own auth and
+    headers), but sessions for the same host mount the same adapter, so TLS
+    connections opened by one stream are reused by the others.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """Initialize the manager from the tap's `connection_pool` config."""
+        config = config or {}
+        self.pool_maxsize = int(config.get("pool_maxsize") or DEFAULT_POOL_MAXSIZE)
+        self.keep_alive = config.get("keep_alive", True)
+        self.http2 = bool(config.get("http2"))
+        self._adapters: Dict[str, BaseAdapter] = {}
+        self._lock = threading.Lock()
+
+        if self.http2 and not HTTP2Adapter.available():
+            logger.warning("connection_pool.http2 requires the 'httpx[http2]' package. Falling back to HTTP/1.1.")
+            self.http2 = False
+
+    def adapter_for(self, url: str) -> BaseAdapter:
+        """Return the shared adapter for the host of `url`."""
+        prefix = _host_prefix(url)
+        with self._lock:
+            adapter = self._adapters.get(prefix)
+            if adapter is None:
+                if self.http2:
+                    adapter = HTTP2Adapter(pool_maxsize=self.pool_maxsize, keep_alive=self.keep_alive)
+                else:
+                    adapter = CountingHTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                self._adapters[prefix] = adapter
+                logger.debug(f"Created connection pool for '{prefix}' (maxsize={self.pool_maxsize}, http2={self.http2})")
+            return adapter
+
+    def mount(self, session: requests.Session, url: str) -> None:
+        """Route `session`'s requests for the host of `url` through the shared pool."""
+        session.mount(_host_prefix(url), self.adapter_for(url))
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return request and connection counts per host."""
+        with self._lock:
+            adapters = dict(self._adapters)
+        result = {}
+        for prefix, adapter in adapters.items():
+            requests_sent = adapter.num_requests  # type: ignore[attr-defined]
+            connections = adapter.num_connections  # type: ignore[attr-defined]
+            result[prefix] = {
+                "requests": requests_sent,
+                "connections": connections,
+                "reused": max(0, requests_sent - connections),
+            }
+        return result
+
+    def log_stats(self) -> None:
+        """Log connection reuse per host."""
+        for prefix, counts in self.stats().items():
+            reuse = counts["reused"] / counts["requests"] if counts["requests"] else 0.0
+            logger.info(
+                f"Connection pool '{prefix}': {counts['requests']} requests over "
+                f"{counts['connections']} connections ({reuse:.0%} reused)"
+            )
+
+    def close(self) -> None:
+        """Close every pool."""
+        with self._lock:
+            for adapter in self._adapters.values():
+                adapter.close()
+            self._adapters.clear()
+
+
+class _Counter:
+    """A counter that can be incremented from several threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def increment(self) -> None:
+        with self._lock:
+            self.value += 1
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter that counts requests sent and TCP connections opened."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the adapter."""
+        self._requests = _Counter()
+        self._connects = _Counter()
+        super().__init__(*args, **kwargs)
+
+    @property
+    def num_requests(self) -> int:
+        """Return the number of requests sent."""
+        return self._requests.value
+
+    @property
+    def num_connections(self) -> int:
+        """Return the number of connections opened, including reconnects."""
+        return self._connects.value
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager with connection classes that count connects."""
+        super().init_poolmanager(*args, **kwargs)
+        connects = self._connects
+
+        class CountingHTTPConnection(HTTPConnection):
+            def connect(self) -> None:
+                connects.increment()
+                super().connect()
+
+        class CountingHTTPSConnection(HTTPSConnection):
+            def connect(self) -> None:
+                connects.increment()
+                super().connect()
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            ConnectionCls = CountingHTTPConnection
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            ConnectionCls = CountingHTTPSConnection
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": CountingHTTPConnectionPool,
+            "https": CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request: requests.PreparedRequest, *args: Any, **kwargs: Any) -> requests.Response:
+        """Send a request, counting it."""
+        self._requests.increment()
+        return super().send(request, *args, **kwargs)
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    A requests transport adapter that sends requests over HTTP/2 with httpx.
+
+    Responses are read fully and handed back as regular `requests.Response`
+    objects, so streams, validation and backoff work unchanged. The session's
+    `verify`, `cert` and `proxies` apply as they would over HTTP/1.1: httpx
+    clients hold them, so there is one client per combination in use.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_POOL_MAXSIZE, keep_alive: bool = True):
+        """Prepare the underlying httpx clients, created on first use."""
+        import httpx
+
+        super().__init__()
+        self._httpx = httpx
+        self._limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize if keep_alive else 0,
+        )
+        self._clients: Dict[Tuple[Any, Any, Optional[str]], Any] = {}
+        self._clients_lock = threading.Lock()
+        self._requests = _Counter()
+        self._connects = _Counter()
+
+    @staticmethod
+    def available() -> bool:
+        """Return whether httpx with HTTP/2 support is installed."""
+        try:
+            import h2  # noqa: F401
+            import httpx  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    @property
+    def num_requests(self) -> int:
+        """Return the number of requests sent."""
+        return self._requests.value
+
+    @property
+    def num_connections(self) -> int:
+        """Return the number of connections opened."""
+        return self._connects.value
+
+    def _client(self, verify: Union[bool, str], cert: Any, proxy: Optional[str]) -> Any:
+        """Return the httpx client for a set of TLS and proxy settings, creating it on first use."""
+        key = (verify, tuple(cert) if isinstance(cert, (list, tuple)) else cert, proxy)
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._httpx.Client(
+                    http2=True,
+                    limits=self._limits,
+                    verify=_ssl_context(verify, cert),
+                    proxy=proxy,
+                    # The session has already applied the environment's settings
+                    trust_env=False,
+                )
+                self._clients[key] = client
+        return client
+
+    def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Count connections through httpcore's trace events."""
+        if event_name == "connection.connect_tcp.complete":
+            self._connects.increment()
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Union[None, float, Tuple[Optional[float], Optional[float]]] = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> requests.Response:
+        """Send a prepared request over HTTP/2."""
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            httpx_timeout = self._httpx.Timeout(read_timeout, connect=connect_timeout)
+        else:
+            httpx_timeout = self._httpx.Timeout(timeout)
+
+        client = self._client(verify, cert, select_proxy(request.url or "", proxies) if proxies else None)
+        try:
+            httpx_response = client.request(
+                request.method or "GET",
+                request.url or "",
+                headers=cast(Dict[str, str], dict(request.headers)),
+                content=cast(Union[str, bytes, None], request.body),
+                timeout=httpx_timeout,
+                extensions={"trace": self._trace},
+            )
+        except self._httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(str(e), request=request) from e
+        except self._httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(str(e), request=request) from e
+
+        self._requests.increment()
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict(
+            [(name, value) for name, value in httpx_response.headers.multi_items() if name.lower() not in _DROPPED_HEADERS]
+        )
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = httpx_response.reason_phrase
+        response.url = str(httpx_response.url)
+        response.request = request
+        response.elapsed = httpx_response.elapsed
+        # The body is already read and decoded, so iter_content() serves it from memory
+        content: bytes = httpx_response.content
+        response._content = content
+        response._content_consumed = True  # type: ignore[attr-defined]
+        response.raw = io.BytesIO(content)
+        response.connection = self  # type: ignore[assignment]
+        return response
+
+    def close(self) -> None:
+        """Close the httpx clients."""
+        with self._clients_lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+def _ssl_context(verify: Union[bool, str], cert: Any) -> Union[bool, ssl.SSLContext]:
+    """Build the httpx `verify` argument for requests' `verify` (a flag or CA bundle path) and `cert`."""
+    if not cert and isinstance(verify, bool):
+        return verify
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif isinstance(verify, str) and os.path.isdir(verify):
+        context = ssl.create_default_context(capath=verify)
+    else:
+        context = ssl.create_default_context(cafile=verify if isinstance(verify, str) else None)
+    if cert:
+        certfile, keyfile = (cert, None) if isinstance(cert, str) else cert
+        context.load_cert_chain(certfile, keyfile)
+    return context
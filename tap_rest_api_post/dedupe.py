@@ -0,0 +1,159 @@
+# tap_rest_api_post/dedupe.py
+"""Bounded-memory primary-key deduplication for tap-rest-api-post."""
+
+import hashlib
+import json
+import logging
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_KEYS = 1_000_000
+DEFAULT_EXPECTED_KEYS = 10_000_000
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+_MASK_64 = (1 << 64) - 1
+
+# Primary key values whose repr() identifies them exactly, so keys skip JSON encoding
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+class LRUKeySet:
+    """
+    An exact set of the `max_keys` most recently seen keys.
+
+    A key seen again is moved to the back; once full, the least recently seen key is
+    forgotten. Duplicates further apart than `max_keys` distinct keys get through.
+    """
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        """Initialize the set."""
+        self.max_keys = max(1, max_keys)
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+
+    def add(self, key: str) -> bool:
+        """Add `key`. Returns whether it was already in the set."""
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+        self._keys[key] = None
+        if len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+        return False
+
+    def describe(self) -> str:
+        """Return a short description for logs."""
+        return f"an LRU set of up to {self.max_keys:,} keys"
+
+
+class BloomFilter:
+    """
+    A Bloom filter sized for `expected_keys` keys at `false_positive_rate`.
+
+    Memory is fixed at construction. A key is never reported new after being added,
+    but a new key is reported as seen with about `false_positive_rate` probability,
+    so that share of unique records is dropped. Past `expected_keys` keys the rate
+    climbs, and a warning is logged.
+    """
+
+    def __init__(self, expected_keys: int = DEFAULT_EXPECTED_KEYS, false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE):
+        """Size the bit array and the number of hashes."""
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"false_positive_rate must be between 0 and 1, got {false_positive_rate}")
+        self.expected_keys = max(1, expected_keys)
+        self.false_positive_rate = false_positive_rate
+        self.num_bits = max(8, math.ceil(-self.expected_keys * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.expected_keys * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._warned = False
+
+    def add(self, key: str) -> bool:
+        """Add `key`. Returns whether it was (probably) added before."""
+        # Double hashing: the k positions come from the two halves of one 128-bit digest
+        digest = int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest(), "little")
+        position, step = digest & _MASK_64, (digest >> 64) | 1
+        bits, num_bits = self._bits, self.num_bits
+        seen = True
+        for _ in range(self.num_hashes):
+            position %= num_bits
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                seen = False
+                bits[byte] |= mask
+            position += step
+        if not seen:
+            self.count += 1
+            if self.count > self.expected_keys and not self._warned:
+                self._warned = True
+                logger.warning(
+                    f"Bloom filter holds more than its expected {self.expected_keys:,} keys; "
+                    "its false-positive rate is now rising. Raise dedupe.expected_keys."
+                )
+        return seen
+
+    def describe(self) -> str:
+        """Return a short description for logs."""
+        return (
+            f"a {len(self._bits) / 1024 / 1024:.1f} MiB Bloom filter ({self.num_hashes} hashes) "
+            f"for {self.expected_keys:,} keys at a {self.false_positive_rate:g} false-positive rate"
+        )
+
+
+class RecordDeduplicator:
+    """Drops records whose primary key was already emitted by the stream."""
+
+    def __init__(self, stream_name: str, primary_keys: Sequence[str], keys: Any):
+        """Initialize the deduplicator with a key set (`LRUKeySet` or `BloomFilter`)."""
+        self.stream_name = stream_name
+        self.primary_keys = tuple(primary_keys)
+        self.keys = keys
+        self.records = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_config(
+        cls, stream_name: str, primary_keys: Optional[Sequence[str]], config: Optional[Dict[str, Any]]
+    ) -> Optional["RecordDeduplicator"]:
+        """Build a deduplicator from a stream's `dedupe` config, if deduplication is enabled."""
+        if not config or not config.get("strategy"):
+            return None
+        if not primary_keys:
+            logger.warning(f"Stream '{stream_name}' has no primary_keys to deduplicate on. Not deduplicating.")
+            return None
+        strategy = config["strategy"]
+        if strategy == "lru":
+            keys: Any = LRUKeySet(int(config.get("max_keys") or DEFAULT_MAX_KEYS))
+        elif strategy == "bloom":
+            keys = BloomFilter(
+                int(config.get("expected_keys") or DEFAULT_EXPECTED_KEYS),
+                float(config.get("false_positive_rate") or DEFAULT_FALSE_POSITIVE_RATE),
+            )
+        else:
+            raise ValueError(f"Unknown dedupe strategy '{strategy}' for stream '{stream_name}'")
+        logger.info(f"Deduplicating stream '{stream_name}' on {list(primary_keys)} with {keys.describe()}")
+        return cls(stream_name, primary_keys, keys)
+
+    def key(self, record: Dict[str, Any]) -> str:
+        """Return the record's primary key as a string."""
+        values = tuple([record.get(field) for field in self.primary_keys])
+        if set(map(type, values)) <= _SCALAR_TYPES:
+            return repr(values)
+        return json.dumps(values, sort_keys=True, separators=(",", ":"), default=str)
+
+    def is_duplicate(self, record: Dict[str, Any]) -> bool:
+        """Return whether the record's primary key was seen before, remembering it if not."""
+        self.records += 1
+        if self.keys.add(self.key(record)):
+            self.dropped += 1
+            return True
+        return False
+
+    def log_stats(self) -> None:
+        """Log how many duplicates were dropped."""
+        if self.records:
+            logger.info(
+                f"Dropped {self.dropped} duplicate records of {self.records} for stream '{self.stream_name}'"
+            )
@@ -0,0 +1,57 @@
+# tap_rest_api_post/fanout.py
+"""Body-value fan-out helpers for partitioned streams."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+def read_values_file(path: str) -> List[Any]:
+    """
+    Read fan-out values from a file.
+
+    A `.json` file holds a JSON array. Any other file holds one value per line;
+    blank lines and lines starting with `#` are skipped.
+    """
+    file_path = Path(path).expanduser()
+    text = file_path.read_text(encoding="utf-8")
+    if file_path.suffix.lower() == ".json":
+        values = json.loads(text)
+        if not isinstance(values, list):
+            raise ValueError(f"Fan-out values file '{path}' must hold a JSON array")
+        return values
+    return [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")]
+
+
+def fan_out_values(fan_out: Dict[str, Any]) -> List[Any]:
+    """Return the values listed in `values` followed by those in `values_file`, without repeats."""
+    values = list(fan_out.get("values") or [])
+    if fan_out.get("values_file"):
+        values.extend(read_values_file(fan_out["values_file"]))
+
+    unique: Dict[str, Any] = {}
+    for value in values:
+        unique.setdefault(json.dumps(value, sort_keys=True), value)
+    if len(unique) < len(values):
+        logger.warning(f"Ignoring {len(values) - len(unique)} repeated fan-out values for field '{fan_out['field']}'")
+    return list(unique.values())
+
+
+def fan_out_contexts(field: str, values: List[Any], values_per_partition: int = 1) -> List[Dict[str, Any]]:
+    """
+    Build one partition context per value, or per chunk of `values_per_partition` values.
+
+    The context maps `field` to the value, or to the list of values of the chunk,
+    which is what the request body receives.
+    """
+    if values_per_partition < 1:
+        raise ValueError(f"values_per_partition must be at least 1, got {values_per_partition}.")
+    if values_per_partition == 1:
+        return [{field: value} for value in values]
+    return [
+        {field: values[start:start + values_per_partition]}
+        for start in range(0, len(values), values_per_partition)
+    ]
@@ -0,0 +1,63 @@
+# tap_rest_api_post/fingerprint.py
+"""Request fingerprints for tap-rest-api-post."""
+
+import hashlib
+import json
+from typing import Any, Collection, Mapping, Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from tap_rest_api_post.compression import maybe_gunzip
+
+
+def canonical_body(body: Union[None, str, bytes]) -> bytes:
+    """Return a JSON body with sorted keys and no whitespace, or the raw body if it is not JSON."""
+    if body is None:
+        return b""
+    # A gzip-encoded body fingerprints like the JSON it carries
+    raw = body.encode("utf-8") if isinstance(body, str) else maybe_gunzip(body)
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        return raw
+    return json.dumps(parsed, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def canonical_url(url: str, ignored_params: Collection[str] = ()) -> str:
+    """Return `url` with its query parameters sorted, leaving out `ignored_params`."""
+    parts = urlsplit(url)
+    params = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in ignored_params]
+    query = urlencode(sorted(params))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def credentials_digest(*credentials: Mapping[str, Any]) -> str:
+    """Return a short hash of auth headers or parameters, so keys tell credentials apart without holding them."""
+    digest = hashlib.sha256()
+    for values in credentials:
+        digest.update(json.dumps(sorted((str(key).lower(), str(value)) for key, value in values.items())).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+def request_fingerprint(
+    method: Optional[str], url: Optional[str], body: Any, ignored_params: Collection[str] = (), scope: str = ""
+) -> str:
+    """
+    Return a stable hash of a request's method, URL, query parameters and JSON body.
+
+    Two requests share a fingerprint when they differ only in query parameter
+    order or JSON key order and whitespace. Headers are not part of the
+    fingerprint, and neither are the query parameters in `ignored_params`; pass
+    the stream name and `credentials_digest()` as `scope` to tell apart requests
+    that only differ in those.
+    """
+    digest = hashlib.sha256()
+    if scope:
+        digest.update(scope.encode("utf-8"))
+        digest.update(b"\n")
+    digest.update((method or "GET").upper().encode("utf-8"))
+    digest.update(b"\n")
+    digest.update(canonical_url(url or "", ignored_params).encode("utf-8"))
+    digest.update(b"\n")
+    digest.update(canonical_body(body))
+    return digest.hexdigest()
@@ -0,0 +1,273 @@
+# tap_rest_api_post/instrumentation.py
+"""Hot-path timers, Singer METRIC output and sampling profiler for tap-rest-api-post."""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Dict, Optional
+
+from singer_sdk import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRIC_INTERVAL = 60.0
+DEFAULT_PROFILE_INTERVAL_MS = 10.0
+
+# Stages timed for every stream, in the order a page goes through them
+STAGES = (
+    "request",  # sending a request until its response headers arrive
+    "ttfb",  # time to first byte, as measured by requests
+    "json_decode",  # response.json()
+    "records_path",  # records_path lookup on the decoded body
+    "stream_parse",  # incremental parsing, including reading the body off the socket
+    "batch_transform",  # compiled transformations over a whole page (batch_transformations)
+    "post_process",  # compiled transformations
+    "emit",  # building, serializing and writing RECORD messages
+)
+
+
+def log_metric(metric_type: str, metric: str, value: Any, tags: Dict[str, Any]) -> None:
+    """Log a METRIC message like `metrics.log`, for metric names the SDK's `Metric` enum does not have."""
+    point = {"type": metric_type, "metric": metric, "value": value, "tags": tags}
+    metrics.get_metrics_logger().info("METRIC: %s", json.dumps(point, default=str))
+
+
+class _StageStats:
+    __slots__ = ("count", "seconds", "max_seconds")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+
+class StreamInstrumentation:
+    """
+    Accumulates per-stage timings and byte counts for one stream.
+
+    Every `metric_interval` seconds the time spent per stage since the last report
+    is logged as Singer METRIC messages, through the SDK's metrics logger. When the
+    stream finishes, a final report is logged and, with a `summary_dir`, the totals
+    are written to `<summary_dir>/<stream>.json`.
+    """
+
+    def __init__(
+        self,
+        stream_name: str,
+        metric_interval: Optional[float] = DEFAULT_METRIC_INTERVAL,
+        summary_dir: Optional[str] = None,
+    ):
+        """Initialize the counters."""
+        self.stream_name = stream_name
+        self.metric_interval = metric_interval
+        self.summary_dir = summary_dir
+        self.bytes_received = 0
+        self.bytes_on_wire = 0
+        self.request_body_bytes = 0
+        self.request_body_bytes_sent = 0
+        self.pages = 0
+        self._stages = {stage: _StageStats() for stage in STAGES}
+        self._reported: Dict[str, Any] = {
+            "bytes_received": 0,
+            "bytes_on_wire": 0,
+            "pages": 0,
+            "stages": {stage: (0, 0.0) for stage in STAGES},
+        }
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._last_report = self._started
+
+    @classmethod
+    def from_config(cls, stream_name: str, config: Optional[Dict[str, Any]]) -> Optional["StreamInstrumentation"]:
+        """Build the instrumentation from the tap's `instrumentation` config, if METRIC output or a summary is configured."""
+        config = config or {}
+        if config.get("metric_interval_seconds") is None and not config.get("summary_dir"):
+            return None
+        interval = config.get("metric_interval_seconds", DEFAULT_METRIC_INTERVAL)
+        return cls(stream_name, metric_interval=interval, summary_dir=config.get("summary_dir"))
+
+    def start(self) -> None:
+        """Start the wall clock for the summary and the report interval."""
+        self._started = self._last_report = time.monotonic()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Record one timed call of `stage`."""
+        with self._lock:
+            stats = self._stages[stage]
+            stats.count += 1
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+
+    def add_page(self, body_bytes: int, wire_bytes: Optional[int] = None) -> None:
+        """Record a page, the decoded size of its body and, if known, its size on the wire."""
+        with self._lock:
+            self.pages += 1
+            self.bytes_received += body_bytes
+            self.bytes_on_wire += body_bytes if wire_bytes is None else wire_bytes
+
+    def add_request_body(self, body_bytes: int, sent_bytes: int) -> None:
+        """Record a request body's size before and after content encoding."""
+        with self._lock:
+            self.request_body_bytes += body_bytes
+            self.request_body_bytes_sent += sent_bytes
+
+    def maybe_report(self) -> None:
+        """Log METRIC messages if the report interval has passed."""
+        if self.metric_interval and time.monotonic() - self._last_report >= self.metric_interval:
+            self.report()
+
+    def report(self) -> None:
+        """Log the time per stage, bytes and pages since the last report as METRIC messages."""
+        with self._lock:
+            self._last_report = time.monotonic()
+            stages = {stage: (stats.count, stats.seconds) for stage, stats in self._stages.items()}
+            bytes_received, bytes_on_wire, pages = self.bytes_received, self.bytes_on_wire, self.pages
+            previous = self._reported
+            self._reported = {
+                "bytes_received": bytes_received,
+                "bytes_on_wire": bytes_on_wire,
+                "pages": pages,
+                "stages": stages,
+            }
+
+        for stage, (count, seconds) in stages.items():
+            previous_count, previous_seconds = previous["stages"][stage]
+            if count == previous_count:
+                continue
+            log_metric(
+                "timer",
+                "stage_duration",
+                round(seconds - previous_seconds, 6),
+                {"stream": self.stream_name, "stage": stage, "calls": count - previous_count},
+            )
+        if pages != previous["pages"]:
+            tags = {"stream": self.stream_name}
+            log_metric("counter", "page_count", pages - previous["pages"], tags)
+            log_metric("counter", "bytes_received", bytes_received - previous["bytes_received"], tags)
+            log_metric("counter", "bytes_on_wire", bytes_on_wire - previous["bytes_on_wire"], tags)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the totals since the stream started."""
+        with self._lock:
+            wall_seconds = time.monotonic() - self._started
+            records = self._stages["post_process"].count
+            return {
+                "stream": self.stream_name,
+                "wall_seconds": round(wall_seconds, 6),
+                "records": records,
+                "pages": self.pages,
+                "bytes_received": self.bytes_received,
+                "bytes_per_page": self.bytes_received // self.pages if self.pages else 0,
+                "bytes_on_wire": self.bytes_on_wire,
+                "response_bytes_saved": self.bytes_received - self.bytes_on_wire,
+                "request_body_bytes": self.request_body_bytes,
+                "request_body_bytes_sent": self.request_body_bytes_sent,
+                "request_bytes_saved": self.request_body_bytes - self.request_body_bytes_sent,
+                "records_per_second": round(records / wall_seconds, 3) if wall_seconds else 0.0,
+                "stages": {
+                    stage: {
+                        "calls": stats.count,
+                        "seconds": round(stats.seconds, 6),
+                        "mean_seconds": round(stats.seconds / stats.count, 9) if stats.count else 0.0,
+                        "max_seconds": round(stats.max_seconds, 6),
+                    }
+                    for stage, stats in self._stages.items()
+                },
+            }
+
+    def finish(self) -> None:
+        """Log the final METRIC messages and write the summary file, if configured."""
+        self.report()
+        self._log_compression()
+        if not self.summary_dir:
+            return
+        directory = Path(self.summary_dir).expanduser()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{self.stream_name}.json"
+        path.write_text(json.dumps(self.summary(), indent=2))
+        logger.info(f"Wrote instrumentation summary for stream '{self.stream_name}' to '{path}'")
+
+    def _log_compression(self) -> None:
+        """Log the bytes saved by compressed transport, if any."""
+        with self._lock:
+            received, on_wire = self.bytes_received, self.bytes_on_wire
+            body, sent = self.request_body_bytes, self.request_body_bytes_sent
+        if received > on_wire:
+            logger.info(
+                f"Stream '{self.stream_name}' received {received / 1024 / 1024:.1f} MiB of responses as "
+                f"{on_wire / 1024 / 1024:.1f} MiB on the wire ({1 - on_wire / received:.0%} saved)"
+            )
+        if body > sent:
+            logger.info(
+                f"Stream '{self.stream_name}' sent {body / 1024:.1f} KiB of request bodies as "
+                f"{sent / 1024:.1f} KiB ({1 - sent / body:.0%} saved)"
+            )
+
+
+class SamplingProfiler:
+    """
+    A low-overhead sampling profiler for the whole tap.
+
+    A daemon thread snapshots the stacks of every other thread each `interval_ms`
+    and counts them. On `stop`, the counts are written to `path` in the collapsed
+    stack format (`thread;outer;...;inner count`) that flamegraph.pl and speedscope
+    read.
+    """
+
+    def __init__(self, path: str, interval_ms: float = DEFAULT_PROFILE_INTERVAL_MS):
+        """Initialize the profiler."""
+        self.path = Path(path).expanduser()
+        self.interval = max(0.001, interval_ms / 1000)
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["SamplingProfiler"]:
+        """Build a profiler from the tap's `instrumentation` config, if profiling is enabled."""
+        if not config or not config.get("profile_path"):
+            return None
+        return cls(config["profile_path"], config.get("profile_interval_ms") or DEFAULT_PROFILE_INTERVAL_MS)
+
+    def start(self) -> None:
+        """Start sampling."""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, top in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                frame: Optional[FrameType] = top
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        """Stop sampling and write the collapsed stacks."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as profile_file:
+            for stack, count in self._stacks.most_common():
+                profile_file.write(f"{stack} {count}\n")
+        logger.info(f"Wrote {self.samples} profiler samples to '{self.path}'")
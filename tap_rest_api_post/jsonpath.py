@@ -0,0 +1,73 @@
+# tap_rest_api_post/jsonpath.py
+"""Precompiled JSONPath expressions for tap-rest-api-post."""
+
+import logging
+from functools import lru_cache
+from typing import Any, List, Optional
+
+from tap_rest_api_post.jsonstream import parse_simple_path
+
+logger = logging.getLogger(__name__)
+
+
+def _parse(expression: str) -> Any:
+    """Compile `expression` with jsonpath-ng, which is only imported for paths that need it."""
+    from jsonpath_ng.ext import parse
+
+    return parse(expression)
+
+
+class CompiledJSONPath:
+    """
+    A JSONPath expression compiled once and matched many times.
+
+    Plain `$.a.b` and `$.a.b[*]` paths are served by walking the dicts directly.
+    Anything else, or data the direct walk cannot answer the same way
+    jsonpath-ng would, goes through the full jsonpath-ng expression.
+    """
+
+    def __init__(self, expression: str):
+        """Compile the expression."""
+        self.expression = expression
+        simple = parse_simple_path(expression)
+        self._keys: Optional[List[str]] = simple[0] if simple else None
+        self._wildcard = bool(simple and simple[1])
+        self._compiled: Any = None if simple else _parse(expression)
+
+    @property
+    def is_simple(self) -> bool:
+        """Return whether the expression is served by the direct accessor."""
+        return self._keys is not None
+
+    def find(self, data: Any) -> List[Any]:
+        """Return the values matched in `data`."""
+        if self._keys is None:
+            return self._find_generic(data)
+
+        value = data
+        for key in self._keys:
+            if not isinstance(value, dict):
+                return self._find_generic(data)
+            if key not in value:
+                return []
+            value = value[key]
+
+        if not self._wildcard:
+            return [value]
+        if isinstance(value, list):
+            return value
+        if value is None:
+            return []
+        return self._find_generic(data)
+
+    def _find_generic(self, data: Any) -> List[Any]:
+        """Match with the full jsonpath-ng expression."""
+        if self._compiled is None:
+            self._compiled = _parse(self.expression)
+        return [match.value for match in self._compiled.find(data)]
+
+
+@lru_cache(maxsize=None)
+def compile_jsonpath(expression: str) -> CompiledJSONPath:
+    """Return the compiled form of `expression`, compiling it only once per process."""
+    return CompiledJSONPath(expression)
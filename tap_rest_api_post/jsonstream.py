@@ -0,0 +1,230 @@
+# tap_rest_api_post/jsonstream.py
+"""Incremental JSON record extraction for tap-rest-api-post."""
+
+import codecs
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Matches `$`, `$.a.b` and `$.a.b[*]`
+_SIMPLE_PATH = re.compile(r"^\$((?:\.[A-Za-z_][\w-]*)*)(\[\*\])?$")
+# Always matches, possibly empty
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+CHUNK_SIZE = 64 * 1024
+
+# Attribute set on a streamed response with the values found at its capture paths
+CAPTURED_VALUES_ATTR = "captured_json_values"
+
+
+def parse_simple_path(path: str) -> Optional[Tuple[List[str], bool]]:
+    """
+    Split a simple JSONPath into its keys and whether it ends in `[*]`.
+
+    Returns None for anything beyond plain dotted keys with an optional
+    trailing wildcard, such as filters, slices or recursive descent.
+    """
+    match = _SIMPLE_PATH.match(path.strip())
+    if not match:
+        return None
+    keys = [key for key in match.group(1).split(".") if key]
+    return keys, bool(match.group(2))
+
+
+def parse_capture_path(path: str) -> Optional[List[str]]:
+    """
+    Split a simple JSONPath to a single value, such as `$.data.pagination.totalPages`, into its keys.
+
+    Returns None for paths `iter_json_path` cannot capture: anything
+    `parse_simple_path` rejects, the root, and paths ending in `[*]`.
+    """
+    parsed = parse_simple_path(path)
+    if parsed is None or parsed[1] or not parsed[0]:
+        return None
+    return parsed[0]
+
+
+def iter_text_chunks(byte_chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[str]:
+    """Decode a stream of byte chunks, keeping multi-byte characters intact across chunks."""
+    decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+class _Reader:
+    """A cursor over JSON text that arrives in chunks."""
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, min_chars: int = 1) -> bool:
+        """Read at least `min_chars` more characters. Returns False at end of input."""
+        if self._pos:
+            # Drop everything already consumed, so the buffer only holds the current value
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        target = len(self._buffer) + min_chars
+        added = False
+        while len(self._buffer) < target:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                break
+            self._buffer += chunk
+            added = True
+        return added
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or '' at end of input."""
+        while True:
+            whitespace = _WHITESPACE.match(self._buffer, self._pos)
+            assert whitespace is not None
+            self._pos = whitespace.end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume `char`, which must be the next non-whitespace character."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON stream but found '{found or 'end of input'}'")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Incomplete value: at least double what is buffered, so large values
+                # are decoded a logarithmic number of times
+                if not self._fill(max(len(self._buffer) - self._pos, CHUNK_SIZE)):
+                    raise
+                continue
+            if end == len(self._buffer) and not self._eof and isinstance(value, (int, float)):
+                # A number at the end of the buffer may continue in the next chunk
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def iter_json_path(
+    chunks: Iterable[str],
+    records_path: str,
+    capture_paths: Sequence[str] = (),
+    captures: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yield the values at a simple `records_path` while the document is still arriving.
+
+    With a trailing `[*]`, each array element is decoded and yielded on its own,
+    so memory is bounded by the largest element rather than the whole document.
+    Siblings that are not on the path are decoded one at a time and dropped.
+    Values found at the `capture_paths` (such as a total page count) are stored in
+    `captures`, wherever they appear relative to the records; callers check them
+    with `parse_capture_path` first, as other paths are never found.
+    """
+    parsed = parse_simple_path(records_path)
+    if parsed is None:
+        raise ValueError(f"'{records_path}' is not a simple JSONPath and cannot be streamed")
+    keys, wildcard = parsed
+
+    # A trie of the keys to follow. Leaves are ("records", wildcard) or ("capture", path).
+    tree: Dict[str, Any] = {}
+    for path in capture_paths:
+        capture_keys = parse_capture_path(path)
+        if capture_keys is None:
+            continue
+        node = tree
+        for key in capture_keys[:-1]:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                break
+        else:
+            node.setdefault(capture_keys[-1], ("capture", path))
+
+    reader = _Reader(chunks)
+    if captures is None:
+        captures = {}
+    if not keys:
+        yield from _read_records(reader, wildcard)
+        return
+
+    node = tree
+    for key in keys[:-1]:
+        child = node.get(key)
+        node[key] = child if isinstance(child, dict) else {}
+        node = node[key]
+    node[keys[-1]] = ("records", wildcard)
+
+    if reader.peek() == "{":
+        yield from _walk_object(reader, tree, captures)
+
+
+def _walk_object(reader: _Reader, node: Dict[str, Any], captures: Dict[str, Any]) -> Iterator[Any]:
+    """Walk an object, descending into keys on the trie and skipping the rest."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+    while True:
+        key = reader.read_value()
+        reader.expect(":")
+        child = node.get(key)
+        if isinstance(child, dict):
+            if reader.peek() == "{":
+                yield from _walk_object(reader, child, captures)
+            else:
+                reader.read_value()
+        elif isinstance(child, tuple) and child[0] == "records":
+            yield from _read_records(reader, child[1])
+        elif isinstance(child, tuple):
+            captures[child[1]] = reader.read_value()
+        else:
+            reader.read_value()
+
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("}")
+        return
+
+
+def _read_records(reader: _Reader, wildcard: bool) -> Iterator[Any]:
+    """Yield the elements of the array at the cursor, or the value itself without a wildcard."""
+    if not wildcard:
+        yield reader.read_value()
+        return
+    if reader.peek() != "[":
+        # Like jsonpath-ng, `[*]` on a non-array matches the value itself, unless null
+        value = reader.read_value()
+        if value is not None:
+            yield value
+        return
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.expect("]")
+        return
+    while True:
+        yield reader.read_value()
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("]")
+        return
@@ -0,0 +1,110 @@
+# tap_rest_api_post/pagehashes.py
+"""Change detection for re-synced pages for tap-rest-api-post."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+
+from tap_rest_api_post.fingerprint import request_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Context state key holding the content hashes of the pages synced last time
+PAGE_HASHES_KEY = "page_hashes"
+
+
+def page_hash(response: requests.Response, scope: str) -> Tuple[str, str]:
+    """
+    Return the key and the content hash of a page's response.
+
+    The key is the request fingerprint prefixed with `scope`, the stream name and
+    a hash of its credentials, so streams and API keys sharing a file keep apart.
+    """
+    request = response.request
+    fingerprint = request_fingerprint(request.method, request.url, request.body)
+    return f"{scope}:{fingerprint}", hashlib.blake2b(response.content, digest_size=16).hexdigest()
+
+
+class PageHashFile:
+    """
+    Page content hashes from previous syncs, in a local JSON file shared by every stream.
+
+    Hashes recorded during a sync are only written back by `save()`, which the tap
+    calls once the whole sync has succeeded.
+    """
+
+    def __init__(self, path: str):
+        """Load the hashes saved by the previous sync, if any."""
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self._hashes: Dict[str, str] = {}
+        if self.path.exists():
+            hashes = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(hashes, dict):
+                raise ValueError(f"Page hash file '{self.path}' must hold a JSON object")
+            self._hashes = hashes
+        self._updated = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["PageHashFile"]:
+        """Build the store from the tap's `page_hashes` config, if a path is configured."""
+        if not config or not config.get("path"):
+            return None
+        return cls(config["path"])
+
+    def get(self, fingerprint: str) -> Optional[str]:
+        """Return the content hash last saved for a request fingerprint."""
+        with self._lock:
+            return self._hashes.get(fingerprint)
+
+    def update(self, hashes: Dict[str, str]) -> None:
+        """Record the content hashes of the pages just synced."""
+        with self._lock:
+            self._hashes.update(hashes)
+            self._updated += len(hashes)
+
+    def save(self) -> None:
+        """Write the hashes to the file, replacing it atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            handle, temp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(handle, "w", encoding="utf-8") as temp_file:
+                    json.dump(self._hashes, temp_file, separators=(",", ":"))
+                os.replace(temp_path, self.path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+                raise
+            logger.info(f"Saved {self._updated} page hashes to '{self.path}' ({len(self._hashes)} in total)")
+
+
+class PageChanges:
+    """Counts the pages of a stream that came back unchanged since the last sync."""
+
+    def __init__(self, stream_name: str):
+        """Initialize the counters."""
+        self.stream_name = stream_name
+        self.pages = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+
+    def add(self, unchanged: bool) -> None:
+        """Count a page."""
+        with self._lock:
+            self.pages += 1
+            self.unchanged += unchanged
+
+    def log_stats(self) -> None:
+        """Log how many pages were skipped."""
+        if self.pages:
+            logger.info(
+                f"Skipped {self.unchanged} unchanged pages of {self.pages} for stream '{self.stream_name}'"
+            )
@@ -2,13 +2,25 @@
 """Pagination classes for tap-rest-api-post."""
 
 import logging
-from typing import Optional, Any
+import time
+from typing import Any, Dict, Iterable, Iterator, NamedTuple, Optional
 
-from singer_sdk.helpers.jsonpath import extract_jsonpath
 from singer_sdk.pagination import BasePageNumberPaginator
 
+from tap_rest_api_post.jsonpath import compile_jsonpath
+from tap_rest_api_post.jsonstream import CAPTURED_VALUES_ATTR
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_MIN_PAGE_SIZE = 10
+DEFAULT_MAX_PAGE_SIZE = 10_000
+# A page size must fetch this much faster than the current one to replace it
+PAGE_SIZE_TOLERANCE = 0.05
+# Pages read at a page size before it is compared with others
+MEASURE_PAGES = 2
+# Pages read at a settled page size before the next size up is tried again
+REPROBE_PAGES = 20
+
 
 class SinglePagePaginator(BasePageNumberPaginator):
     """A paginator for streams that do not have paginated results."""
@@ -32,18 +44,39 @@ class TotalPagesPaginator(BasePageNumberPaginator):
         """Initialize the paginator."""
         super().__init__(start_value=start_value)
         self.total_pages_path = total_pages_path
+        self._total_pages_jsonpath = compile_jsonpath(total_pages_path)
         self._total_pages: Optional[int] = None
         logger.debug(f"TotalPagesPaginator initialized with start_value={start_value}, path='{total_pages_path}'")
 
+    @property
+    def total_pages(self) -> Optional[int]:
+        """Return the total page count, once it has been read from a response."""
+        return self._total_pages
+
+    def resume_at(self, page: int) -> None:
+        """Start from `page` instead of the first page."""
+        self._value = page
+
+    def restart_at(self, page: int) -> None:
+        """Continue at `page` after the page size changed; the total is read again from the next response."""
+        self._value = page
+        self._total_pages = None
+
     def has_more(self, response) -> bool:
         """Check if there are more pages to fetch."""
         if self._total_pages is None:
             # Extract total pages from the first response
             try:
-                response_json = response.json()
                 logger.debug(f"Looking for total pages at path: {self.total_pages_path}")
-                
-                all_values = list(extract_jsonpath(self.total_pages_path, response_json))
+                captured = getattr(response, CAPTURED_VALUES_ATTR, None)
+                if captured is not None:
+                    # The body was parsed as it streamed in and is no longer available
+                    response_json = captured
+                    all_values = [captured[self.total_pages_path]] if self.total_pages_path in captured else []
+                else:
+                    response_json = response.json()
+                    all_values = self._total_pages_jsonpath.find(response_json)
+
                 if all_values:
                     self._total_pages = int(all_values[0])
                     logger.info(f"Found total pages: {self._total_pages}")
@@ -72,3 +105,173 @@ class TotalPagesPaginator(BasePageNumberPaginator):
         if self.has_more(response):
             return self.current_value + 1
         return None
+
+
+class TunedPage(NamedTuple):
+    """A page token that also carries the page size to request."""
+
+    page: int
+    page_size: int
+
+
+class PageSizeTuner:
+    """
+    Adjusts a stream's page size between pages to read the most records per second.
+
+    Each page is timed from sending its request until its last record was processed,
+    and the records per second are averaged per page size over at least
+    `MEASURE_PAGES` pages. The size doubles while that keeps improving, steps back
+    down when half the size was faster, and tries the next size up again every
+    `REPROBE_PAGES` pages. A timeout or 5xx response
+    halves the size and keeps it below the size that failed. Sizes stay between
+    `min_page_size` and `max_page_size`, and under `max_page_bytes` per response.
+
+    Page numbers depend on the page size, so the tuner counts the records read
+    (`offset`). After a change, the next page is the one holding `offset` at the
+    new size, and its first `skip` records, already read, are dropped. The size
+    only grows at offsets the new size divides, and halving an even size keeps the
+    offset aligned, so records are rarely read twice.
+    """
+
+    def __init__(
+        self,
+        stream_name: str,
+        page_size: int,
+        min_page_size: int = DEFAULT_MIN_PAGE_SIZE,
+        max_page_size: int = DEFAULT_MAX_PAGE_SIZE,
+        max_page_bytes: Optional[int] = None,
+    ):
+        """Initialize the tuner at `page_size`, clamped to the bounds."""
+        if min_page_size < 1 or max_page_size < min_page_size:
+            raise ValueError(
+                f"auto_page_size of stream '{stream_name}' needs 1 <= min_page_size <= max_page_size, "
+                f"got {min_page_size} and {max_page_size}"
+            )
+        self.stream_name = stream_name
+        self.min_page_size = min_page_size
+        self.max_page_size = max_page_size
+        self.max_page_bytes = max_page_bytes
+        self.page_size = min(max(page_size, min_page_size), max_page_size)
+        self.offset = 0
+        self.changes = 0
+        self._ceiling = max_page_size
+        self._rates: Dict[int, float] = {}
+        self._bytes_per_record: Optional[float] = None
+        self._pages_at_size = 0
+        self._page_records = 0
+        self._page_started = 0.0
+
+    @classmethod
+    def from_config(
+        cls, stream_name: str, pagination_config: Dict[str, Any], page_size: Optional[int] = None
+    ) -> "PageSizeTuner":
+        """Build a tuner from a stream's `pagination` config, starting at `page_size` if given."""
+        auto = pagination_config.get("auto_page_size") or {}
+        min_page_size = int(auto.get("min_page_size") or DEFAULT_MIN_PAGE_SIZE)
+        max_page_size = int(auto.get("max_page_size") or DEFAULT_MAX_PAGE_SIZE)
+        start = page_size or int(pagination_config.get("page_size") or min_page_size)
+        max_page_bytes = auto.get("max_page_bytes")
+        return cls(stream_name, start, min_page_size, max_page_size, int(max_page_bytes) if max_page_bytes else None)
+
+    @property
+    def next_page(self) -> int:
+        """Return the number of the page holding `offset`, at the current page size."""
+        return self.offset // self.page_size + 1
+
+    @property
+    def skip(self) -> int:
+        """Return how many records at the start of `next_page` were already read."""
+        return self.offset % self.page_size
+
+    def token(self, page: int) -> TunedPage:
+        """Return the page token for `page` at the current page size."""
+        return TunedPage(page, self.page_size)
+
+    def resume(self, offset: int, page_size: int) -> None:
+        """Continue after `offset` records read at `page_size`, as saved by a page checkpoint."""
+        self.page_size = page_size
+        self.offset = offset
+
+    def page_started(self) -> None:
+        """Start timing a page; call before sending its request."""
+        self._page_started = time.perf_counter()
+        self._page_records = 0
+
+    def read_page(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Yield a page's records, minus the `skip` already read, counting them all."""
+        skip = self.skip
+        for record in records:
+            self._page_records += 1
+            if self._page_records > skip:
+                yield record
+
+    def record_page(self, page: int, body_bytes: Optional[int]) -> bool:
+        """Measure the page just read and pick the next page size. Returns whether the size changed."""
+        size = self.page_size
+        self.offset = page * size
+        seconds = time.perf_counter() - self._page_started
+        if self._page_records and body_bytes:
+            bytes_per_record = body_bytes / self._page_records
+            previous = self._bytes_per_record
+            self._bytes_per_record = bytes_per_record if previous is None else (previous + bytes_per_record) / 2
+        # A short page is the last one and says little about the size
+        if self._page_records >= size and seconds > 0:
+            rate = self._page_records / seconds
+            previous = self._rates.get(size)
+            self._rates[size] = rate if previous is None else (previous + rate) / 2
+        self._pages_at_size += 1
+        return self._resize(self._choose())
+
+    def back_off(self) -> bool:
+        """Halve the page size after a timeout or server error. Returns False if it is already the smallest."""
+        size = self.page_size
+        if size <= self.min_page_size:
+            return False
+        self._ceiling = size - 1
+        self._rates.pop(size, None)
+        logger.warning(f"Stream '{self.stream_name}' failed to fetch a page of {size} records; backing off")
+        return self._resize(max(self.min_page_size, size // 2))
+
+    def _choose(self) -> int:
+        """Return the page size to use next."""
+        size = self.page_size
+        rate = self._rates.get(size)
+        if rate is None or self._pages_at_size < MEASURE_PAGES:
+            return size
+        smaller = size // 2
+        if smaller >= self.min_page_size and self._rates.get(smaller, 0.0) > rate * (1 + PAGE_SIZE_TOLERANCE):
+            return smaller
+
+        larger = size * 2
+        if larger > self._ceiling or self.offset % larger:
+            return size
+        if self.max_page_bytes and self._bytes_per_record and larger * self._bytes_per_record > self.max_page_bytes:
+            return size
+        larger_rate = self._rates.get(larger)
+        if larger_rate is None or larger_rate > rate * (1 + PAGE_SIZE_TOLERANCE):
+            return larger
+        if self._pages_at_size >= REPROBE_PAGES:
+            return larger
+        return size
+
+    def _resize(self, page_size: int) -> bool:
+        """Switch to `page_size`. Returns whether it differs from the current size."""
+        if page_size == self.page_size:
+            return False
+        rate = self._rates.get(self.page_size)
+        logger.info(
+            f"Page size of stream '{self.stream_name}': {self.page_size} -> {page_size}"
+            + (f" ({rate:,.0f} records/sec at {self.page_size})" if rate else "")
+        )
+        self.page_size = page_size
+        self.changes += 1
+        self._pages_at_size = 0
+        return True
+
+    def log_stats(self) -> None:
+        """Log the page size the tuner ended at."""
+        rates = ", ".join(f"{size}: {rate:,.0f}" for size, rate in sorted(self._rates.items()))
+        logger.info(
+            f"Stream '{self.stream_name}' ended at a page size of {self.page_size} after {self.changes} "
+            f"changes (records/sec by page size: {rates or 'none measured'})"
+        )
@@ -0,0 +1,228 @@
+# tap_rest_api_post/ratelimit.py
+"""Adaptive per-API rate limiting for tap-rest-api-post."""
+
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+# Status codes that mean "slow down" rather than "this request is broken"
+THROTTLE_STATUSES = {429, 503}
+
+# Reset values above this are Unix timestamps rather than a number of seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+def _header(response: requests.Response, name: str) -> Optional[str]:
+    """Return the `X-RateLimit-*` header, or its unprefixed `RateLimit-*` form."""
+    value = response.headers.get(f"X-{name}")
+    if value is None:
+        value = response.headers.get(name)
+    return value
+
+
+def _parse_number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value.split(",")[0].strip())
+    except ValueError:
+        return None
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Return the number of seconds a `Retry-After` header asks to wait."""
+    if not value:
+        return None
+    seconds = _parse_number(value)
+    if seconds is None:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - (now if now is not None else time.time())
+        except (TypeError, ValueError):
+            return None
+    return max(0.0, seconds)
+
+
+def parse_reset(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Return the number of seconds until an `X-RateLimit-Reset` header's window resets."""
+    seconds = _parse_number(value)
+    if seconds is None:
+        return None
+    if seconds > _EPOCH_THRESHOLD:
+        seconds -= now if now is not None else time.time()
+    return max(0.0, seconds)
+
+
+class AdaptiveRateLimiter:
+    """
+    A token bucket plus an AIMD concurrency limit for one API.
+
+    Every request takes a token (refilled at `requests_per_second`, up to
+    `burst`) and an in-flight slot. The number of slots starts at
+    `min_concurrency`, doubles while requests succeed, then grows by about one
+    per round of requests, and is halved whenever the API throttles. `Retry-After`
+    pauses all requests, and `X-RateLimit-Remaining`/`-Reset` spread the remaining
+    budget evenly over the rest of the window.
+    """
+
+    def __init__(
+        self,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        min_concurrency: int = 1,
+    ):
+        """Initialize the limiter."""
+        self.requests_per_second = requests_per_second
+        self.capacity = float(burst or max(1, int(requests_per_second or 1)))
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.concurrency = float(self.min_concurrency)
+        self.requests = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+
+        self._condition = threading.Condition()
+        self._tokens = self.capacity
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._slow_start = True
+        self._last_decrease = float("-inf")
+        self._paused_until = 0.0
+        # Rate allowed by the API's own X-RateLimit headers, until the window resets
+        self._header_rate: Optional[float] = None
+        self._header_rate_until = 0.0
+
+    def _rate(self, now: float) -> Optional[float]:
+        """Return the current refill rate, or None when requests are not paced."""
+        rate = self.requests_per_second
+        if self._header_rate is not None:
+            if now < self._header_rate_until:
+                rate = self._header_rate if rate is None else min(rate, self._header_rate)
+            else:
+                self._header_rate = None
+        return rate
+
+    def _refill(self, now: float, rate: Optional[float]) -> None:
+        if rate is None:
+            self._tokens = self.capacity
+        else:
+            self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    def acquire(self) -> float:
+        """Wait for a token and an in-flight slot. Returns the start time to pass to `release`."""
+        started_waiting = time.monotonic()
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                rate = self._rate(now)
+                self._refill(now, rate)
+                if now < self._paused_until:
+                    timeout: Optional[float] = self._paused_until - now
+                elif self._in_flight >= int(self.concurrency):
+                    timeout = None
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    self.requests += 1
+                    self.waited_seconds += now - started_waiting
+                    return now
+                else:
+                    timeout = (1 - self._tokens) / rate if rate else None
+                self._condition.wait(timeout)
+
+    def release(self, started: float, response: Optional[requests.Response]) -> None:
+        """Free the slot taken by `acquire` and adapt to the response, if there is one."""
+        with self._condition:
+            self._in_flight -= 1
+            if response is not None:
+                self._observe(started, response)
+            self._condition.notify_all()
+
+    def _observe(self, started: float, response: requests.Response) -> None:
+        """Adjust the pace and concurrency limit from a response's status and headers."""
+        now = time.monotonic()
+        wall_now = time.time()
+
+        retry_after = parse_retry_after(response.headers.get("Retry-After"), wall_now)
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        remaining = _parse_number(_header(response, "RateLimit-Remaining"))
+        reset = parse_reset(_header(response, "RateLimit-Reset"), wall_now)
+        if remaining is not None and reset is not None:
+            if remaining <= 0:
+                self._paused_until = max(self._paused_until, now + reset)
+            elif reset > 0:
+                self._header_rate = remaining / reset
+                self._header_rate_until = now + reset
+
+        if response.status_code in THROTTLE_STATUSES:
+            self.throttled += 1
+            # Requests sent before the last decrease were already counted in it
+            if started > self._last_decrease:
+                self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+                self._slow_start = False
+                self._last_decrease = now
+                logger.info(
+                    f"API throttled with status {response.status_code}; "
+                    f"concurrency limit lowered to {int(self.concurrency)}"
+                )
+        elif response.status_code < 400 and self.concurrency < self.max_concurrency:
+            increase = 1.0 if self._slow_start else 1.0 / self.concurrency
+            self.concurrency = min(float(self.max_concurrency), self.concurrency + increase)
+
+    def pause_remaining(self) -> float:
+        """Return how long requests are paused for, in seconds."""
+        with self._condition:
+            return max(0.0, self._paused_until - time.monotonic())
+
+
+class RateLimiters:
+    """Hands out one `AdaptiveRateLimiter` per `api_url`, shared by every stream."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize the registry from the tap's `rate_limit` config."""
+        self.config = config
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> Optional["RateLimiters"]:
+        """Build the registry, if rate limiting is configured."""
+        if not config:
+            return None
+        return cls(config)
+
+    def limiter_for(self, api_url: str) -> AdaptiveRateLimiter:
+        """Return the shared limiter for `api_url`."""
+        key = api_url.rstrip("/")
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = AdaptiveRateLimiter(
+                    requests_per_second=self.config.get("requests_per_second"),
+                    burst=self.config.get("burst"),
+                    max_concurrency=int(self.config.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY),
+                    min_concurrency=int(self.config.get("min_concurrency") or 1),
+                )
+                self._limiters[key] = limiter
+            return limiter
+
+    def log_stats(self) -> None:
+        """Log request, throttling and wait counts per API."""
+        with self._lock:
+            limiters = dict(self._limiters)
+        for api_url, limiter in limiters.items():
+            logger.info(
+                f"Rate limiter '{api_url}': {limiter.requests} requests, {limiter.throttled} throttled, "
+                f"{limiter.waited_seconds:.1f}s waiting, final concurrency limit {int(limiter.concurrency)}"
+            )
@@ -0,0 +1,131 @@
+# tap_rest_api_post/readahead.py
+"""Concurrent fetching of upcoming streams for tap-rest-api-post."""
+
+import logging
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional
+
+from tap_rest_api_post.concurrency import SpooledIterator
+
+if TYPE_CHECKING:
+    from tap_rest_api_post.streams import DynamicStream
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_MB = 64
+
+
+class ReadAhead:
+    """
+    Fetches the streams after the one being synced, so several streams download at once.
+
+    The SDK syncs streams one after another, and every message is still written
+    by its loop, in order: a stream's output never interleaves with another's.
+    Meanwhile up to `max_workers` streams, counting the one being synced, are
+    fetched on worker threads, at most `max_workers_per_api_url` of them against
+    the same `api_url`. The records of a stream fetched ahead are spooled, in
+    memory up to `buffer_bytes` and then in a temporary file, until the SDK
+    reaches it. An error fetching a stream is raised when the SDK reaches it,
+    and no more streams are started after one.
+    """
+
+    def __init__(
+        self,
+        streams: List["DynamicStream"],
+        max_workers: int,
+        max_workers_per_api_url: Optional[int] = None,
+        buffer_bytes: int = DEFAULT_BUFFER_MB * 1024 * 1024,
+    ):
+        """Initialize the schedule; `streams` are the streams to sync, in the SDK's order."""
+        self.max_workers = max_workers
+        self.max_workers_per_api_url = max_workers_per_api_url
+        self.buffer_bytes = buffer_bytes
+        self._pending = list(streams)
+        self._spools: Dict[str, SpooledIterator] = {}
+        self._fetching: Dict[str, "DynamicStream"] = {}
+        self._active_per_url: Counter = Counter()
+        self._failed = False
+        self._lock = threading.Lock()
+        # Create each stream's state entry before any worker starts writing to it
+        for stream in streams:
+            stream.get_context_state(None)
+        logger.info(f"Syncing {len(streams)} streams with up to {max_workers} fetched at the same time")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]], streams: List["DynamicStream"]) -> Optional["ReadAhead"]:
+        """Build the schedule from the tap's `concurrent_sync` config, if more than one worker is configured."""
+        config = config or {}
+        max_workers = int(config.get("max_workers") or 1)
+        if max_workers <= 1 or len(streams) <= 1:
+            return None
+        return cls(
+            streams,
+            max_workers,
+            config.get("max_workers_per_api_url"),
+            int(float(config.get("buffer_mb") or DEFAULT_BUFFER_MB) * 1024 * 1024),
+        )
+
+    def start(self, stream: "DynamicStream") -> None:
+        """Note that the SDK started syncing `stream`, fetching it here unless it was fetched ahead, and fill free workers."""
+        with self._lock:
+            if stream in self._pending:
+                self._pending.remove(stream)
+                self._add(stream)
+            self._schedule()
+
+    def chunks(self, stream: "DynamicStream") -> Optional[Iterator[List[dict]]]:
+        """Return the record chunks fetched ahead for `stream`, or None if the SDK's loop fetches it itself."""
+        return self._spools.get(stream.name)
+
+    def finish(self, stream: "DynamicStream") -> None:
+        """Drop what is left of a stream the SDK is done with, and start the next streams."""
+        spool = self._spools.pop(stream.name, None)
+        if spool is not None:
+            spool.close()
+        self._done(stream)
+
+    def close(self) -> None:
+        """Stop fetching and remove every spool."""
+        with self._lock:
+            self._failed = True
+            self._pending = []
+            spools = list(self._spools.values())
+            self._spools = {}
+        for spool in spools:
+            spool.close()
+
+    def _add(self, stream: "DynamicStream") -> None:
+        self._fetching[stream.name] = stream
+        self._active_per_url[stream.url_base] += 1
+
+    def _done(self, stream: "DynamicStream", failed: bool = False) -> None:
+        """Free the worker of a stream that has been fetched."""
+        with self._lock:
+            if self._fetching.pop(stream.name, None) is not None:
+                self._active_per_url[stream.url_base] -= 1
+            self._failed = self._failed or failed
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Start fetching the next pending streams while workers are free; the lock must be held."""
+        for stream in list(self._pending):
+            if self._failed or len(self._fetching) >= self.max_workers:
+                return
+            if self.max_workers_per_api_url and self._active_per_url[stream.url_base] >= self.max_workers_per_api_url:
+                continue
+            self._pending.remove(stream)
+            self._add(stream)
+            logger.info(f"Fetching stream '{stream.name}' ahead")
+            self._spools[stream.name] = SpooledIterator(
+                self._fetch(stream), self.buffer_bytes, name=f"{stream.name}-read-ahead"
+            )
+
+    def _fetch(self, stream: "DynamicStream") -> Iterator[List[dict]]:
+        """Yield a stream's record chunks, freeing its worker when it is fetched or fails."""
+        failed = True
+        try:
+            yield from stream.read_ahead_chunks()
+            failed = False
+        finally:
+            self._done(stream, failed)
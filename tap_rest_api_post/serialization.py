@@ -0,0 +1,156 @@
+# tap_rest_api_post/serialization.py
+"""Fast RECORD message serialization for tap-rest-api-post."""
+
+import datetime
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import simplejson
+from singer_sdk._singerlib import RecordMessage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+try:
+    from singer_sdk._singerlib.json import serialize_json
+except ImportError:  # pragma: no cover - singer-sdk < 0.39
+
+    def serialize_json(obj: object, **kwargs: Any) -> str:
+        """Serialize `obj` to a line of JSON the way the SDK's message writer does."""
+        text: str = simplejson.dumps(
+            obj,
+            use_decimal=True,
+            default=lambda value: value.isoformat(sep="T") if isinstance(value, datetime.datetime) else str(value),
+            separators=(",", ":"),
+            **kwargs,
+        )
+        return text
+
+logger = logging.getLogger(__name__)
+
+# Hand datetimes and dataclasses to `_default` instead of orjson's own formatting
+_ORJSON_OPTIONS = (
+    (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_SUBCLASS)
+    if orjson is not None
+    else 0
+)
+
+
+def _default(obj: Any) -> str:
+    """Encode dates and times like the SDK does; anything else goes through the SDK's encoder."""
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat(sep="T")
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _orjson_compatible(value: Any) -> bool:
+    """
+    Return whether orjson writes every float in `value` the way the SDK does.
+
+    Python writes floats below 1e-4 or from 1e16 up with an exponent (`1e-05`) and
+    orjson does not, or writes it differently (`1e16`); NaN and infinity, which the
+    SDK refuses, orjson writes as null.
+    """
+    value_type = type(value)
+    if value_type is float:
+        return bool(value == 0.0 or 1e-4 <= abs(value) < 1e16)
+    if value_type is dict:
+        for item in value.values():
+            if not _orjson_compatible(item):
+                return False
+    elif value_type is list or value_type is tuple:
+        for item in value:
+            if not _orjson_compatible(item):
+                return False
+    return True
+
+
+class RecordSerializer:
+    """
+    Serializes RECORD messages to the same bytes as the SDK's writer, faster.
+
+    The `{"type":"RECORD","stream":...,"record":` prefix is built once per stream and
+    the `version`/`time_extracted` suffix once per distinct value, so only the record
+    itself is encoded per message. Records are encoded with orjson when it is
+    installed, else with the standard library's C encoder. Records the fast path
+    cannot encode exactly as the SDK would (Decimals, non-ASCII text, floats orjson
+    formats differently, NaN) are passed to `fallback` instead.
+    """
+
+    def __init__(self, fallback: Callable[[RecordMessage], str], use_orjson: Optional[bool] = None):
+        """Initialize the serializer; `fallback` is the SDK's message formatter."""
+        self.fallback = fallback
+        self.use_orjson = orjson is not None and use_orjson is not False
+        self.records = 0
+        self.fallbacks = 0
+        self._encoder = json.JSONEncoder(separators=(",", ":"), allow_nan=False, default=_default)
+        self._prefixes: Dict[str, bytes] = {}
+        # (version, time_extracted) and the suffix built for them, swapped as one object
+        # since streams on other threads share the serializer
+        self._suffix: Tuple[Tuple[Any, Any], bytes] = ((None, None), b"}\n")
+
+    @property
+    def backend(self) -> str:
+        """Return the name of the encoder used for records."""
+        return "orjson" if self.use_orjson else "json"
+
+    def serialize(self, message: RecordMessage) -> bytes:
+        """Return `message` as a newline-terminated Singer line."""
+        self.records += 1
+        record = self._encode(message.record)
+        if record is None:
+            self.fallbacks += 1
+            return (self.fallback(message) + "\n").encode("utf-8")
+
+        prefix = self._prefixes.get(message.stream)
+        if prefix is None:
+            prefix = f'{{"type":"RECORD","stream":{serialize_json(message.stream)},"record":'.encode("ascii")
+            self._prefixes[message.stream] = prefix
+
+        key = (message.version, message.time_extracted)
+        cached_key, suffix = self._suffix
+        if key != cached_key:
+            text = ""
+            if message.version is not None:
+                text += f',"version":{serialize_json(message.version)}'
+            if message.time_extracted is not None:
+                text += f',"time_extracted":"{message.time_extracted.isoformat(sep="T")}"'
+            suffix = (text + "}\n").encode("ascii")
+            self._suffix = (key, suffix)
+        return prefix + record + suffix
+
+    def encode_record(self, record: Dict[str, Any]) -> bytes:
+        """Return `record` alone as a newline-terminated JSON line, for batch files."""
+        data = self._encode(record)
+        if data is None:
+            return (serialize_json(record) + "\n").encode("utf-8")
+        return data + b"\n"
+
+    def _encode(self, record: Dict[str, Any]) -> Optional[bytes]:
+        """Encode a record, or return None if the SDK's encoder must handle it."""
+        if self.use_orjson:
+            try:
+                data = orjson.dumps(record, default=_default, option=_ORJSON_OPTIONS)
+            except TypeError:
+                return None
+            # The SDK escapes everything outside printable ASCII
+            if not data.isascii() or b"\x7f" in data or not _orjson_compatible(record):
+                return None
+            return data
+        try:
+            return self._encoder.encode(record).encode("ascii")
+        except (TypeError, ValueError):
+            return None
+
+    def log_stats(self) -> None:
+        """Log how many records were serialized and how many needed the SDK's encoder."""
+        if self.records:
+            logger.info(
+                f"Serialized {self.records} RECORD messages with {self.backend}, "
+                f"{self.fallbacks} through the SDK's encoder"
+            )
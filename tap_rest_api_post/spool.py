@@ -0,0 +1,101 @@
+# tap_rest_api_post/spool.py
+"""Spooling of oversized response bodies for tap-rest-api-post."""
+
+import logging
+import mmap
+import tempfile
+from typing import IO, Optional
+
+import requests
+
+from tap_rest_api_post.jsonstream import CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPOOL_THRESHOLD_MB = 64
+
+# Attribute set on a response whose body was spooled to disk, with the body's size
+SPOOLED_BODY_ATTR = "spooled_body_bytes"
+
+# Mapped pages already read are handed back to the OS every this many bytes
+RELEASE_BYTES = 16 * 1024 * 1024
+
+
+class SpooledBody:
+    """
+    A response body in an anonymous temporary file, read through a read-only memory map.
+
+    Stands in for `response.raw`. Pages already read are dropped from the process
+    (where `madvise` is available), so resident memory does not grow with the
+    body. The file and the map are closed at the end of the body or on `close()`;
+    the file was never linked on POSIX, so nothing is left on disk either way.
+    """
+
+    def __init__(self, file: IO[bytes], size: int):
+        """Map `file`, which holds `size` bytes."""
+        self.size = size
+        self._file = file
+        self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._released = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to `size` bytes, or the rest of the body."""
+        if self._map.closed:
+            return b""
+        chunk = self._map.read(size)
+        if not chunk:
+            self.close()
+            return b""
+        position = self._map.tell()
+        if position - self._released >= RELEASE_BYTES and hasattr(self._map, "madvise"):
+            end = position - position % mmap.PAGESIZE
+            self._map.madvise(mmap.MADV_DONTNEED, self._released, end - self._released)
+            self._released = end
+        return chunk
+
+    def close(self) -> None:
+        """Unmap and delete the file."""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+
+def spool_response(response: requests.Response, threshold: int, directory: Optional[str] = None) -> bool:
+    """
+    Read a streamed response's body, into memory up to `threshold` bytes and into a temporary file beyond.
+
+    A body that fits is left in `response.content` as if it had not been streamed.
+    A larger one replaces `response.raw` with a `SpooledBody`, so `iter_content()`
+    reads it back from disk. Returns whether the body was spooled.
+    """
+    if response._content_consumed:  # type: ignore[attr-defined]
+        return False
+
+    buffer = bytearray()
+    file: Optional[IO[bytes]] = None
+    try:
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            if file is not None:
+                file.write(chunk)
+                continue
+            buffer += chunk
+            if len(buffer) > threshold:
+                file = tempfile.TemporaryFile(dir=directory)
+                file.write(buffer)
+                buffer = bytearray()
+        if file is None:
+            response._content = bytes(buffer)
+            return False
+        size = file.tell()
+        file.flush()
+    except BaseException:
+        if file is not None:
+            file.close()
+        response.close()
+        raise
+
+    response.raw = SpooledBody(file, size)
+    response._content = False
+    response._content_consumed = False  # type: ignore[attr-defined]
+    setattr(response, SPOOLED_BODY_ATTR, size)
+    return True
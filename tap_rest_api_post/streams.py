@@ -1,22 +1,118 @@
 # tap_rest_api_post/streams.py
 """Stream class for tap-rest-api-post."""
 
+import asyncio
 import logging
 import json
-from datetime import datetime
-from typing import Any, Dict, Iterable, Optional, List, Tuple
+import time
+from collections import deque
+from datetime import date, datetime, timezone
+from itertools import chain, islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncGenerator,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    Optional,
+    List,
+    Mapping,
+    NamedTuple,
+    Tuple,
+    Union,
+)
 
+import backoff
+import requests
+from singer_sdk import metrics
+from singer_sdk.exceptions import RetriableAPIError
 from singer_sdk.streams import RESTStream
 from singer_sdk.pagination import BaseAPIPaginator
 from singer_sdk.authenticators import SimpleAuthenticator
-from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
 
 
-from tap_rest_api_post.pagination import TotalPagesPaginator, SinglePagePaginator
+from tap_rest_api_post.batches import BatchStats, batcher_for, stream_batch_config
+from tap_rest_api_post.compression import DEFAULT_REQUEST_BODY_MIN_BYTES, accept_encoding, gzip_body, wire_bytes
+from tap_rest_api_post.concurrency import AsyncBufferedIterator, BufferedIterator, chunked, ordered_map
+from tap_rest_api_post.dedupe import RecordDeduplicator
+from tap_rest_api_post.fanout import fan_out_contexts, fan_out_values
+from tap_rest_api_post.fingerprint import credentials_digest, request_fingerprint
+from tap_rest_api_post.instrumentation import StreamInstrumentation
+from tap_rest_api_post.jsonpath import compile_jsonpath
+from tap_rest_api_post.pagehashes import PAGE_HASHES_KEY, PageChanges, page_hash
+from tap_rest_api_post.jsonstream import (
+    CAPTURED_VALUES_ATTR,
+    CHUNK_SIZE,
+    iter_json_path,
+    iter_text_chunks,
+    parse_capture_path,
+    parse_simple_path,
+)
+from tap_rest_api_post.pagination import PageSizeTuner, SinglePagePaginator, TotalPagesPaginator, TunedPage
+from tap_rest_api_post.spool import DEFAULT_SPOOL_THRESHOLD_MB, SPOOLED_BODY_ATTR, spool_response
+from tap_rest_api_post.transformations import compile_batch_transformations, compile_transformations, load_numpy
+from tap_rest_api_post.windows import date_windows, epoch_windows, parse_date
+
+if TYPE_CHECKING:
+    from tap_rest_api_post.async_engine import AsyncEngine
+    from tap_rest_api_post.tap import TapRestApiPost
 
 # Get a logger for this module
 logger = logging.getLogger(__name__)
 
+# Records are handed over from partition workers in chunks, and each partition
+# buffers at most this many chunks before its worker waits for the consumer.
+PARTITION_CHUNK_SIZE = 500
+PARTITION_BUFFER_CHUNKS = 20
+# With the asyncio engine, partitions hand over whole responses instead
+PARTITION_BUFFER_PAGES = 4
+
+# Records transformed together in batch_transformations mode; bounds memory for streamed pages
+BATCH_TRANSFORM_SIZE = 10_000
+
+# Context state key holding the last completed page of an interrupted sync
+PAGE_CHECKPOINT_KEY = "page_checkpoint"
+
+# Attribute set on a prepared request whose body was gzip-encoded, with the body's original size
+UNCOMPRESSED_BODY_SIZE_ATTR = "uncompressed_body_size"
+
+
+class FetchedPage(NamedTuple):
+    """A page handed from a page source to `_consume_pages`."""
+
+    number: Any
+    total_pages: Optional[int]
+    # None when the page is unchanged since the last sync, so its records are skipped
+    records: Optional[Iterator[dict]]
+    # (request fingerprint, content hash) with `skip_unchanged_pages`
+    page_hash: Optional[Tuple[str, str]] = None
+
+
+def _unstreamable_path(config: Dict[str, Any]) -> Optional[str]:
+    """Return why a stream's responses cannot be parsed incrementally, or None if they can."""
+    records_path = parse_simple_path(config["records_path"])
+    if records_path is None:
+        return (
+            f"records_path '{config['records_path']}' of stream '{config['name']}' is not a simple "
+            "path like '$.data.rewards[*]'"
+        )
+    pagination_config = config.get("pagination") or {}
+    total_pages_path = pagination_config.get("total_pages_path")
+    if pagination_config.get("strategy") == "total_pages" and total_pages_path:
+        capture_keys = parse_capture_path(total_pages_path)
+        # Values inside the records are decoded with them, so they cannot be picked up on the way
+        if capture_keys is None or capture_keys[:len(records_path[0])] == records_path[0]:
+            return (
+                f"total_pages_path '{total_pages_path}' of stream '{config['name']}' is not a simple "
+                "path like '$.data.pagination.totalPages' outside records_path"
+            )
+    return None
+
 
 class DynamicStream(RESTStream):
     """
@@ -25,12 +121,105 @@ class DynamicStream(RESTStream):
     
     # Force POST method
     rest_method = "POST"
+
+    # Streams are only created by TapRestApiPost, whose shared resources they use
+    _tap: "TapRestApiPost"
     
     def __init__(self, tap, config: Dict[str, Any]):
         """Initialize the dynamic stream."""
         self.stream_config = config
         self._cached_authenticator = None
+        self._cached_fingerprint_scope: Optional[str] = None
+        # Set while the tap's read-ahead fetches this stream before the SDK syncs it
+        self._reading_ahead = False
+        self._read_ahead_page_hashes: Dict[str, Dict[str, str]] = {}
+        self._partitions: Optional[List[Mapping[str, Any]]] = None
+        self._partition_index: Dict[str, int] = {}
+        self._partition_buffers: Dict[str, Union[BufferedIterator, AsyncBufferedIterator]] = {}
+        self._batch_transforms = (
+            compile_batch_transformations(config.get("transformations"))
+            if config.get("batch_transformations")
+            else None
+        )
+        self._row_transforms = [] if self._batch_transforms is not None else compile_transformations(
+            config.get("transformations")
+        )
+        self._records_jsonpath = compile_jsonpath(config["records_path"])
+        self._deduplicator = RecordDeduplicator.from_config(
+            config["name"], config.get("primary_keys"), config.get("dedupe")
+        )
+        self._stream_parsing = bool(config.get("stream_parsing"))
+        unstreamable = _unstreamable_path(config)
+        if self._stream_parsing and unstreamable:
+            logger.warning(f"{unstreamable}. Parsing whole responses instead of streaming them.")
+            self._stream_parsing = False
+        spool = config.get("spool") or {}
+        self._spool_threshold: Optional[int] = None
+        self._spool_directory: Optional[str] = spool.get("directory")
+        if spool and not self._stream_parsing:
+            if unstreamable:
+                logger.warning(f"{unstreamable}, so spooled responses could not be parsed from disk. Not spooling.")
+            elif config.get("engine") == "asyncio":
+                logger.warning(
+                    f"Stream '{config['name']}' uses the asyncio engine, which reads response bodies into memory. "
+                    "Not spooling."
+                )
+            else:
+                threshold_mb = float(spool.get("threshold_mb") or DEFAULT_SPOOL_THRESHOLD_MB)
+                self._spool_threshold = int(threshold_mb * 1024 * 1024)
+        # Bodies are left on the socket when parsed incrementally or possibly spooled
+        self._stream_bodies = self._stream_parsing or self._spool_threshold is not None
+        self._page_changes = PageChanges(config["name"]) if config.get("skip_unchanged_pages") else None
+        if self._page_changes is not None and self._stream_bodies:
+            logger.warning(
+                f"Stream '{config['name']}' streams or spools response bodies, which cannot be hashed before "
+                "their records are emitted. Not skipping unchanged pages."
+            )
+            self._page_changes = None
+        self._batch_config = (
+            stream_batch_config(config["name"], tap.config.get("batch_config"))
+            if config.get("batch_messages", True)
+            else None
+        )
+        self._batch_stats = BatchStats(config["name"])
+        if self._batch_config is not None and (config.get("pagination") or {}).get("checkpoint"):
+            logger.warning(
+                f"Stream '{config['name']}' writes BATCH messages, and a page checkpoint could cover records not "
+                "yet in a batch file. Not checkpointing pages."
+            )
+        compression = config.get("compression") or {}
+        self._accept_encoding = (
+            accept_encoding(compression["response_encodings"]) if compression.get("response_encodings") else None
+        )
+        self._gzip_request_body = bool(compression.get("request_body_gzip"))
+        self._gzip_min_bytes = int(compression.get("request_body_min_bytes") or DEFAULT_REQUEST_BODY_MIN_BYTES)
+        self.instrumentation = StreamInstrumentation.from_config(config["name"], tap.config.get("instrumentation"))
         super().__init__(tap=tap)
+        if self._batch_transforms is not None:
+            logger.info(
+                f"Stream '{self.name}' transforms pages in batches "
+                f"({'NumPy' if load_numpy() is not None else 'pure Python'} columns)"
+            )
+        pagination_config = config.get("pagination") or {}
+        if (pagination_config.get("auto_page_size") or {}).get("enabled") and not self.auto_page_size:
+            logger.warning(
+                f"Stream '{self.name}' needs the total_pages strategy and a page_size_param to tune its page size. "
+                "Using a fixed page size."
+            )
+        elif self.auto_page_size and config.get("engine") == "asyncio":
+            logger.warning(
+                f"Stream '{self.name}' uses the asyncio engine, which does not tune page sizes. "
+                "Using a fixed page size."
+            )
+        elif self.auto_page_size and (self.page_concurrency > 1 or self.page_prefetch > 0):
+            logger.warning(
+                f"Stream '{self.name}' tunes its page size, which fetches pages one at a time. "
+                "Ignoring pagination.concurrency and pagination.prefetch."
+            )
+        self._tuned_page_size: Optional[int] = None
+        self._tap.connections.mount(self.requests_session, self.url_base)
+        rate_limiters = self._tap.rate_limiters
+        self._rate_limiter = rate_limiters.limiter_for(self.url_base) if rate_limiters is not None else None
 
     @property
     def name(self) -> str:
@@ -76,6 +265,42 @@ class DynamicStream(RESTStream):
             
         return self._cached_authenticator
 
+    @property
+    def _fingerprint_scope(self) -> str:
+        """Return the stream name and a hash of its credentials, to keep their cached responses apart."""
+        if self._cached_fingerprint_scope is None:
+            authenticator = self.authenticator
+            digest = credentials_digest(authenticator.auth_headers, authenticator.auth_params)
+            self._cached_fingerprint_scope = f"{self.name}:{digest}"
+        return self._cached_fingerprint_scope
+
+    @property
+    def http_headers(self) -> dict:
+        """Return the headers sent with every request, including the negotiated response encodings."""
+        headers = dict(super().http_headers)
+        if self._accept_encoding:
+            headers["Accept-Encoding"] = self._accept_encoding
+        return headers
+
+    def prepare_request(
+        self, context: Optional[Mapping[str, Any]], next_page_token: Optional[Any]
+    ) -> requests.PreparedRequest:
+        """Prepare a request, gzip-encoding its body when configured and large enough."""
+        prepared_request = super().prepare_request(context, next_page_token)
+        body = prepared_request.body
+        if not self._gzip_request_body or not body or not isinstance(body, (str, bytes)):
+            return prepared_request
+
+        raw = body.encode("utf-8") if isinstance(body, str) else body
+        if len(raw) < self._gzip_min_bytes:
+            return prepared_request
+        compressed = gzip_body(raw)
+        prepared_request.body = compressed
+        prepared_request.headers["Content-Encoding"] = "gzip"
+        prepared_request.headers["Content-Length"] = str(len(compressed))
+        setattr(prepared_request, UNCOMPRESSED_BODY_SIZE_ATTR, len(raw))
+        return prepared_request
+
     def get_new_paginator(self) -> BaseAPIPaginator:
         """Get a paginator for this stream, if configured."""
         pagination_config = self.stream_config.get("pagination")
@@ -95,12 +320,499 @@ class DynamicStream(RESTStream):
             logger.warning(f"Unknown pagination strategy '{strategy}' for stream '{self.name}'. Using SinglePagePaginator.")
             return SinglePagePaginator()
 
+    @property
+    def page_concurrency(self) -> int:
+        """Return how many pages may be fetched at the same time."""
+        pagination_config = self.stream_config.get("pagination") or {}
+        return max(1, int(pagination_config.get("concurrency") or 1))
+
+    @property
+    def page_prefetch(self) -> int:
+        """Return how many pages may be fetched ahead of the page being processed."""
+        pagination_config = self.stream_config.get("pagination") or {}
+        return max(0, int(pagination_config.get("prefetch") or 0))
+
+    @property
+    def page_checkpoints(self) -> bool:
+        """Return whether the last completed page is saved in STATE so interrupted syncs can resume."""
+        pagination_config = self.stream_config.get("pagination") or {}
+        return bool(pagination_config.get("checkpoint")) and self._batch_config is None
+
+    @property
+    def auto_page_size(self) -> bool:
+        """Return whether the page size is tuned while syncing instead of fixed."""
+        pagination_config = self.stream_config.get("pagination") or {}
+        return (
+            bool((pagination_config.get("auto_page_size") or {}).get("enabled"))
+            and pagination_config.get("strategy") == "total_pages"
+            and bool(pagination_config.get("page_size_param"))
+        )
+
+    @property
+    def async_engine(self) -> Optional["AsyncEngine"]:
+        """Return the tap's asyncio engine if this stream opted into it and aiohttp is installed."""
+        if self.stream_config.get("engine") != "asyncio":
+            return None
+        return self._tap.async_engine
+
+    def request_records(self, context: Optional[Mapping[str, Any]]) -> Iterable[dict]:
+        """Request records from the endpoint, following pagination."""
+        # Pages fetched ahead are done before their records are written, so they cannot checkpoint pages
+        yield from self._request_pages(context, checkpoint=self.page_checkpoints and not self._reading_ahead)
+
+    def _request_pages(self, context: Optional[Mapping[str, Any]], checkpoint: bool) -> Iterator[dict]:
+        """
+        Yield the records of every page, following pagination.
+
+        With `checkpoint`, the page just finished is saved in the context's state and
+        a STATE message is written before the next page is read. Records are consumed
+        as they are yielded, so by then every record of that page has been written.
+
+        With `pagination.auto_page_size`, each context tunes its own page size,
+        starting where the stream's previous context ended.
+
+        With `engine: asyncio`, pages are requested on the tap's event loop and
+        parsed here, as they are consumed.
+        """
+        if self._window_finished(context):
+            return
+        paginator = self.get_new_paginator()
+        engine = self.async_engine
+
+        tuner = None
+        if engine is None and self.auto_page_size and isinstance(paginator, TotalPagesPaginator):
+            tuner = PageSizeTuner.from_config(self.name, self.stream_config["pagination"], self._tuned_page_size)
+
+        fingerprint = None
+        if checkpoint and isinstance(paginator, TotalPagesPaginator):
+            fingerprint = self._checkpoint_fingerprint(context)
+            if not self._resume_from_checkpoint(context, paginator, fingerprint, tuner):
+                return
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            if engine is not None:
+                page_records = self._parse_pages(
+                    context,
+                    AsyncBufferedIterator(self._aiter_pages(context, paginator, request_counter), engine.loop, maxsize=1),
+                )
+            else:
+                page_records = self._iter_pages(context, paginator, request_counter, tuner)
+            yield from self._consume_pages(context, page_records, fingerprint, tuner)
+
+        if tuner is not None:
+            self._tuned_page_size = tuner.page_size
+            tuner.log_stats()
+        if fingerprint is not None:
+            with self._tap.state_lock:
+                self.get_context_state(context).pop(PAGE_CHECKPOINT_KEY, None)
+
+    def _consume_pages(
+        self,
+        context: Optional[Mapping[str, Any]],
+        page_records: Generator[FetchedPage, None, None],
+        fingerprint: Optional[str] = None,
+        tuner: Optional[PageSizeTuner] = None,
+    ) -> Iterator[dict]:
+        """
+        Yield the records of each page up to the first empty one, saving a page checkpoint after each if `fingerprint` is set.
+
+        With `pagination.sort_order: desc`, pagination also stops after the first page
+        holding a record older than the context's bookmark. With `skip_unchanged_pages`,
+        the content hashes of the pages are saved once all of them were consumed.
+        """
+        pages = 0
+        bookmark = self._descending_bookmark(context)
+        page_hashes: Dict[str, str] = {}
+        try:
+            for page in page_records:
+                oldest = None
+                if page.records is not None:
+                    try:
+                        first_record = next(page.records)
+                    except StopIteration:
+                        logger.info(
+                            f"Pagination stopped after {pages} pages for stream '{self.name}' "
+                            "because no records were found in the last response"
+                        )
+                        break
+                    if bookmark is None:
+                        yield first_record
+                        yield from page.records
+                    else:
+                        for record in chain((first_record,), page.records):
+                            yield record
+                            # Read after the yield, once post_process has mapped and converted the record
+                            value = self._comparable_replication_value(record.get(self.replication_key))
+                            if value is not None and (oldest is None or value < oldest):
+                                oldest = value
+                if page.page_hash is not None:
+                    page_hashes[page.page_hash[0]] = page.page_hash[1]
+                pages += 1
+                if self.instrumentation is not None:
+                    self.instrumentation.maybe_report()
+                if fingerprint is not None:
+                    self._save_page_checkpoint(context, fingerprint, page.number, page.total_pages, tuner)
+                if bookmark is not None and oldest is not None and oldest < bookmark:
+                    logger.info(
+                        f"Pagination stopped after {pages} pages for stream '{self.name}' because the last "
+                        f"page reached records older than the bookmark"
+                    )
+                    break
+            self._save_page_hashes(context, page_hashes)
+        finally:
+            page_records.close()
+
+    def _descending_bookmark(self, context: Optional[Mapping[str, Any]]) -> Optional[Any]:
+        """Return the context's bookmark to stop paginating at, for streams whose pages are newest-first."""
+        pagination_config = self.stream_config.get("pagination") or {}
+        if pagination_config.get("sort_order") != "desc" or not self.replication_key:
+            return None
+        return self._comparable_replication_value(self.get_starting_replication_key_value(context))
+
+    def _comparable_replication_value(self, value: Any) -> Any:
+        """Return a replication key value in a form that orders correctly, parsing timestamps."""
+        if value is None or not self.is_timestamp_replication_key:
+            return value
+        try:
+            # fromisoformat only reads a trailing Z from Python 3.11
+            text = str(value)
+            parsed = datetime.fromisoformat(text[:-1] + "+00:00" if text.endswith("Z") else text)
+        except ValueError:
+            return None
+        # Naive timestamps are taken as UTC, like the SDK does
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+    def _iter_pages(
+        self,
+        context: Optional[Mapping[str, Any]],
+        paginator: BaseAPIPaginator,
+        request_counter: metrics.Counter,
+        tuner: Optional[PageSizeTuner] = None,
+    ) -> Generator[FetchedPage, None, None]:
+        """
+        Yield every page, following pagination.
+
+        Records are parsed as they are consumed. The paginator advances once the
+        caller asks for the next page, after it has consumed the current one.
+        """
+        decorated_request = self.request_decorator(self._request)
+        for prepared_request, response in self._iter_responses(context, paginator, decorated_request, tuner):
+            request_counter.increment()
+            self.update_sync_costs(prepared_request, response, context)
+            hashed, unchanged = self._check_page(context, response)
+            records = None
+            if not unchanged:
+                records = iter(self.parse_response(response))
+                if tuner is not None:
+                    records = tuner.read_page(records)
+            yield FetchedPage(paginator.current_value, getattr(paginator, "total_pages", None), records, hashed)
+
+            resized = tuner is not None and tuner.record_page(paginator.current_value, wire_bytes(response))
+            paginator.advance(response)
+            if resized and not paginator.finished:
+                # Only TotalPagesPaginator streams get a tuner
+                assert tuner is not None and isinstance(paginator, TotalPagesPaginator)
+                paginator.restart_at(tuner.next_page)
+
+    async def _aiter_pages(
+        self,
+        context: Optional[Mapping[str, Any]],
+        paginator: BaseAPIPaginator,
+        request_counter: metrics.Counter,
+    ) -> AsyncGenerator[Tuple[Any, Optional[int], requests.Response], None]:
+        """
+        Yield (page, total pages, response) for every page, sending requests through the asyncio engine.
+
+        Pages are requested one at a time until a TotalPagesPaginator knows
+        `totalPages`; then up to `pagination.concurrency` (or `prefetch` + 1)
+        requests are in flight at once, and responses are still yielded in page order.
+        """
+        decorated_request = self.request_decorator(self._async_request)
+        in_flight = max(self.page_concurrency, self.page_prefetch + 1)
+        while not paginator.finished:
+            first_page = paginator.current_value
+            total_pages = getattr(paginator, "total_pages", None)
+            if total_pages is not None and in_flight > 1:
+                logger.info(
+                    f"Fetching pages {first_page}..{total_pages} for stream '{self.name}' "
+                    f"with up to {in_flight} requests in flight"
+                )
+                page_tokens: Iterable[Any] = range(first_page, total_pages + 1)
+            else:
+                page_tokens = [first_page]
+
+            responses = self._asend_in_order(context, page_tokens, decorated_request, in_flight)
+            try:
+                async for prepared_request, response in responses:
+                    request_counter.increment()
+                    self.update_sync_costs(prepared_request, response, context)
+                    yield paginator.current_value, getattr(paginator, "total_pages", None), response
+                    paginator.advance(response)
+            finally:
+                await responses.aclose()
+
+    async def _asend_in_order(
+        self,
+        context: Optional[Mapping[str, Any]],
+        page_tokens: Iterable[Any],
+        decorated_request: Callable,
+        in_flight: int,
+    ) -> AsyncGenerator[Tuple[requests.PreparedRequest, requests.Response], None]:
+        """Send the requests for `page_tokens` with up to `in_flight` at once, yielding (request, response) in order."""
+        pending: Deque[Tuple[requests.PreparedRequest, "asyncio.Future[requests.Response]"]] = deque()
+        page_tokens = iter(page_tokens)
+
+        def send_next(count: int) -> None:
+            for page_token in islice(page_tokens, count):
+                prepared_request = self.prepare_request(context, next_page_token=page_token)
+                pending.append((prepared_request, asyncio.ensure_future(decorated_request(prepared_request, context))))
+
+        try:
+            send_next(in_flight)
+            while pending:
+                prepared_request, task = pending.popleft()
+                response = await task
+                send_next(1)
+                yield prepared_request, response
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    def _parse_pages(
+        self,
+        context: Optional[Mapping[str, Any]],
+        responses: AsyncBufferedIterator[Tuple[Any, Optional[int], requests.Response]],
+    ) -> Generator[FetchedPage, None, None]:
+        """Parse the responses of `_aiter_pages` on the consuming thread, keeping the event loop free for I/O."""
+        try:
+            for page, total_pages, response in responses:
+                hashed, unchanged = self._check_page(context, response)
+                records = None if unchanged else iter(self.parse_response(response))
+                yield FetchedPage(page, total_pages, records, hashed)
+        finally:
+            responses.close()
+
+    def _check_page(
+        self, context: Optional[Mapping[str, Any]], response: requests.Response
+    ) -> Tuple[Optional[Tuple[str, str]], bool]:
+        """
+        Hash a page with `skip_unchanged_pages`, returning its (fingerprint, hash) and whether it is unchanged.
+
+        A page is unchanged if the same request got a byte-identical body in the
+        last sync, according to the tap's page hash file or else the context's state.
+        """
+        if self._page_changes is None:
+            return None, False
+        fingerprint, content_hash = page_hash(response, self._fingerprint_scope)
+        hash_file = self._tap.page_hash_file
+        if hash_file is not None:
+            previous = hash_file.get(fingerprint)
+        else:
+            with self._tap.state_lock:
+                previous = (self.get_context_state(context).get(PAGE_HASHES_KEY) or {}).get(fingerprint)
+        unchanged = previous == content_hash
+        self._page_changes.add(unchanged)
+        return (fingerprint, content_hash), unchanged
+
+    def _save_page_hashes(self, context: Optional[Mapping[str, Any]], page_hashes: Dict[str, str]) -> None:
+        """Save the content hashes of a context's pages, replacing those of the last sync in state."""
+        if self._page_changes is None:
+            return
+        hash_file = self._tap.page_hash_file
+        if hash_file is not None:
+            hash_file.update(page_hashes)
+            return
+        with self._tap.state_lock:
+            if self._reading_ahead:
+                # Saved in state by get_records once the context's records are written
+                self._read_ahead_page_hashes[json.dumps(context, sort_keys=True)] = page_hashes
+            else:
+                self.get_context_state(context)[PAGE_HASHES_KEY] = page_hashes
+
+    def _checkpoint_fingerprint(self, context: Optional[Mapping[str, Any]]) -> str:
+        """Fingerprint the context's request without its page parameter, to tell if a checkpoint still applies."""
+        prepared_request = self.prepare_request(context, next_page_token=None)
+        pagination_config = self.stream_config.get("pagination") or {}
+        ignored_params = [pagination_config.get("page_param")]
+        if self.auto_page_size:
+            # The checkpoint records the page size it was taken at
+            ignored_params.append(pagination_config.get("page_size_param"))
+        return request_fingerprint(
+            prepared_request.method,
+            prepared_request.url,
+            prepared_request.body,
+            ignored_params=tuple(param for param in ignored_params if param),
+        )
+
+    def _resume_from_checkpoint(
+        self,
+        context: Optional[Mapping[str, Any]],
+        paginator: TotalPagesPaginator,
+        fingerprint: str,
+        tuner: Optional[PageSizeTuner] = None,
+    ) -> bool:
+        """Move the paginator past the pages a previous run completed. Returns False if none are left."""
+        with self._tap.state_lock:
+            saved = self.get_context_state(context).get(PAGE_CHECKPOINT_KEY)
+        if not saved:
+            return True
+        if saved.get("fingerprint") != fingerprint:
+            logger.info(
+                f"Ignoring page checkpoint of stream '{self.name}' because the request body or date range changed"
+            )
+            return True
+
+        page = int(saved["page"])
+        total_pages = saved.get("total_pages")
+        if total_pages is not None and page >= int(total_pages):
+            logger.info(f"All {total_pages} pages of stream '{self.name}' were already synced; nothing to resume")
+            return False
+        logger.info(f"Resuming stream '{self.name}' at page {page + 1} of {total_pages} from its page checkpoint")
+        if tuner is not None and saved.get("page_size"):
+            tuner.resume(page * int(saved["page_size"]), int(saved["page_size"]))
+        paginator.resume_at(page + 1)
+        return True
+
+    def _save_page_checkpoint(
+        self,
+        context: Optional[Mapping[str, Any]],
+        fingerprint: str,
+        page: int,
+        total_pages: Optional[int],
+        tuner: Optional[PageSizeTuner] = None,
+    ) -> None:
+        """Save the page just completed in the context's state and write a STATE message."""
+        checkpoint = {
+            "fingerprint": fingerprint,
+            "page": page,
+            "total_pages": total_pages,
+        }
+        if tuner is not None:
+            # Page numbers only hold at the page size they were counted in
+            checkpoint["page_size"] = tuner.page_size
+        with self._tap.state_lock:
+            self.get_context_state(context)[PAGE_CHECKPOINT_KEY] = checkpoint
+            self._write_state_message()
+
+    def _iter_responses(
+        self,
+        context: Optional[Mapping[str, Any]],
+        paginator: BaseAPIPaginator,
+        decorated_request: Callable,
+        tuner: Optional[PageSizeTuner] = None,
+    ) -> Iterator[Tuple[requests.PreparedRequest, requests.Response]]:
+        """
+        Yield (request, response) pairs in page order.
+
+        The caller advances the paginator after each page. Once a TotalPagesPaginator
+        knows `totalPages`, the remaining pages are sent through a bounded worker pool
+        when `pagination.concurrency` is above 1. Requests are still prepared here, on
+        the calling thread, and responses come back in page order.
+
+        Otherwise, with `pagination.prefetch` set, one background thread keeps sending
+        the next pages one at a time, holding at most `prefetch` responses while the
+        caller transforms and writes the current page.
+
+        With a `tuner`, pages are sent one at a time at the tuner's page size.
+        """
+        if tuner is not None:
+            # Only TotalPagesPaginator streams get a tuner
+            assert isinstance(paginator, TotalPagesPaginator)
+            yield from self._iter_tuned_responses(context, paginator, decorated_request, tuner)
+            return
+
+        def send(prepared_request: requests.PreparedRequest) -> Tuple[requests.PreparedRequest, requests.Response]:
+            return prepared_request, decorated_request(prepared_request, context)
+
+        concurrency = self.page_concurrency
+        prefetch = self.page_prefetch
+        while not paginator.finished:
+            yield send(self.prepare_request(context, next_page_token=paginator.current_value))
+
+            total_pages = getattr(paginator, "total_pages", None)
+            if total_pages is None or paginator.finished:
+                continue
+            if concurrency > 1:
+                logger.info(
+                    f"Fetching pages {paginator.current_value}..{total_pages} for stream "
+                    f"'{self.name}' with {concurrency} workers"
+                )
+                prepared_requests = (
+                    self.prepare_request(context, next_page_token=page)
+                    for page in range(paginator.current_value, total_pages + 1)
+                )
+                yield from ordered_map(
+                    send,
+                    prepared_requests,
+                    max_workers=concurrency,
+                    thread_name_prefix=f"{self.name}-pages",
+                )
+                return
+            if prefetch > 0:
+                logger.info(
+                    f"Prefetching pages {paginator.current_value}..{total_pages} for stream "
+                    f"'{self.name}' up to {prefetch} pages ahead"
+                )
+                pages = range(paginator.current_value, total_pages + 1)
+                responses = BufferedIterator(
+                    (send(self.prepare_request(context, next_page_token=page)) for page in pages),
+                    maxsize=prefetch,
+                    name=f"{self.name}-prefetch",
+                )
+                try:
+                    yield from responses
+                finally:
+                    responses.close()
+                return
+
+    def _iter_tuned_responses(
+        self,
+        context: Optional[Mapping[str, Any]],
+        paginator: TotalPagesPaginator,
+        decorated_request: Callable,
+        tuner: PageSizeTuner,
+    ) -> Iterator[Tuple[requests.PreparedRequest, requests.Response]]:
+        """
+        Yield (request, response) pairs one page at a time, at the tuner's page size.
+
+        Each page is tried once without retries. If it times out or the API answers
+        with a 5xx, the tuner halves the page size and the page is requested again at
+        the new size; once the size cannot shrink further, or for any other retriable
+        failure, the request is retried with the usual backoff.
+        """
+        while not paginator.finished:
+            prepared_request = self.prepare_request(context, next_page_token=tuner.token(paginator.current_value))
+            tuner.page_started()
+            try:
+                response = self._request(prepared_request, context)
+            except (RetriableAPIError, requests.exceptions.RequestException) as error:
+                if self._is_overloaded(error) and tuner.back_off():
+                    paginator.restart_at(tuner.next_page)
+                    continue
+                response = decorated_request(prepared_request, context)
+            yield prepared_request, response
+
+    @staticmethod
+    def _is_overloaded(error: Exception) -> bool:
+        """Return whether a failed request timed out or got a 5xx, which a smaller page may avoid."""
+        if isinstance(error, requests.exceptions.Timeout):
+            return True
+        response = getattr(error, "response", None)
+        return isinstance(error, RetriableAPIError) and response is not None and response.status_code >= 500
+
     def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
+        self, context: Optional[Mapping[str, Any]], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Get URL query parameters."""
         params: Dict[str, Any] = {}
         pagination_config = self.stream_config.get("pagination")
+        page_size = pagination_config.get("page_size") if pagination_config else None
+
+        # Tuned page sizes travel with the page number
+        if isinstance(next_page_token, TunedPage):
+            next_page_token, page_size = next_page_token
 
         if pagination_config and next_page_token:
             # Add page parameter
@@ -108,12 +820,12 @@ class DynamicStream(RESTStream):
                 params[pagination_config["page_param"]] = next_page_token
             
             # Add page size parameter
-            if "page_size" in pagination_config and "page_size_param" in pagination_config:
-                params[pagination_config["page_size_param"]] = pagination_config["page_size"]
+            if page_size is not None and "page_size_param" in pagination_config:
+                params[pagination_config["page_size_param"]] = page_size
         
         # For the first request, still add page size if configured
-        elif pagination_config and "page_size" in pagination_config and "page_size_param" in pagination_config:
-            params[pagination_config["page_size_param"]] = pagination_config["page_size"]
+        elif pagination_config and page_size is not None and "page_size_param" in pagination_config:
+            params[pagination_config["page_size_param"]] = page_size
             # Also add page=1 for first request if page_param is configured
             if "page_param" in pagination_config:
                 params[pagination_config["page_param"]] = 1
@@ -122,10 +834,15 @@ class DynamicStream(RESTStream):
         return params
 
     def prepare_request_payload(
-        self, context: Optional[dict], next_page_token: Optional[Any]
+        self, context: Optional[Mapping[str, Any]], next_page_token: Optional[Any]
     ) -> Optional[dict]:
         """Prepare the JSON-encoded request body for the POST request."""
         body = self.stream_config.get("body", {}).copy()
+
+        # Each fan-out partition sends its own value, or chunk of values
+        fan_out = self.stream_config.get("fan_out")
+        if fan_out and context and fan_out["field"] in context:
+            body[fan_out["field"]] = context[fan_out["field"]]
         
         # Handle date injection
         date_handling = self.stream_config.get("date_handling", {})
@@ -134,10 +851,11 @@ class DynamicStream(RESTStream):
             start_date, end_date = self._get_date_range(context)
             
             if date_handling.get("type") == "epoch":
-                if start_date and "start_field" in date_handling:
-                    body[date_handling["start_field"]] = self._convert_date_to_epoch(start_date)
-                if end_date and "end_field" in date_handling:
-                    body[date_handling["end_field"]] = self._convert_date_to_epoch(end_date)
+                start_epoch, end_epoch = self._get_epoch_range(context, start_date, end_date)
+                if start_epoch is not None and "start_field" in date_handling:
+                    body[date_handling["start_field"]] = start_epoch
+                if end_epoch is not None and "end_field" in date_handling:
+                    body[date_handling["end_field"]] = end_epoch
                     
             elif date_handling.get("type") == "date_string":
                 if start_date and "start_field" in date_handling:
@@ -155,7 +873,7 @@ class DynamicStream(RESTStream):
         logger.debug(f"Request payload for stream '{self.name}': {json.dumps(body, indent=2)}")
         return body
 
-    def _get_date_range(self, context: Optional[dict]) -> Tuple[Optional[str], Optional[str]]:
+    def _get_date_range(self, context: Optional[Mapping[str, Any]]) -> Tuple[Optional[str], Optional[str]]:
         """Get the date range for the request based on configuration and state."""
         start_date = None
         
@@ -172,30 +890,462 @@ class DynamicStream(RESTStream):
         if not start_date:
             start_date = self.stream_config.get("start_date") or self._tap.config.get("start_date")
         
-        # Get end date - always use current date if not specified
-        end_date = self.stream_config.get("end_date") or self._tap.config.get("current_date")
-        if not end_date:
-            end_date = datetime.now().strftime("%Y-%m-%d")
+        end_date = self._get_end_date()
+
+        # Clip to the date window this context covers, if any
+        if context and "window_start" in context:
+            window_start = parse_date(context["window_start"])
+            window_end = parse_date(context["window_end"])
+            if not start_date or parse_date(start_date) < window_start:
+                start_date = window_start.isoformat()
+            if parse_date(end_date) > window_end:
+                end_date = window_end.isoformat()
             
         logger.debug(f"Date range for stream '{self.name}': {start_date} to {end_date}")
         return start_date, end_date
 
+    def _window_finished(self, context: Optional[Mapping[str, Any]]) -> bool:
+        """
+        Return whether a date or epoch window was already synced to its end by a previous run.
+
+        Only the window's own bookmark counts: a window that has none yet, or a
+        stream without a replication key, is always requested.
+        """
+        if not context or not self.replication_key or not ("window_end" in context or "end_epoch" in context):
+            return False
+        with self._tap.state_lock:
+            state = self.get_context_state(context)
+            bookmark = state.get("replication_key_value")
+            if state.get("replication_key") != self.replication_key or bookmark is None:
+                return False
+        try:
+            if "window_end" in context:
+                finished = parse_date(bookmark) >= parse_date(context["window_end"])
+            elif isinstance(bookmark, int) and not isinstance(bookmark, bool):
+                finished = bookmark >= context["end_epoch"]
+            else:
+                finished = self._convert_date_to_epoch(str(bookmark)) >= context["end_epoch"]
+        except ValueError:
+            return False
+        if finished:
+            logger.debug(f"Skipping finished window {context} of stream '{self.name}' at bookmark {bookmark}")
+        return finished
+
+    def _get_end_date(self) -> str:
+        """Return the configured end date, defaulting to today."""
+        end_date = self.stream_config.get("end_date") or self._tap.config.get("current_date")
+        if not end_date:
+            end_date = datetime.now().strftime("%Y-%m-%d")
+        return end_date
+
+    def _get_epoch_range(
+        self, context: Optional[Mapping[str, Any]], start_date: Optional[str], end_date: Optional[str]
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Convert the date range to epochs, clipped to the epoch window of the context."""
+        start_epoch = self._convert_date_to_epoch(start_date) if start_date else None
+        end_epoch = self._convert_date_to_epoch(end_date) if end_date else None
+        if context and "start_epoch" in context:
+            if start_epoch is None or start_epoch < context["start_epoch"]:
+                start_epoch = context["start_epoch"]
+            if end_epoch is None or end_epoch > context["end_epoch"]:
+                end_epoch = context["end_epoch"]
+        return start_epoch, end_epoch
+
+    @property
+    def window_concurrency(self) -> int:
+        """Return how many date windows may be synced at the same time."""
+        date_handling = self.stream_config.get("date_handling") or {}
+        return max(1, int(date_handling.get("window_concurrency") or 1))
+
+    @property
+    def partition_concurrency(self) -> int:
+        """Return how many partitions (date windows and fan-out values) may be synced at the same time."""
+        fan_out = self.stream_config.get("fan_out") or {}
+        return max(self.window_concurrency, int(fan_out.get("concurrency") or 1))
+
+    @property
+    def partitions(self) -> Optional[List[Mapping[str, Any]]]:
+        """
+        Return one context per date window and fan-out value, when configured.
+
+        With both, every fan-out value is synced over every date window.
+        """
+        date_handling = self.stream_config.get("date_handling") or {}
+        windowed = bool(date_handling.get("window") or date_handling.get("window_epochs"))
+        fan_out = self.stream_config.get("fan_out")
+        if not windowed and not fan_out:
+            return super().partitions
+
+        if self._partitions is None:
+            windows = self._build_date_windows(date_handling) if windowed else []
+            self._partitions = list(self._build_fan_out_partitions(fan_out, windows) if fan_out else windows)
+            self._partition_index = {
+                json.dumps(partition, sort_keys=True): index for index, partition in enumerate(self._partitions)
+            }
+        return self._partitions or None
+
+    def _build_fan_out_partitions(self, fan_out: Dict[str, Any], windows: List[dict]) -> List[dict]:
+        """Build one context per fan-out value or chunk of values, times each date window if any."""
+        values = fan_out_values(fan_out)
+        if not values:
+            logger.warning(f"Stream '{self.name}' has fan_out configured but no values. Not fanning out.")
+            return windows
+        contexts = fan_out_contexts(fan_out["field"], values, int(fan_out.get("values_per_partition") or 1))
+        if windows:
+            contexts = [dict(context, **window) for context in contexts for window in windows]
+        logger.info(
+            f"Fanned stream '{self.name}' out over {len(values)} values of '{fan_out['field']}' "
+            f"into {len(contexts)} partitions"
+        )
+        return contexts
+
+    def _build_date_windows(self, date_handling: Dict[str, Any]) -> List[dict]:
+        """Split the configured date range into window contexts."""
+        start_date = self.stream_config.get("start_date") or self._tap.config.get("start_date")
+        if not start_date:
+            logger.warning(f"Stream '{self.name}' has date windows configured but no start_date. Syncing a single range.")
+            return []
+        start = parse_date(start_date)
+        end = parse_date(self._get_end_date())
+
+        if date_handling.get("window_epochs"):
+            windows: List[dict] = [
+                {"start_epoch": window_start, "end_epoch": window_end}
+                for window_start, window_end in epoch_windows(
+                    self._convert_date_to_epoch(start.isoformat()),
+                    self._convert_date_to_epoch(end.isoformat()),
+                    int(date_handling["window_epochs"]),
+                )
+            ]
+        else:
+            windows = [
+                {"window_start": window_start.isoformat(), "window_end": window_end.isoformat()}
+                for window_start, window_end in date_windows(start, end, date_handling["window"])
+            ]
+        logger.info(f"Split stream '{self.name}' into {len(windows)} date windows")
+        return windows
+
+    def get_records(self, context: Optional[Mapping[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """Return processed records, as fetched by the tap's read-ahead if this stream was fetched ahead."""
+        read_ahead = self._tap.read_ahead
+        chunks = read_ahead.chunks(self) if read_ahead is not None else None
+        if chunks is None:
+            yield from self._fetch_records(context)
+            return
+
+        for chunk in chunks:
+            if not chunk:
+                break
+            yield from chunk
+        page_hashes = self._read_ahead_page_hashes.pop(json.dumps(context, sort_keys=True), None)
+        if page_hashes is not None:
+            with self._tap.state_lock:
+                self.get_context_state(context)[PAGE_HASHES_KEY] = page_hashes
+
+    def read_ahead_chunks(self) -> Iterator[List[dict]]:
+        """
+        Fetch the records of every context for the tap's read-ahead, in the order the SDK syncs them.
+
+        Each context's records come in chunks, followed by an empty chunk.
+        """
+        self._reading_ahead = True
+        partitions = self.partitions
+        contexts: List[Optional[Mapping[str, Any]]] = list(partitions) if partitions else [None]
+        for context in contexts:
+            # The SDK resolves a context's bookmark before reading its records
+            self._write_starting_replication_value(context)
+            yield from chunked(self._fetch_records(context), PARTITION_CHUNK_SIZE)
+            yield []
+
+    def _fetch_records(self, context: Optional[Mapping[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Return processed records, syncing upcoming partitions ahead of time if enabled."""
+        if context is None or self.partition_concurrency <= 1 or not self._partitions:
+            yield from super().get_records(context)
+            return
+
+        # Partition records are transformed where they are read, so only duplicates are dropped here
+        for record in self._request_partition_records(context):
+            if self._deduplicator is None or not self._deduplicator.is_duplicate(record):
+                yield record
+
+    def _request_partition_records(self, context: Mapping[str, Any]) -> Iterator[dict]:
+        """
+        Yield the transformed records of a partition while the next partitions download in the background.
+
+        Up to `partition_concurrency` partitions are in flight, each buffering a
+        bounded number of records. Partitions are still consumed in order, so the SDK
+        writes their records and per-partition bookmarks exactly as in a sequential sync.
+        With `engine: asyncio`, partitions are tasks on the tap's event loop instead of threads.
+
+        Records are transformed as they are read, on the worker thread for threaded
+        partitions, so `sort_order: desc` compares mapped replication keys on every path.
+        """
+        engine = self.async_engine
+        partitions = self._partitions or []
+        index = self._partition_index.get(json.dumps(context, sort_keys=True))
+        if index is None:
+            yield from self._transform_rows(self.request_records(context))
+            return
+
+        upcoming = partitions[index:index + self.partition_concurrency]
+        for position, partition in enumerate(upcoming, start=index):
+            key = json.dumps(partition, sort_keys=True)
+            if key not in self._partition_buffers:
+                # Resolve the partition's bookmark here, before a worker thread reads it
+                self._write_starting_replication_value(partition)
+                # Partitions are read ahead of the records being written, so they cannot checkpoint pages
+                if engine is not None:
+                    self._partition_buffers[key] = AsyncBufferedIterator(
+                        self._aiter_partition_pages(partition), engine.loop, maxsize=PARTITION_BUFFER_PAGES
+                    )
+                else:
+                    self._partition_buffers[key] = BufferedIterator(
+                        chunked(
+                            self._transform_rows(self._request_pages(partition, checkpoint=False)),
+                            PARTITION_CHUNK_SIZE,
+                        ),
+                        maxsize=PARTITION_BUFFER_CHUNKS,
+                        name=f"{self.name}-partition-{position}",
+                    )
+
+        buffer = self._partition_buffers.pop(json.dumps(context, sort_keys=True))
+        if isinstance(buffer, AsyncBufferedIterator):
+            yield from self._transform_rows(self._consume_pages(context, self._parse_pages(context, buffer)))
+            return
+        try:
+            for chunk in buffer:
+                yield from chunk
+        finally:
+            buffer.close()
+
+    async def _aiter_partition_pages(
+        self, context: Mapping[str, Any]
+    ) -> AsyncGenerator[Tuple[Any, Optional[int], requests.Response], None]:
+        """Yield the responses of every page of a partition, with its own paginator and request counter."""
+        if self._window_finished(context):
+            return
+        paginator = self.get_new_paginator()
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            pages = self._aiter_pages(context, paginator, request_counter)
+            try:
+                async for page in pages:
+                    yield page
+            finally:
+                await pages.aclose()
+
     def _convert_date_to_epoch(self, date_str: str) -> int:
         """Convert a date string to Solana epoch number."""
-        date = datetime.strptime(date_str, "%Y-%m-%d")
+        date = datetime.strptime(date_str[:10], "%Y-%m-%d")
         epoch_start = datetime(2020, 11, 7)
         days_since_start = (date - epoch_start).days
         epoch = int(days_since_start / 2.5)
         return epoch
 
+    def _request(self, prepared_request: requests.PreparedRequest, context: Optional[Mapping[str, Any]]) -> requests.Response:
+        """Send a request, leaving the body on the socket when it is parsed incrementally."""
+        fingerprint, cached = self._cached_response(prepared_request, context)
+        if cached is not None:
+            return self._spool(cached)
+        response = self._send(prepared_request)
+        return self._spool(self._finish_request(prepared_request, response, context, fingerprint))
+
+    def _spool(self, response: requests.Response) -> requests.Response:
+        """Read the body now if `spool` is configured, to a temporary file when it is over the threshold."""
+        if self._spool_threshold is None:
+            return response
+        if spool_response(response, self._spool_threshold, self._spool_directory):
+            logger.info(
+                f"Spooled {getattr(response, SPOOLED_BODY_ATTR) / 1024 / 1024:.1f} MiB response body "
+                f"of stream '{self.name}' to disk"
+            )
+        return response
+
+    async def _async_request(
+        self, prepared_request: requests.PreparedRequest, context: Optional[Mapping[str, Any]]
+    ) -> requests.Response:
+        """Send a request through the asyncio engine; the response body is read in full."""
+        fingerprint, cached = self._cached_response(prepared_request, context)
+        if cached is not None:
+            return cached
+        response = await self._async_send(prepared_request)
+        return self._finish_request(prepared_request, response, context, fingerprint)
+
+    def _cached_response(
+        self, prepared_request: requests.PreparedRequest, context: Optional[Mapping[str, Any]]
+    ) -> Tuple[Optional[str], Optional[requests.Response]]:
+        """Return the request's cache fingerprint, if it is cacheable, and its cached response, if any."""
+        cache = self._tap.response_cache
+        if cache is None or (cache.closed_windows_only and not self._is_closed_window(context)):
+            return None, None
+        fingerprint = request_fingerprint(
+            prepared_request.method, prepared_request.url, prepared_request.body, scope=self._fingerprint_scope
+        )
+        cached = cache.get(fingerprint, prepared_request, stream=self._stream_bodies)
+        if cached is not None:
+            logger.debug(f"Serving request for stream '{self.name}' from the response cache")
+        return fingerprint, cached
+
+    def _finish_request(
+        self,
+        prepared_request: requests.PreparedRequest,
+        response: requests.Response,
+        context: Optional[Mapping[str, Any]],
+        fingerprint: Optional[str],
+    ) -> requests.Response:
+        """Log, validate and cache a response just received."""
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url} if self._LOG_REQUEST_METRIC_URLS else None,
+        )
+        try:
+            self.validate_response(response)
+        except Exception:
+            response.close()
+            raise
+
+        if fingerprint is not None:
+            # Requests are only fingerprinted when the cache is enabled
+            cache = self._tap.response_cache
+            assert cache is not None
+            response = cache.put(fingerprint, response, stream=self._stream_bodies)
+        return response
+
+    def _send(self, prepared_request: requests.PreparedRequest) -> requests.Response:
+        """Send a request on the shared session, paced by the API's rate limiter if configured."""
+        limiter = self._rate_limiter
+        started = limiter.acquire() if limiter is not None else 0.0
+        sent = time.perf_counter()
+        try:
+            response = self.requests_session.send(
+                prepared_request,
+                timeout=self.timeout,
+                allow_redirects=self.allow_redirects,
+                stream=self._stream_bodies,
+            )
+        except BaseException:
+            if limiter is not None:
+                limiter.release(started, None)
+            raise
+        self._record_send(prepared_request, response, sent)
+        if limiter is not None:
+            limiter.release(started, response)
+        return response
+
+    async def _async_send(self, prepared_request: requests.PreparedRequest) -> requests.Response:
+        """Send a request through the asyncio engine, paced by the API's rate limiter if configured."""
+        engine = self.async_engine
+        assert engine is not None
+        limiter = self._rate_limiter
+        started = 0.0
+        if limiter is not None:
+            # The limiter blocks, so it waits on a worker thread instead of the loop
+            acquiring = asyncio.get_event_loop().run_in_executor(None, limiter.acquire)
+            try:
+                started = await asyncio.shield(acquiring)
+            except asyncio.CancelledError:
+
+                def release_acquired(done: "asyncio.Future[float]") -> None:
+                    if not done.cancelled() and done.exception() is None:
+                        limiter.release(done.result(), None)
+
+                acquiring.add_done_callback(release_acquired)
+                raise
+        sent = time.perf_counter()
+        try:
+            response = await engine.send(prepared_request, timeout=self.timeout)
+        except BaseException:
+            if limiter is not None:
+                limiter.release(started, None)
+            raise
+        self._record_send(prepared_request, response, sent)
+        if limiter is not None:
+            limiter.release(started, response)
+        return response
+
+    def _record_send(self, prepared_request: requests.PreparedRequest, response: requests.Response, sent: float) -> None:
+        """Record a request's timings and body sizes."""
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return
+        instrumentation.add("request", time.perf_counter() - sent)
+        if self._gzip_request_body and isinstance(prepared_request.body, (str, bytes)) and prepared_request.body:
+            sent_bytes = len(prepared_request.body)
+            instrumentation.add_request_body(getattr(prepared_request, UNCOMPRESSED_BODY_SIZE_ATTR, sent_bytes), sent_bytes)
+        instrumentation.add("ttfb", response.elapsed.total_seconds())
+
+    def backoff_wait_generator(self) -> Generator[float, Any, None]:
+        """Back off exponentially, unless the rate limiter is already pausing for the API."""
+        if self._rate_limiter is None:
+            return super().backoff_wait_generator()
+        return self._rate_limited_backoff()
+
+    def _rate_limited_backoff(self) -> Generator[float, Any, None]:
+        """
+        Wait generator for retries when a rate limiter is configured.
+
+        A throttled response carrying `Retry-After` or `X-RateLimit-*` headers pauses
+        the limiter, which holds back every stream on the API until the pause ends,
+        so the retry itself does not sleep on top of that.
+        """
+        limiter = self._rate_limiter
+        expo = backoff.expo(factor=2)
+        next(expo)
+        yield  # type: ignore[misc]
+        while True:
+            if limiter is not None and limiter.pause_remaining() > 0:
+                yield 0
+            else:
+                yield next(expo)
+
+    def _is_closed_window(self, context: Optional[Mapping[str, Any]]) -> bool:
+        """Return whether the request's date range ends before today, so its data can no longer change."""
+        date_handling = self.stream_config.get("date_handling") or {}
+        if not date_handling:
+            return False
+        start_date, end_date = self._get_date_range(context)
+        if date_handling.get("type") == "epoch":
+            _, end_epoch = self._get_epoch_range(context, start_date, end_date)
+            today_epoch = self._convert_date_to_epoch(date.today().isoformat())
+            return end_epoch is not None and end_epoch < today_epoch
+        if not end_date:
+            return False
+        return parse_date(end_date) < date.today()
+
     def parse_response(self, response) -> Iterable[dict]:
+        """Parse the response and yield each record, transforming them a batch at a time if configured."""
+        records = self._parse_records(response)
+        if self._batch_transforms is None:
+            yield from records
+            return
+        for batch in chunked(records, BATCH_TRANSFORM_SIZE):
+            started = time.perf_counter()
+            for transform in self._batch_transforms:
+                transform(batch)
+            if self.instrumentation is not None:
+                self.instrumentation.add("batch_transform", time.perf_counter() - started)
+            yield from batch
+
+    def _parse_records(self, response: requests.Response) -> Iterable[dict]:
         """Parse the response and yield each record."""
+        if self._stream_parsing or getattr(response, SPOOLED_BODY_ATTR, None) is not None:
+            yield from self._parse_response_incrementally(response)
+            return
+
         try:
+            started = time.perf_counter()
             json_response = response.json()
+            decoded = time.perf_counter()
             logger.debug(f"Response structure for stream '{self.name}': {list(json_response.keys())}")
             
             # Extract records using JSONPath
-            records = list(extract_jsonpath(self.stream_config["records_path"], input=json_response))
+            records = self._records_jsonpath.find(json_response)
+            if self.instrumentation is not None:
+                self.instrumentation.add("json_decode", decoded - started)
+                self.instrumentation.add("records_path", time.perf_counter() - decoded)
+                self.instrumentation.add_page(len(response.content), wire_bytes(response))
             logger.info(f"Extracted {len(records)} records from response for stream '{self.name}'")
             
             yield from records
@@ -204,66 +1354,183 @@ class DynamicStream(RESTStream):
             logger.debug(f"Response content: {response.text}")
             raise
 
-    def post_process(self, row: dict, context: Optional[dict] = None) -> Optional[dict]:
-        """Apply transformations after parsing the response."""
-        transformations = self.stream_config.get("transformations", {})
-        
-        # Apply field mappings
-        if "field_mappings" in transformations:
-            for old_field, new_field in transformations["field_mappings"].items():
-                if old_field in row:
-                    row[new_field] = row.pop(old_field)
-        
-        # Apply value transformations
-        if "value_transformations" in transformations:
-            for field, transform_config in transformations["value_transformations"].items():
-                if field in row and transform_config.get("type") == "divide":
+    def _parse_response_incrementally(self, response: requests.Response) -> Iterator[dict]:
+        """
+        Yield records while the response body is still being read from the socket, or from its spooled file.
+
+        Only one record is decoded at a time. The total page count, if the stream
+        paginates, is picked up on the way and left on the response for the paginator.
+        """
+        captures: Dict[str, Any] = {}
+        setattr(response, CAPTURED_VALUES_ATTR, captures)
+        pagination_config = self.stream_config.get("pagination") or {}
+        capture_paths = [pagination_config["total_pages_path"]] if pagination_config.get("total_pages_path") else []
+
+        count = 0
+        body_bytes = 0
+        elapsed = 0.0
+        instrumentation = self.instrumentation
+
+        def counted_chunks() -> Iterator[bytes]:
+            nonlocal body_bytes
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                body_bytes += len(chunk)
+                yield chunk
+
+        try:
+            chunks = iter_text_chunks(counted_chunks(), response.encoding)
+            records = iter_json_path(chunks, self.stream_config["records_path"], capture_paths, captures)
+            if instrumentation is None:
+                for record in records:
+                    count += 1
+                    yield record
+            else:
+                while True:
+                    started = time.perf_counter()
                     try:
-                        divisor = transform_config["divisor"]
-                        original_value = row[field]
-                        if isinstance(original_value, (int, float, str)):
-                            row[field] = float(original_value) / divisor
-                        else:
-                            logger.warning(f"Cannot divide non-numeric value in field '{field}': {original_value}")
-                            row[field] = None
-                    except (ValueError, TypeError, ZeroDivisionError) as e:
-                        logger.warning(f"Error transforming field '{field}': {e}")
-                        row[field] = None
-        
-        # Apply complex field extractions (for nested structures like Figment)
-        if "field_extractions" in transformations:
-            for new_field, extraction_config in transformations["field_extractions"].items():
-                source_field = extraction_config.get("source_field")
-                extraction_type = extraction_config.get("type")
-                
-                if source_field in row and extraction_type == "nested_array":
-                    # Extract from nested array structure
-                    array_data = row.get(source_field, [])
-                    if isinstance(array_data, list):
-                        for item in array_data:
-                            if isinstance(item, dict):
-                                item_type = item.get("type", "")
-                                if item_type == extraction_config.get("filter_type", ""):
-                                    # Extract the numeric value
-                                    if "numeric" in item and "exp" in item:
-                                        value = item["numeric"] / (10 ** item["exp"])
-                                        row[new_field] = value
-                                    elif "text" in item:
-                                        row[new_field] = float(item["text"])
-                                    break
-                elif source_field in row and extraction_type == "first_array_item":
-                    # Extract from first item in array
-                    array_data = row.get(source_field, [])
-                    if isinstance(array_data, list) and len(array_data) > 0:
-                        item = array_data[0]
-                        if isinstance(item, dict):
-                            if "numeric" in item and "exp" in item:
-                                value = item["numeric"] / (10 ** item["exp"])
-                                row[new_field] = value
-                            elif "text" in item:
-                                row[new_field] = float(item["text"])
-
-        return row
+                        record = next(records)
+                    except StopIteration:
+                        break
+                    finally:
+                        elapsed += time.perf_counter() - started
+                    count += 1
+                    yield record
+        except Exception as e:
+            logger.error(f"Error parsing streamed response for stream '{self.name}': {e}")
+            raise
+        finally:
+            on_wire = wire_bytes(response)
+            response.close()
+            if instrumentation is not None:
+                instrumentation.add("stream_parse", elapsed)
+                instrumentation.add_page(body_bytes, on_wire)
+        logger.info(f"Extracted {count} records from streamed response for stream '{self.name}'")
+
+    def post_process(self, row: dict, context: Optional[Mapping[str, Any]] = None) -> Optional[dict]:
+        """
+        Apply the stream's compiled transformations, unless `parse_response` already did for the batch.
+
+        With `dedupe` configured, records whose primary key was already emitted are dropped.
+        """
+        instrumentation = self.instrumentation
+        started = time.perf_counter() if instrumentation is not None else 0.0
+        for transform in self._row_transforms:
+            transform(row)
+        duplicate = self._deduplicator is not None and self._deduplicator.is_duplicate(row)
+        if instrumentation is not None:
+            instrumentation.add("post_process", time.perf_counter() - started)
+        return None if duplicate else row
+
+    def _transform_rows(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Apply the stream's compiled transformations to each record as it is read, like `post_process`."""
+        instrumentation = self.instrumentation
+        for record in records:
+            started = time.perf_counter() if instrumentation is not None else 0.0
+            for transform in self._row_transforms:
+                transform(record)
+            if instrumentation is not None:
+                instrumentation.add("post_process", time.perf_counter() - started)
+            yield record
+
+    def _write_record_message(self, record: Dict[str, Any]) -> None:
+        """Write a RECORD message, timing it if instrumentation is configured."""
+        if self.instrumentation is None:
+            super()._write_record_message(record)
+            return
+        started = time.perf_counter()
+        super()._write_record_message(record)
+        self.instrumentation.add("emit", time.perf_counter() - started)
+
+    def get_batch_config(self, config: Mapping[str, Any]) -> Optional[BatchConfig]:
+        """Return the batch config for this stream, or None to write RECORD messages."""
+        return self._batch_config
+
+    def get_batches(
+        self, batch_config: BatchConfig, context: Optional[Mapping[str, Any]] = None
+    ) -> Iterator[Tuple[BaseBatchFileEncoding, List[str]]]:
+        """
+        Write the records to batch files, yielding the encoding and manifest of each.
+
+        Files hold the records as RECORD messages would, conformed to the schema and stream maps.
+        """
+        serializer = self._tap.record_serializer
+        batcher = batcher_for(
+            self.tap_name,
+            self.name,
+            batch_config,
+            encode=serializer.encode_record if serializer is not None else None,
+        )
+        records = self._batch_stats.count(self._batch_records(self._sync_records(context, write_messages=False)))
+        for manifest in batcher.get_batches(records):
+            self._batch_stats.add_batch()
+            yield batch_config.encoding, manifest
+        self._batch_stats.log_stats()
+
+    def _batch_records(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Conform records to the schema and stream maps, as they would be in RECORD messages."""
+        for record in records:
+            for message in self._generate_record_messages(record):
+                if message.stream == self.name:
+                    yield message.record
+
+    def _sync_records(
+        self, context: Optional[Mapping[str, Any]] = None, *, write_messages: bool = True
+    ) -> Generator[dict, Any, Any]:
+        """Sync the records, then log the stream's final metrics and write its instrumentation summary."""
+        self._tap.stream_started(self)
+        if self.instrumentation is not None:
+            self.instrumentation.start()
+        failed = True
+        try:
+            yield from super()._sync_records(context, write_messages=write_messages)
+            failed = False
+        finally:
+            if self.instrumentation is not None:
+                self.instrumentation.finish()
+            if self._deduplicator is not None:
+                self._deduplicator.log_stats()
+            if self._page_changes is not None:
+                self._page_changes.log_stats()
+            self._tap.stream_synced(self, failed)
+
+    def finalize_state_progress_markers(self, state: Optional[dict] = None) -> None:
+        """Finalize the stream's state, then let the tap finish the sync after its last stream."""
+        super().finalize_state_progress_markers(state)
+        self._tap.stream_finalized(self)
+
+    # Streams may be fetched on separate threads (see `ReadAhead`), and the SDK
+    # serializes the whole tap state when writing STATE, so every state update goes
+    # through the tap's state lock.
+
+    def get_context_state(self, context: Optional[Mapping[str, Any]]) -> dict:
+        """Return the writable state dict for a context."""
+        with self._tap.state_lock:
+            return super().get_context_state(context)
+
+    def _increment_stream_state(self, latest_record: Dict[str, Any], *, context: Optional[Mapping[str, Any]] = None) -> None:
+        """Advance the bookmark for a record."""
+        with self._tap.state_lock:
+            super()._increment_stream_state(latest_record, context=context)
+
+    def _write_starting_replication_value(self, context: Optional[Mapping[str, Any]]) -> None:
+        """Write the starting replication value for a context."""
+        with self._tap.state_lock:
+            super()._write_starting_replication_value(context)
+
+    def _write_replication_key_signpost(self, context: Optional[Mapping[str, Any]], value: Any) -> None:
+        """Write the replication signpost for a context."""
+        with self._tap.state_lock:
+            super()._write_replication_key_signpost(context, value)
+
+    def _finalize_state(self, state: Optional[dict] = None) -> None:
+        """Promote progress markers in a state dict."""
+        with self._tap.state_lock:
+            super()._finalize_state(state)
+
+    def _write_state_message(self) -> None:
+        """Write a STATE message."""
+        with self._tap.state_lock:
+            super()._write_state_message()
 
     @property
     def schema(self) -> dict:
@@ -1,12 +1,45 @@
 # tap_rest_api_post/tap.py
 """TapRestApiPost tap class."""
 
-from typing import List
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, cast
 
 from singer_sdk import Tap
 from singer_sdk import typing as th
+from singer_sdk._singerlib import Message, RecordMessage
 
-from tap_rest_api_post.streams import DynamicStream
+from tap_rest_api_post.writer import SingerLineWriter
+
+# The stream machinery and the optional features are imported when first used, so
+# `--about` and `--help` do not pay for them
+if TYPE_CHECKING:
+    from tap_rest_api_post.async_engine import AsyncEngine
+    from tap_rest_api_post.cache import ResponseCache
+    from tap_rest_api_post.connections import ConnectionManager
+    from tap_rest_api_post.instrumentation import SamplingProfiler
+    from tap_rest_api_post.pagehashes import PageHashFile
+    from tap_rest_api_post.ratelimit import RateLimiters
+    from tap_rest_api_post.readahead import ReadAhead
+    from tap_rest_api_post.serialization import RecordSerializer
+    from tap_rest_api_post.streams import DynamicStream
+
+
+class _CachedClassProperty:
+    """A class-level attribute computed by `build` on first access, then reused."""
+
+    def __init__(self, build: Callable[[Any], Any]):
+        """Initialize the descriptor."""
+        self.build = build
+        self.__doc__ = build.__doc__
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    self._value = self.build(owner)
+        return self._value
 
 
 class TapRestApiPost(Tap):
@@ -14,94 +47,670 @@ class TapRestApiPost(Tap):
 
     name = "tap-rest-api-post"
 
-    config_jsonschema = th.PropertiesList(
-        th.Property(
-            "start_date",
-            th.DateTimeType,
-            description="Global start date to be injected into stream request bodies.",
-        ),
-        th.Property(
-            "current_date",
-            th.DateTimeType,
-            description="Global end date to be injected into stream request bodies.",
-        ),
-        th.Property(
-            "streams",
-            th.ArrayType(
-                th.ObjectType(
-                    th.Property("name", th.StringType, required=True),
-                    th.Property("api_url", th.StringType, required=True),
-                    th.Property("path", th.StringType, required=True),
-                    th.Property("api_key", th.StringType, required=True, secret=True),
-                    th.Property("api_key_header", th.StringType, default="x-api-key"),
-                    th.Property("body", th.ObjectType(), default={}),
-                    th.Property("records_path", th.StringType, required=True),
-                    th.Property("primary_keys", th.ArrayType(th.StringType), default=[]),
-                    th.Property("replication_key", th.StringType),
-                    th.Property(
-                        "date_handling",
-                        th.ObjectType(
-                            th.Property("type", th.StringType, allowed_values=["epoch", "date_string"]),
-                            th.Property("start_field", th.StringType),
-                            th.Property("end_field", th.StringType),
-                        ),
-                        description="Configuration for how dates are handled in the request body"
-                    ),
-                    th.Property(
-                        "transformations",
-                        th.ObjectType(
-                            th.Property("field_mappings", th.ObjectType(additional_properties=th.StringType)),
-                            th.Property(
-                                "value_transformations", 
-                                th.ObjectType(
-                                    additional_properties=th.ObjectType(
-                                        th.Property("type", th.StringType),
-                                        th.Property("divisor", th.NumberType),
-                                    )
-                                )
+    @_CachedClassProperty
+    def plugin_version(cls) -> str:
+        """Return the tap's version, read from the package metadata once instead of per stream."""
+        return cls.get_plugin_version()
+
+    @_CachedClassProperty
+    def config_jsonschema(cls) -> dict:
+        """Return the config JSON schema, built the first time the SDK asks for it."""
+        return th.PropertiesList(
+            th.Property(
+                "start_date",
+                th.DateTimeType,
+                description="Global start date to be injected into stream request bodies.",
+            ),
+            th.Property(
+                "current_date",
+                th.DateTimeType,
+                description="Global end date to be injected into stream request bodies.",
+            ),
+            th.Property(
+                "streams",
+                th.ArrayType(
+                    th.ObjectType(
+                        th.Property("name", th.StringType, required=True),
+                        th.Property("api_url", th.StringType, required=True),
+                        th.Property("path", th.StringType, required=True),
+                        th.Property("api_key", th.StringType, required=True, secret=True),
+                        th.Property("api_key_header", th.StringType, default="x-api-key"),
+                        th.Property("body", th.ObjectType(), default={}),
+                        th.Property("records_path", th.StringType, required=True),
+                        th.Property(
+                            "stream_parsing",
+                            th.BooleanType,
+                            default=False,
+                            description="Parse response bodies incrementally as they arrive, one record at a time (simple records_path only)",
+                        ),
+                        th.Property(
+                            "spool",
+                            th.ObjectType(
+                                th.Property(
+                                    "threshold_mb",
+                                    th.NumberType,
+                                    default=64,
+                                    description="Response bodies larger than this are written to a temporary file",
+                                ),
+                                th.Property(
+                                    "directory",
+                                    th.StringType,
+                                    description="Directory for spooled bodies (defaults to the system temp directory)",
+                                ),
+                            ),
+                            description=(
+                                "Read response bodies up front, spooling oversized ones to disk and parsing them "
+                                "from the memory-mapped file one record at a time (simple records_path only)"
+                            ),
+                        ),
+                        th.Property(
+                            "engine",
+                            th.StringType,
+                            default="requests",
+                            allowed_values=["requests", "asyncio"],
+                            description=(
+                                "asyncio sends this stream's requests from one event loop shared by the tap "
+                                "(requires aiohttp), so concurrent pages and partitions do not each need a thread"
+                            ),
+                        ),
+                        th.Property(
+                            "batch_transformations",
+                            th.BooleanType,
+                            default=False,
+                            description="Apply transformations to whole pages column by column, with NumPy if installed",
+                        ),
+                        th.Property(
+                            "compression",
+                            th.ObjectType(
+                                th.Property(
+                                    "response_encodings",
+                                    th.ArrayType(th.StringType),
+                                    description=(
+                                        "Content encodings to accept, in order of preference: gzip, deflate, "
+                                        "br (requires brotli) or zstd (requires urllib3 2.x and zstandard)"
+                                    ),
+                                ),
+                                th.Property(
+                                    "request_body_gzip",
+                                    th.BooleanType,
+                                    default=False,
+                                    description="Send request bodies gzip-encoded (the API must accept Content-Encoding: gzip)",
+                                ),
+                                th.Property(
+                                    "request_body_min_bytes",
+                                    th.IntegerType,
+                                    default=1024,
+                                    description="Only gzip request bodies at least this large",
+                                ),
+                            ),
+                            description="Compressed transport for responses and request bodies",
+                        ),
+                        th.Property("primary_keys", th.ArrayType(th.StringType), default=[]),
+                        th.Property(
+                            "dedupe",
+                            th.ObjectType(
+                                th.Property(
+                                    "strategy",
+                                    th.StringType,
+                                    allowed_values=["lru", "bloom"],
+                                    description=(
+                                        "lru: exact, remembers the max_keys most recent primary keys; "
+                                        "bloom: fixed-size Bloom filter for huge streams, which drops about "
+                                        "false_positive_rate of unique records"
+                                    ),
+                                ),
+                                th.Property(
+                                    "max_keys",
+                                    th.IntegerType,
+                                    default=1000000,
+                                    description="Primary keys remembered by the lru strategy",
+                                ),
+                                th.Property(
+                                    "expected_keys",
+                                    th.IntegerType,
+                                    default=10000000,
+                                    description="Unique primary keys the bloom strategy is sized for",
+                                ),
+                                th.Property(
+                                    "false_positive_rate",
+                                    th.NumberType,
+                                    default=0.001,
+                                    description="Share of unique records the bloom strategy may drop as duplicates",
+                                ),
+                            ),
+                            description="Drop records whose primary_keys were already emitted, in fixed memory",
+                        ),
+                        th.Property(
+                            "skip_unchanged_pages",
+                            th.BooleanType,
+                            default=False,
+                            description=(
+                                "Do not emit the records of pages whose response body is byte-identical to the "
+                                "last sync's for the same request; hashes are kept in state unless page_hashes is set"
+                            ),
+                        ),
+                        th.Property(
+                            "batch_messages",
+                            th.BooleanType,
+                            default=True,
+                            description=(
+                                "Write this stream as BATCH messages pointing at local files when batch_config is "
+                                "set; false keeps RECORD messages"
+                            ),
+                        ),
+                        th.Property("replication_key", th.StringType),
+                        th.Property(
+                            "date_handling",
+                            th.ObjectType(
+                                th.Property("type", th.StringType, allowed_values=["epoch", "date_string"]),
+                                th.Property("start_field", th.StringType),
+                                th.Property("end_field", th.StringType),
+                                th.Property(
+                                    "window",
+                                    th.StringType,
+                                    allowed_values=["day", "week", "month"],
+                                    description="Split the date range into calendar windows, synced as separate partitions",
+                                ),
+                                th.Property(
+                                    "window_epochs",
+                                    th.IntegerType,
+                                    description="Split the range into windows of this many epochs (epoch type only)",
+                                ),
+                                th.Property(
+                                    "window_concurrency",
+                                    th.IntegerType,
+                                    default=1,
+                                    description="Number of date windows synced at the same time",
+                                ),
+                            ),
+                            description="Configuration for how dates are handled in the request body"
+                        ),
+                        th.Property(
+                            "fan_out",
+                            th.ObjectType(
+                                th.Property(
+                                    "field",
+                                    th.StringType,
+                                    required=True,
+                                    description="Request body field that receives each value",
+                                ),
+                                th.Property("values", th.ArrayType(th.AnyType), description="Values to sync"),
+                                th.Property(
+                                    "values_file",
+                                    th.StringType,
+                                    description=(
+                                        "File of more values: a JSON array if it ends in .json, "
+                                        "else one value per line"
+                                    ),
+                                ),
+                                th.Property(
+                                    "values_per_partition",
+                                    th.IntegerType,
+                                    default=1,
+                                    description="Values sent together, as a list, in one partition's requests",
+                                ),
+                                th.Property(
+                                    "concurrency",
+                                    th.IntegerType,
+                                    default=1,
+                                    description="Number of partitions synced at the same time",
+                                ),
                             ),
-                            th.Property(
-                                "field_extractions",
-                                th.ObjectType(
-                                    additional_properties=th.ObjectType(
-                                        th.Property("source_field", th.StringType, required=True),
-                                        th.Property("type", th.StringType, required=True),
-                                        th.Property("filter_type", th.StringType),
+                            description=(
+                                "Sync the stream once per value of a body field, as partitions with their own "
+                                "bookmarks; with date windows, every value is synced over every window"
+                            ),
+                        ),
+                        th.Property(
+                            "transformations",
+                            th.ObjectType(
+                                th.Property("field_mappings", th.ObjectType(additional_properties=th.StringType)),
+                                th.Property(
+                                    "value_transformations", 
+                                    th.ObjectType(
+                                        additional_properties=th.ObjectType(
+                                            th.Property("type", th.StringType),
+                                            th.Property("divisor", th.NumberType),
+                                        )
                                     )
                                 ),
-                                description="Extract values from nested structures"
+                                th.Property(
+                                    "field_extractions",
+                                    th.ObjectType(
+                                        additional_properties=th.ObjectType(
+                                            th.Property("source_field", th.StringType, required=True),
+                                            th.Property("type", th.StringType, required=True),
+                                            th.Property("filter_type", th.StringType),
+                                        )
+                                    ),
+                                    description="Extract values from nested structures"
+                                ),
                             ),
+                            description="Field mappings, value transformations, and field extractions"
                         ),
-                        description="Field mappings, value transformations, and field extractions"
+                        th.Property(
+                            "pagination",
+                            th.ObjectType(
+                                th.Property("strategy", th.StringType, required=True),
+                                th.Property("page_param", th.StringType),
+                                th.Property("page_size_param", th.StringType),
+                                th.Property("page_size", th.IntegerType),
+                                th.Property("total_pages_path", th.StringType),
+                                th.Property(
+                                    "sort_order",
+                                    th.StringType,
+                                    default="asc",
+                                    allowed_values=["asc", "desc"],
+                                    description=(
+                                        "desc if the API returns records newest-first: pagination then stops "
+                                        "after the first page with records older than the replication bookmark"
+                                    ),
+                                ),
+                                th.Property(
+                                    "concurrency",
+                                    th.IntegerType,
+                                    default=1,
+                                    description="Number of pages fetched at the same time once the total page count is known",
+                                ),
+                                th.Property(
+                                    "prefetch",
+                                    th.IntegerType,
+                                    default=0,
+                                    description=(
+                                        "Number of pages requested ahead, one at a time, while the current page "
+                                        "is processed (used when concurrency is 1)"
+                                    ),
+                                ),
+                                th.Property(
+                                    "checkpoint",
+                                    th.BooleanType,
+                                    default=False,
+                                    description=(
+                                        "Save the last completed page in STATE, so an interrupted sync resumes "
+                                        "after it when the request body and date range are unchanged"
+                                    ),
+                                ),
+                                th.Property(
+                                    "auto_page_size",
+                                    th.ObjectType(
+                                        th.Property("enabled", th.BooleanType, default=False),
+                                        th.Property("min_page_size", th.IntegerType, default=10),
+                                        th.Property("max_page_size", th.IntegerType, default=10000),
+                                        th.Property(
+                                            "max_page_bytes",
+                                            th.IntegerType,
+                                            description="Do not grow pages whose responses would exceed this many bytes",
+                                        ),
+                                    ),
+                                    description=(
+                                        "Tune page_size while syncing, starting from page_size, to fetch the most "
+                                        "records per second, and halve it after timeouts or 5xx responses. Needs the "
+                                        "total_pages strategy and a page_size_param; pages are fetched one at a time"
+                                    ),
+                                ),
+                            ),
+                        ),
+                        th.Property(
+                            "schema",
+                            th.ObjectType(additional_properties=True),
+                            required=True,
+                        ),
+                    )
+                ),
+                required=True,
+            ),
+            th.Property(
+                "connection_pool",
+                th.ObjectType(
+                    th.Property(
+                        "pool_maxsize",
+                        th.IntegerType,
+                        default=10,
+                        description="Maximum connections kept open per API host",
+                    ),
+                    th.Property(
+                        "keep_alive",
+                        th.BooleanType,
+                        default=True,
+                        description="Reuse connections between requests",
                     ),
                     th.Property(
-                        "pagination",
-                        th.ObjectType(
-                            th.Property("strategy", th.StringType, required=True),
-                            th.Property("page_param", th.StringType),
-                            th.Property("page_size_param", th.StringType),
-                            th.Property("page_size", th.IntegerType),
-                            th.Property("total_pages_path", th.StringType),
+                        "http2",
+                        th.BooleanType,
+                        default=False,
+                        description="Use HTTP/2 (requires the httpx[http2] package)",
+                    ),
+                ),
+                description="HTTP connection pools, shared by all streams against the same host",
+            ),
+            th.Property(
+                "rate_limit",
+                th.ObjectType(
+                    th.Property(
+                        "requests_per_second",
+                        th.NumberType,
+                        description="Maximum sustained request rate per api_url",
+                    ),
+                    th.Property(
+                        "burst",
+                        th.IntegerType,
+                        description="Requests that may be sent back to back before the rate applies",
+                    ),
+                    th.Property(
+                        "max_concurrency",
+                        th.IntegerType,
+                        default=10,
+                        description="Upper bound for the adaptive number of in-flight requests per api_url",
+                    ),
+                    th.Property(
+                        "min_concurrency",
+                        th.IntegerType,
+                        default=1,
+                        description="Lower bound (and starting point) for the adaptive number of in-flight requests",
+                    ),
+                ),
+                description=(
+                    "Client-side rate limiting shared by all streams against the same api_url. "
+                    "Honors Retry-After and X-RateLimit-* headers and adapts concurrency to throttling."
+                ),
+            ),
+            th.Property(
+                "response_cache",
+                th.ObjectType(
+                    th.Property("directory", th.StringType, required=True, description="Directory for cached responses"),
+                    th.Property("ttl_seconds", th.IntegerType, description="Ignore cached responses older than this"),
+                    th.Property(
+                        "max_size_mb",
+                        th.NumberType,
+                        description="Evict least recently used responses beyond this size",
+                    ),
+                    th.Property(
+                        "closed_windows_only",
+                        th.BooleanType,
+                        default=True,
+                        description=(
+                            "Only cache requests whose date range ends before today. Without it, "
+                            "set ttl_seconds so that cached responses are fetched again"
                         ),
                     ),
+                ),
+                description=(
+                    "Compressed on-disk cache of responses, keyed by stream, credentials, URL, query parameters "
+                    "and JSON body"
+                ),
+            ),
+            th.Property(
+                "page_hashes",
+                th.ObjectType(
+                    th.Property("path", th.StringType, required=True, description="JSON file for the page hashes"),
+                ),
+                description=(
+                    "Keep the page hashes of streams with skip_unchanged_pages in a local file instead of state. "
+                    "The file is written after a successful sync, whether or not the target has loaded the records."
+                ),
+            ),
+            th.Property(
+                "instrumentation",
+                th.ObjectType(
+                    th.Property(
+                        "metric_interval_seconds",
+                        th.NumberType,
+                        default=60,
+                        description="How often per-stage timings are logged as METRIC messages (0 to only log at the end)",
+                    ),
+                    th.Property(
+                        "summary_dir",
+                        th.StringType,
+                        description="Directory for a per-stream JSON summary of stage timings, written when each stream finishes",
+                    ),
+                    th.Property(
+                        "profile_path",
+                        th.StringType,
+                        description="Run a sampling profiler during the sync and write collapsed stacks to this file",
+                    ),
                     th.Property(
-                        "schema",
-                        th.ObjectType(additional_properties=True),
-                        required=True,
+                        "profile_interval_ms",
+                        th.NumberType,
+                        default=10,
+                        description="Sampling interval of the profiler",
                     ),
-                )
+                ),
+                description=(
+                    "Hot-path timers, METRIC output and profiling. Streams are only timed when "
+                    "metric_interval_seconds or summary_dir is set"
+                ),
             ),
-            required=True,
-        ),
-    ).to_dict()
+            th.Property(
+                "output",
+                th.ObjectType(
+                    th.Property(
+                        "fast_serializer",
+                        th.BooleanType,
+                        default=False,
+                        description="Serialize RECORD messages with prebuilt envelopes and orjson, if installed, "
+                        "instead of the SDK's encoder. The output is byte-for-byte the same",
+                    ),
+                    th.Property(
+                        "buffer_size",
+                        th.IntegerType,
+                        default=1048576,
+                        description="Bytes of RECORD output buffered before writing to stdout, with fast_serializer "
+                        "(0 writes every record right away)",
+                    ),
+                ),
+                description="How Singer messages are written to stdout",
+            ),
+            th.Property(
+                "concurrent_sync",
+                th.ObjectType(
+                    th.Property(
+                        "max_workers",
+                        th.IntegerType,
+                        default=1,
+                        description=(
+                            "Number of streams fetched at the same time, including the one being written. "
+                            "Messages are still written one stream after another"
+                        ),
+                    ),
+                    th.Property(
+                        "max_workers_per_api_url",
+                        th.IntegerType,
+                        description="Number of streams fetched at the same time against the same api_url",
+                    ),
+                    th.Property(
+                        "buffer_mb",
+                        th.NumberType,
+                        default=64,
+                        description=(
+                            "Memory for the records of each stream fetched ahead of the one being written, "
+                            "beyond which they are kept in a temporary file"
+                        ),
+                    ),
+                ),
+                description="Opt-in concurrent fetching of independent streams",
+            ),
+        ).to_dict()
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the tap."""
+        # Guards the shared tap state, which streams synced on separate threads update
+        self.state_lock = threading.RLock()
+        self._line_writer = SingerLineWriter()
+        self._connections: Optional["ConnectionManager"] = None
+        self._response_cache: Optional["ResponseCache"] = None
+        self._response_cache_loaded = False
+        self._rate_limiters: Optional["RateLimiters"] = None
+        self._rate_limiters_loaded = False
+        self._record_serializer: Optional["RecordSerializer"] = None
+        self._record_serializer_loaded = False
+        self._async_engine: Optional["AsyncEngine"] = None
+        self._async_engine_loaded = False
+        self._page_hash_file: Optional["PageHashFile"] = None
+        self._page_hash_file_loaded = False
+        self._setup_lock = threading.Lock()
+        # Set from the first stream the SDK syncs until the sync is finished
+        self._synced_streams: Optional[List["DynamicStream"]] = None
+        self._read_ahead: Optional["ReadAhead"] = None
+        self._profiler: Optional["SamplingProfiler"] = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def connections(self) -> "ConnectionManager":
+        """Return the connection pools shared by this tap's streams."""
+        with self._setup_lock:
+            if self._connections is None:
+                from tap_rest_api_post.connections import ConnectionManager
+
+                self._connections = ConnectionManager(self.config.get("connection_pool"))
+        return self._connections
+
+    @property
+    def response_cache(self) -> Optional["ResponseCache"]:
+        """Return the response cache, if one is configured."""
+        if not self._response_cache_loaded:
+            with self._setup_lock:
+                if not self._response_cache_loaded:
+                    from tap_rest_api_post.cache import ResponseCache
+
+                    self._response_cache = ResponseCache.from_config(self.config.get("response_cache"))
+                    self._response_cache_loaded = True
+        return self._response_cache
+
+    @property
+    def page_hash_file(self) -> Optional["PageHashFile"]:
+        """Return the page hash file of streams with `skip_unchanged_pages`, if `page_hashes.path` is configured."""
+        if not self._page_hash_file_loaded:
+            with self._setup_lock:
+                if not self._page_hash_file_loaded:
+                    from tap_rest_api_post.pagehashes import PageHashFile
+
+                    self._page_hash_file = PageHashFile.from_config(self.config.get("page_hashes"))
+                    self._page_hash_file_loaded = True
+        return self._page_hash_file
 
-    def discover_streams(self) -> List[DynamicStream]:
+    @property
+    def rate_limiters(self) -> Optional["RateLimiters"]:
+        """Return the per-API rate limiters, if rate limiting is configured."""
+        if not self._rate_limiters_loaded:
+            with self._setup_lock:
+                if not self._rate_limiters_loaded:
+                    from tap_rest_api_post.ratelimit import RateLimiters
+
+                    self._rate_limiters = RateLimiters.from_config(self.config.get("rate_limit"))
+                    self._rate_limiters_loaded = True
+        return self._rate_limiters
+
+    @property
+    def async_engine(self) -> Optional["AsyncEngine"]:
+        """Return the asyncio request engine shared by streams with `engine: asyncio`, starting it on first use."""
+        if not self._async_engine_loaded:
+            with self._setup_lock:
+                if not self._async_engine_loaded:
+                    from tap_rest_api_post.async_engine import AsyncEngine
+
+                    self._async_engine = AsyncEngine.from_config(self.config.get("connection_pool"))
+                    self._async_engine_loaded = True
+        return self._async_engine
+
+    @property
+    def record_serializer(self) -> Optional["RecordSerializer"]:
+        """Return the fast RECORD serializer, if `output.fast_serializer` is enabled."""
+        if not self._record_serializer_loaded:
+            with self._setup_lock:
+                if not self._record_serializer_loaded:
+                    settings = self.config.get("output") or {}
+                    if settings.get("fast_serializer"):
+                        from tap_rest_api_post.serialization import RecordSerializer
+
+                        self._record_serializer = RecordSerializer(self.format_message)
+                        self._line_writer.buffer_size = int(settings.get("buffer_size", 1048576) or 0)
+                    self._record_serializer_loaded = True
+        return self._record_serializer
+
+    def discover_streams(self) -> List["DynamicStream"]:
         """Return a list of discovered streams."""
+        from tap_rest_api_post.streams import DynamicStream
+
         return [
             DynamicStream(tap=self, config=stream_config)
             for stream_config in self.config["streams"]
         ]
 
+    def write_message(self, message: Message) -> None:
+        """Write a Singer message to stdout as a single atomic line."""
+        if isinstance(message, RecordMessage):
+            serializer = self.record_serializer
+            if serializer is not None:
+                self._line_writer.write_record(serializer.serialize(message))
+                return
+        self._line_writer.write_line(self.format_message(message) + "\n")
+
+    # `Tap.sync_all` is final and syncs one stream after another, so the tap sets up
+    # and finishes its sync around the streams, which report to it as the SDK syncs them.
+
+    @property
+    def read_ahead(self) -> Optional["ReadAhead"]:
+        """Return the read-ahead of upcoming streams, if `concurrent_sync.max_workers` is above 1 and a sync is running."""
+        return self._read_ahead
+
+    def stream_started(self, stream: "DynamicStream") -> None:
+        """Start the sync when the SDK starts its first stream, and fetch the next streams ahead if configured."""
+        if self._synced_streams is None:
+            from tap_rest_api_post.instrumentation import SamplingProfiler
+            from tap_rest_api_post.readahead import ReadAhead
+
+            # The streams the SDK's sync_all syncs, in its order
+            self._synced_streams = [
+                cast("DynamicStream", other)
+                for other in self.streams.values()
+                if (other.selected or other.has_selected_descendents) and not other.parent_stream_type
+            ]
+            self._profiler = SamplingProfiler.from_config(self.config.get("instrumentation"))
+            if self._profiler is not None:
+                self._profiler.start()
+            self._read_ahead = ReadAhead.from_config(self.config.get("concurrent_sync"), self._synced_streams)
+        if self._read_ahead is not None:
+            self._read_ahead.start(stream)
+
+    def stream_synced(self, stream: "DynamicStream", failed: bool) -> None:
+        """Start fetching the next streams once the SDK has synced a stream's records, or end a failed sync."""
+        if self._read_ahead is not None:
+            self._read_ahead.finish(stream)
+        if failed:
+            self._finish_sync(succeeded=False)
+
+    def stream_finalized(self, stream: "DynamicStream") -> None:
+        """Finish the sync once the SDK has finalized the state of its last stream."""
+        if self._synced_streams and stream is self._synced_streams[-1]:
+            self._finish_sync(succeeded=True)
+
+    def _finish_sync(self, succeeded: bool) -> None:
+        """Save the page hashes of a successful sync, write out buffered records and log the tap's stats."""
+        if self._synced_streams is None:
+            return
+        self._synced_streams = None
+        try:
+            if self._read_ahead is not None:
+                self._read_ahead.close()
+                self._read_ahead = None
+            if succeeded and self._page_hash_file is not None:
+                self._page_hash_file.save()
+        finally:
+            self._line_writer.flush()
+            if self._profiler is not None:
+                self._profiler.stop()
+                self._profiler = None
+            if self.record_serializer is not None:
+                self.record_serializer.log_stats()
+            self.connections.log_stats()
+            if self._async_engine is not None:
+                self._async_engine.log_stats()
+                self._async_engine.close()
+            if self.rate_limiters is not None:
+                self.rate_limiters.log_stats()
+            if self.response_cache is not None:
+                self.response_cache.log_stats()
+
 
 # CLI Execution
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+# tap_rest_api_post/transformations.py
+"""Record transformation pipeline for tap-rest-api-post."""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A compiled transformation step. Steps update the row in place.
+RowTransform = Callable[[Dict[str, Any]], None]
+
+# A compiled batch step. Steps update every row of the batch in place.
+BatchTransform = Callable[[List[Dict[str, Any]]], None]
+
+# Below this many values, building a NumPy array costs more than it saves
+NUMPY_MIN_VALUES = 64
+
+# Value types `divide` converts with float(); anything else becomes null
+_DIVISIBLE_TYPES = frozenset((int, float, str))
+
+
+def compile_transformations(transformations: Optional[Dict[str, Any]]) -> List[RowTransform]:
+    """
+    Compile a stream's `transformations` config into a flat list of row steps.
+
+    Steps run in the same order as the config sections: field mappings, value
+    transformations, then field extractions. `nested_array` extractions that read
+    the same source field are fused into one pass over that array.
+    """
+    transformations = transformations or {}
+    steps: List[RowTransform] = []
+
+    field_mappings = transformations.get("field_mappings")
+    if field_mappings:
+        steps.append(_compile_field_mappings(field_mappings))
+
+    divisions = _divisions(transformations)
+    if divisions:
+        steps.append(_compile_divisions(divisions))
+
+    steps.extend(_compile_field_extractions(transformations.get("field_extractions") or {}))
+    return steps
+
+
+def compile_batch_transformations(
+    transformations: Optional[Dict[str, Any]], use_numpy: bool = True
+) -> List[BatchTransform]:
+    """
+    Compile a stream's `transformations` config into steps that each process a batch of rows.
+
+    The result is the same as running `compile_transformations` on every row.
+    Field mappings and field extractions still run row by row. Value
+    transformations run column by column: each field's values are converted and
+    divided in one vectorized pass, with NumPy when `use_numpy` is set and it is
+    installed. A column holding a value that cannot be divided is redone value by
+    value, so only the rows with bad values become null.
+    """
+    transformations = transformations or {}
+    steps: List[BatchTransform] = []
+
+    field_mappings = transformations.get("field_mappings")
+    if field_mappings:
+        steps.append(_for_each_row([_compile_field_mappings(field_mappings)]))
+
+    divisions = _divisions(transformations)
+    if divisions:
+        steps.append(_compile_column_divisions(divisions, load_numpy() if use_numpy else None))
+
+    extractions = _compile_field_extractions(transformations.get("field_extractions") or {})
+    if extractions:
+        steps.append(_for_each_row(extractions))
+    return steps
+
+
+def load_numpy() -> Any:
+    """Return the numpy module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _divisions(transformations: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """Return the (field, divisor) pairs of the `divide` value transformations."""
+    divisions = []
+    for field, transform_config in (transformations.get("value_transformations") or {}).items():
+        if transform_config.get("type") == "divide":
+            if "divisor" not in transform_config:
+                raise ValueError(f"Value transformation for field '{field}' is missing 'divisor'")
+            divisions.append((field, transform_config["divisor"]))
+    return divisions
+
+
+def _for_each_row(row_steps: List[RowTransform]) -> BatchTransform:
+    """Run row steps over every row of a batch."""
+    steps = tuple(row_steps)
+
+    def transform_rows(rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            for step in steps:
+                step(row)
+
+    return transform_rows
+
+
+def _compile_field_mappings(field_mappings: Dict[str, str]) -> RowTransform:
+    """Rename fields, in config order."""
+    pairs = tuple(field_mappings.items())
+
+    def rename_fields(row: Dict[str, Any]) -> None:
+        for old_field, new_field in pairs:
+            if old_field in row:
+                row[new_field] = row.pop(old_field)
+
+    return rename_fields
+
+
+def _compile_divisions(divisions: List[Tuple[str, Any]]) -> RowTransform:
+    """Divide numeric (or numeric string) fields, nulling values that cannot be divided."""
+    pairs = tuple(divisions)
+
+    def divide(row: Dict[str, Any]) -> None:
+        for field, divisor in pairs:
+            if field not in row:
+                continue
+            original_value = row[field]
+            try:
+                if isinstance(original_value, (int, float, str)):
+                    row[field] = float(original_value) / divisor
+                else:
+                    logger.warning(f"Cannot divide non-numeric value in field '{field}': {original_value}")
+                    row[field] = None
+            except (ValueError, TypeError, ZeroDivisionError) as e:
+                logger.warning(f"Error transforming field '{field}': {e}")
+                row[field] = None
+
+    return divide
+
+
+def _compile_column_divisions(divisions: List[Tuple[str, Any]], numpy: Any = None) -> BatchTransform:
+    """Divide numeric (or numeric string) fields a column at a time, nulling values that cannot be divided."""
+    pairs = tuple(divisions)
+
+    def divide_columns(rows: List[Dict[str, Any]]) -> None:
+        for field, divisor in pairs:
+            try:
+                present = rows
+                values = [row[field] for row in rows]
+            except KeyError:
+                present = [row for row in rows if field in row]
+                values = [row[field] for row in present]
+            if not values:
+                continue
+
+            results: Optional[List[Any]] = None
+            # Bad types, bad strings and a zero divisor all take the per-value path, which warns per row
+            if divisor != 0 and set(map(type, values)) <= _DIVISIBLE_TYPES:
+                try:
+                    if numpy is not None and len(values) >= NUMPY_MIN_VALUES:
+                        results = (numpy.array(values, dtype=numpy.float64) / divisor).tolist()
+                    else:
+                        results = [float(value) / divisor for value in values]
+                except (ValueError, TypeError):
+                    results = None
+            if results is None:
+                results = [_divided_or_none(field, value, divisor) for value in values]
+
+            for row, result in zip(present, results):
+                row[field] = result
+
+    return divide_columns
+
+
+def _divided_or_none(field: str, value: Any, divisor: Any) -> Any:
+    """Divide one value like the row pipeline does, returning None if it cannot be divided."""
+    try:
+        if isinstance(value, (int, float, str)):
+            return float(value) / divisor
+        logger.warning(f"Cannot divide non-numeric value in field '{field}': {value}")
+    except (ValueError, TypeError, ZeroDivisionError) as e:
+        logger.warning(f"Error transforming field '{field}': {e}")
+    return None
+
+
+def _scaled(numeric: Any, exp: Any) -> Any:
+    """Return `numeric / 10**exp`, reusing precomputed powers of ten."""
+    power = _POWERS_OF_TEN.get(exp)
+    return numeric / (power if power is not None else 10 ** exp)
+
+
+_POWERS_OF_TEN = {exp: 10 ** exp for exp in range(31)}
+
+
+def _compile_field_extractions(field_extractions: Dict[str, Dict[str, Any]]) -> List[RowTransform]:
+    """Compile field extractions, fusing `nested_array` lookups per source field."""
+    # Fusing reorders extractions, which is only safe when no extraction writes
+    # to a field another one reads from.
+    source_fields = {config.get("source_field") for config in field_extractions.values()}
+    can_fuse = not source_fields.intersection(field_extractions)
+
+    # Group first, compile afterwards: a fused step sits where its first extraction was
+    plan: List[Tuple[str, Any, Any]] = []
+    fused: Dict[Any, Dict[str, List[str]]] = {}
+    for new_field, extraction_config in field_extractions.items():
+        source_field = extraction_config.get("source_field")
+        extraction_type = extraction_config.get("type")
+
+        if extraction_type == "nested_array":
+            filter_type = extraction_config.get("filter_type", "")
+            if not can_fuse:
+                plan.append(("nested_array", source_field, {filter_type: [new_field]}))
+            elif source_field in fused:
+                fused[source_field].setdefault(filter_type, []).append(new_field)
+            else:
+                fused[source_field] = {filter_type: [new_field]}
+                plan.append(("nested_array", source_field, fused[source_field]))
+        elif extraction_type == "first_array_item":
+            plan.append(("first_array_item", source_field, new_field))
+
+    return [
+        _compile_nested_array(source_field, target)
+        if extraction_type == "nested_array"
+        else _compile_first_array_item(source_field, target)
+        for extraction_type, source_field, target in plan
+    ]
+
+
+def _compile_nested_array(source_field: str, targets: Dict[str, List[str]]) -> RowTransform:
+    """
+    Extract values from array items by their `type`, in a single pass.
+
+    `targets` maps each wanted `type` to the fields it fills. The first matching
+    item wins for each type, and the scan stops once every type has been seen.
+    """
+    # Each wanted type gets one bit, so a row's progress is a single int
+    wanted = {
+        item_type: (1 << index, tuple(new_fields))
+        for index, (item_type, new_fields) in enumerate(targets.items())
+    }
+    all_seen = (1 << len(wanted)) - 1
+
+    def extract_nested_array(row: Dict[str, Any]) -> None:
+        array_data = row.get(source_field)
+        if not isinstance(array_data, list):
+            return
+        seen = 0
+        for item in array_data:
+            if not isinstance(item, dict):
+                continue
+            match = wanted.get(item.get("type", ""))
+            if match is None or seen & match[0]:
+                continue
+            seen |= match[0]
+            if "numeric" in item and "exp" in item:
+                value = _scaled(item["numeric"], item["exp"])
+                for new_field in match[1]:
+                    row[new_field] = value
+            elif "text" in item:
+                value = float(item["text"])
+                for new_field in match[1]:
+                    row[new_field] = value
+            if seen == all_seen:
+                break
+
+    return extract_nested_array
+
+
+def _compile_first_array_item(source_field: str, new_field: str) -> RowTransform:
+    """Extract the value of the first item of an array."""
+    def extract_first_array_item(row: Dict[str, Any]) -> None:
+        array_data = row.get(source_field)
+        if isinstance(array_data, list) and array_data and isinstance(array_data[0], dict):
+            item = array_data[0]
+            if "numeric" in item and "exp" in item:
+                row[new_field] = _scaled(item["numeric"], item["exp"])
+            elif "text" in item:
+                row[new_field] = float(item["text"])
+
+    return extract_first_array_item
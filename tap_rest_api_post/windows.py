@@ -0,0 +1,64 @@
+# tap_rest_api_post/windows.py
+"""Date and epoch window helpers for partitioned streams."""
+
+import logging
+from datetime import date, timedelta
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+WINDOW_UNITS = ("day", "week", "month")
+
+
+def parse_date(value: str) -> date:
+    """Parse the date part of an ISO date or datetime string."""
+    return date.fromisoformat(str(value)[:10])
+
+
+def _next_boundary(day: date, unit: str) -> date:
+    """Return the first day of the calendar window following `day`."""
+    if unit == "day":
+        return day + timedelta(days=1)
+    if unit == "week":
+        return day + timedelta(days=7 - day.weekday())
+    if unit == "month":
+        if day.month == 12:
+            return date(day.year + 1, 1, 1)
+        return date(day.year, day.month + 1, 1)
+    raise ValueError(f"Unknown window unit '{unit}'. Expected one of {WINDOW_UNITS}.")
+
+
+def date_windows(start: date, end: date, unit: str) -> List[Tuple[date, date]]:
+    """
+    Split the inclusive range [start, end] into calendar-aligned windows.
+
+    Windows cover whole days, weeks (Monday to Sunday) or months, except the
+    first one, which begins at `start`. The last window keeps its full calendar
+    end so that its bounds stay the same from one run to the next; callers clip
+    it to `end` when building the request.
+    """
+    windows = []
+    window_start = start
+    while window_start <= end:
+        next_start = _next_boundary(window_start, unit)
+        windows.append((window_start, next_start - timedelta(days=1)))
+        window_start = next_start
+    return windows
+
+
+def epoch_windows(start: int, end: int, size: int) -> List[Tuple[int, int]]:
+    """
+    Split the inclusive epoch range [start, end] into windows of `size` epochs.
+
+    Windows are aligned to multiples of `size`; as with date windows, only the
+    first one is cut short and the last one keeps its full width.
+    """
+    if size < 1:
+        raise ValueError(f"Epoch window size must be at least 1, got {size}.")
+    windows = []
+    window_start = start
+    while window_start <= end:
+        window_end = (window_start // size + 1) * size - 1
+        windows.append((window_start, window_end))
+        window_start = window_end + 1
+    return windows
@@ -0,0 +1,65 @@
+# tap_rest_api_post/writer.py
+"""Singer message output for tap-rest-api-post."""
+
+import logging
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SingerLineWriter:
+    """
+    Writes serialized Singer messages to stdout, one whole line per call.
+
+    Streams synced on different threads share one writer, so a lock makes every
+    line land in a single write and RECORD/STATE output never interleaves
+    mid-line.
+
+    With a `buffer_size`, serialized RECORD lines are collected and written to
+    stdout's binary buffer once that many bytes are pending. Any other message
+    flushes them first, so a STATE message never reaches the target before the
+    records it covers.
+    """
+
+    def __init__(self, buffer_size: int = 0) -> None:
+        """Initialize the writer."""
+        self.buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+
+    def write_line(self, line: str) -> None:
+        """Write a newline-terminated line and flush it, along with any buffered records."""
+        with self._lock:
+            if self._buffer:
+                self._buffer += line.encode("utf-8")
+                self._flush()
+            else:
+                sys.stdout.write(line)
+                sys.stdout.flush()
+
+    def write_record(self, line: bytes) -> None:
+        """Write a newline-terminated, serialized RECORD line, buffering it up to `buffer_size`."""
+        with self._lock:
+            self._buffer += line
+            if len(self._buffer) >= self.buffer_size:
+                self._flush()
+
+    def flush(self) -> None:
+        """Write out any buffered records."""
+        with self._lock:
+            if self._buffer:
+                self._flush()
+
+    def _flush(self) -> None:
+        stdout = sys.stdout
+        binary = getattr(stdout, "buffer", None)
+        if binary is None:
+            stdout.write(self._buffer.decode("utf-8"))
+            stdout.flush()
+        else:
+            # Anything already written through the text layer goes first
+            stdout.flush()
+            binary.write(self._buffer)
+            binary.flush()
+        self._buffer.clear()
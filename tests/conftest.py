@@ -0,0 +1,138 @@
+"""Shared fixtures: a local stand-in for the rewards API and a helper to sync the tap against it."""
+
+import io
+import json
+import logging
+import sys
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import mock_api  # noqa: E402
+from tap_rest_api_post.tap import TapRestApiPost  # noqa: E402
+
+
+class MockAPI:
+    """A running mock API and the settings it serves."""
+
+    def __init__(self, settings: mock_api.MockAPISettings):
+        self.settings = settings
+        self.server = mock_api.start_server(settings)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def requests(self) -> int:
+        """Return the number of requests received so far."""
+        return self.settings.requests
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class SyncResult:
+    """The messages one sync wrote to stdout."""
+
+    def __init__(self, output: str):
+        self.lines = output.splitlines()
+        self.messages = [json.loads(line) for line in self.lines if line.startswith("{")]
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return [message["record"] for message in self.messages if message["type"] == "RECORD"]
+
+    @property
+    def states(self) -> List[Dict[str, Any]]:
+        return [message["value"] for message in self.messages if message["type"] == "STATE"]
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        """Return the last STATE written."""
+        return self.states[-1]
+
+
+@pytest.fixture
+def mock_server() -> Iterator[Callable[..., MockAPI]]:
+    """Start mock APIs with the given `MockAPISettings` options, without latency unless asked."""
+    servers: List[MockAPI] = []
+
+    def start(**options: Any) -> MockAPI:
+        options.setdefault("latency", 0.0)
+        server = MockAPI(mock_api.MockAPISettings(**options))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
+
+
+@pytest.fixture
+def tap_log(caplog: pytest.LogCaptureFixture) -> Iterator[pytest.LogCaptureFixture]:
+    """Capture the tap's own log records; the SDK replaces the root logger's handlers."""
+    logger = logging.getLogger("tap_rest_api_post")
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+def make_stream(url: str, **overrides: Any) -> Dict[str, Any]:
+    """Build a stream config against the mock API; `pagination` overrides are merged into the defaults."""
+    pagination = {
+        "strategy": "total_pages",
+        "page_param": "page",
+        "page_size_param": "limit",
+        "page_size": 10,
+        "total_pages_path": "$.data.pagination.totalPages",
+    }
+    pagination.update(overrides.pop("pagination", {}))
+    stream = {
+        "name": "rewards",
+        "api_url": url,
+        "path": "/rewards/daily",
+        "api_key": "test",
+        "primary_keys": ["epoch"],
+        "records_path": "$.data.rewards[*]",
+        "body": {"stake_account_address": "test"},
+        "pagination": pagination,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "date": {"type": "string", "format": "date"},
+                "epoch": {"type": "integer"},
+                "timestamp": {"type": "string", "format": "date-time"},
+                "updated_at": {"type": "string", "format": "date-time"},
+                "stakeAccount": {"type": "string"},
+                "validator": {"type": "string"},
+                "principal": {"type": "string"},
+                "epochReward": {"type": "string"},
+                "totalRewards": {"type": "string"},
+                "rewards": {"type": "array"},
+                "balances": {"type": "array"},
+            },
+        },
+    }
+    stream.update(overrides)
+    return stream
+
+
+def make_config(*streams: Dict[str, Any], **overrides: Any) -> Dict[str, Any]:
+    """Build a tap config holding `streams`."""
+    config = {"start_date": "2020-11-01", "current_date": "2021-01-15", "streams": list(streams)}
+    config.update(overrides)
+    return config
+
+
+def run_sync(config: Dict[str, Any], state: Optional[Dict[str, Any]] = None) -> SyncResult:
+    """Sync every stream of `config`, starting from `state`, and return what was written."""
+    tap = TapRestApiPost(config=config, state=state)
+    output = io.StringIO()
+    with redirect_stdout(output):
+        tap.sync_all()
+    return SyncResult(output.getvalue())
@@ -0,0 +1,65 @@
+"""The asyncio request engine."""
+
+import io
+import threading
+from contextlib import redirect_stdout
+
+import pytest
+from singer_sdk.exceptions import FatalAPIError
+
+from conftest import make_config, make_stream, run_sync
+from tap_rest_api_post.tap import TapRestApiPost
+
+pytest.importorskip("aiohttp")
+
+WINDOWS = {"type": "date_string", "start_field": "start_date", "end_field": "end_date", "window": "month"}
+
+
+def engine_threads():
+    return [thread for thread in threading.enumerate() if thread.name == "async-engine"]
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {},
+        {"pagination": {"concurrency": 4}},
+        {"pagination": {"prefetch": 2}},
+        {"replication_key": "date", "date_handling": dict(WINDOWS, window_concurrency=2)},
+    ],
+    ids=["sequential", "concurrent pages", "prefetch", "windows"],
+)
+@pytest.mark.parametrize("gzip", [False, True])
+def test_asyncio_engine_syncs_the_same_records_as_requests(mock_server, overrides, gzip):
+    api = mock_server(pages=5, page_size=10, gzip=gzip)
+
+    expected = run_sync(make_config(make_stream(api.url, **overrides)))
+    result = run_sync(make_config(make_stream(api.url, engine="asyncio", **overrides)))
+
+    assert result.records == expected.records
+    assert result.state == expected.state
+    assert engine_threads() == []
+
+
+def test_asyncio_engine_shuts_down_its_loop(mock_server):
+    api = mock_server(pages=2, page_size=10)
+    tap = TapRestApiPost(config=make_config(make_stream(api.url, engine="asyncio")))
+    with redirect_stdout(io.StringIO()):
+        tap.sync_all()
+
+    engine = tap.async_engine
+    assert engine is not None and engine.requests == 2
+    assert engine.loop.is_closed()
+    assert engine_threads() == []
+
+
+@pytest.mark.parametrize("pagination", [{}, {"concurrency": 4}], ids=["sequential", "concurrent pages"])
+def test_asyncio_engine_errors_propagate_and_shut_down_the_loop(mock_server, pagination):
+    api = mock_server(pages=5, page_size=10, fail_pages=[3], error_status=404)
+    tap = TapRestApiPost(config=make_config(make_stream(api.url, engine="asyncio", pagination=pagination)))
+
+    with redirect_stdout(io.StringIO()), pytest.raises(FatalAPIError, match="404"):
+        tap.sync_all()
+
+    assert tap.async_engine.loop.is_closed()
+    assert engine_threads() == []
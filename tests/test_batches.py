@@ -0,0 +1,48 @@
+"""BATCH message output."""
+
+import gzip
+import json
+from urllib.parse import urlparse
+
+import pytest
+
+from conftest import make_config, make_stream, run_sync
+
+
+def read_batch_file(url):
+    path = urlparse(url).path
+    with open(path, "rb") as file:
+        content = file.read()
+    if path.endswith(".gz"):
+        content = gzip.decompress(content)
+    return [json.loads(line) for line in content.decode("utf-8").splitlines()]
+
+
+@pytest.mark.parametrize("compression", ["gzip", "none"])
+@pytest.mark.parametrize("output", [{}, {"fast_serializer": True}])
+def test_batch_files_hold_the_records_otherwise_written(mock_server, tmp_path, compression, output):
+    api = mock_server(pages=5, page_size=10)
+    batch_config = {
+        "encoding": {"format": "jsonl", "compression": compression},
+        "storage": {"root": f"file://{tmp_path}", "prefix": "rewards-"},
+        "batch_size": 15,
+    }
+    stream = make_stream(api.url, transformations={"field_mappings": {"epochReward": "reward"}})
+
+    expected = run_sync(make_config(make_stream(api.url, batch_messages=False, **stream), output=output))
+    result = run_sync(make_config(stream, batch_config=batch_config, output=output))
+
+    assert result.records == []
+    batches = [message for message in result.messages if message["type"] == "BATCH"]
+    assert [message["stream"] for message in batches] == ["rewards"] * 4
+    assert {message["encoding"]["compression"] for message in batches} == {compression}
+
+    urls = [url for message in batches for url in message["manifest"]]
+    assert len(urls) == 4
+    suffix = ".jsonl.gz" if compression == "gzip" else ".jsonl"
+    assert all(urlparse(url).path.startswith(f"{tmp_path}/rewards-") and url.endswith(suffix) for url in urls)
+
+    records = [record for url in urls for record in read_batch_file(url)]
+    assert [len(read_batch_file(url)) for url in urls] == [15, 15, 15, 5]
+    assert records == expected.records
+    assert result.state == expected.state
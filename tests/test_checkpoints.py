@@ -0,0 +1,53 @@
+"""Page checkpoints."""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+from conftest import SyncResult, make_config, make_stream, run_sync
+
+from tap_rest_api_post.streams import PAGE_CHECKPOINT_KEY, DynamicStream
+from tap_rest_api_post.tap import TapRestApiPost
+
+
+def interrupted_sync(config, monkeypatch, after_page):
+    """Sync `config`, failing right after the checkpoint of `after_page` is written."""
+    save_page_checkpoint = DynamicStream._save_page_checkpoint
+
+    def save_then_fail(self, context, *args, **kwargs):
+        save_page_checkpoint(self, context, *args, **kwargs)
+        if self.get_context_state(context)[PAGE_CHECKPOINT_KEY]["page"] == after_page:
+            raise RuntimeError("interrupted")
+
+    output = io.StringIO()
+    with monkeypatch.context() as patch:
+        patch.setattr(DynamicStream, "_save_page_checkpoint", save_then_fail)
+        with redirect_stdout(output), pytest.raises(RuntimeError, match="interrupted"):
+            TapRestApiPost(config=config).sync_all()
+    return SyncResult(output.getvalue())
+
+
+def test_resume_from_page_checkpoint(mock_server, monkeypatch):
+    api = mock_server(pages=5, page_size=10)
+    config = make_config(make_stream(api.url, pagination={"checkpoint": True}))
+
+    first = interrupted_sync(config, monkeypatch, after_page=2)
+    assert first.state["bookmarks"]["rewards"]["page_checkpoint"]["page"] == 2
+
+    second = run_sync(config, state=first.state)
+    assert api.requests == 5
+    epochs = [record["epoch"] for record in first.records + second.records]
+    assert epochs == list(range(50))
+    assert "page_checkpoint" not in second.state["bookmarks"]["rewards"]
+
+
+def test_page_checkpoint_ignored_when_request_changes(mock_server, monkeypatch, tap_log):
+    api = mock_server(pages=5, page_size=10)
+    stream = make_stream(api.url, pagination={"checkpoint": True})
+    first = interrupted_sync(make_config(stream), monkeypatch, after_page=2)
+
+    changed = make_config(dict(stream, body={"stake_account_address": "other"}))
+    second = run_sync(changed, state=first.state)
+    assert "request body or date range changed" in tap_log.text
+    assert api.requests == 2 + 5
+    assert [record["epoch"] for record in second.records] == list(range(50))
@@ -0,0 +1,62 @@
+"""Streams fetched at the same time."""
+
+import io
+from contextlib import redirect_stdout
+
+import pytest
+from conftest import SyncResult, make_config, make_stream, run_sync
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_rest_api_post.tap import TapRestApiPost
+
+
+def record_streams(result):
+    return [message["stream"] for message in result.messages if message["type"] == "RECORD"]
+
+
+@pytest.mark.parametrize("output", [{}, {"fast_serializer": True, "buffer_size": 4096}])
+def test_streams_fetched_ahead_are_written_whole_and_in_order(mock_server, tap_log, output):
+    apis = [mock_server(pages=5, page_size=20, latency=0.01) for _ in range(3)]
+    streams = [make_stream(api.url, name=f"rewards_{index}") for index, api in enumerate(apis)]
+    result = run_sync(make_config(*streams, concurrent_sync={"max_workers": 3}, output=output))
+
+    assert "Fetching stream 'rewards_2' ahead" in tap_log.text
+    # Every line is one whole message, and each stream's records follow its SCHEMA without interleaving
+    assert len(result.messages) == len(result.lines)
+    assert record_streams(result) == ["rewards_0"] * 100 + ["rewards_1"] * 100 + ["rewards_2"] * 100
+    for index in range(3):
+        types = [message["type"] for message in result.messages if message.get("stream") == f"rewards_{index}"]
+        assert types.index("SCHEMA") < types.index("RECORD")
+    assert [record["epoch"] for record in result.records] == list(range(100)) * 3
+
+
+def test_stream_fetched_ahead_fails_when_reached(mock_server):
+    ok = mock_server(pages=3, page_size=10, latency=0.01)
+    broken = mock_server(pages=3, page_size=10, error_rate=1.0, error_status=404)
+    # The SDK syncs streams in name order
+    streams = [
+        make_stream(ok.url, name="a_first"),
+        make_stream(broken.url, name="b_broken"),
+        make_stream(ok.url, name="c_last"),
+    ]
+    config = make_config(*streams, concurrent_sync={"max_workers": 3})
+
+    output = io.StringIO()
+    with redirect_stdout(output), pytest.raises(FatalAPIError):
+        TapRestApiPost(config=config).sync_all()
+    result = SyncResult(output.getvalue())
+
+    # The stream before it is written in full, and the one fetched after it is not written
+    assert record_streams(result) == ["a_first"] * 30
+    assert "c_last" not in {message.get("stream") for message in result.messages}
+
+
+def test_page_hashes_of_streams_fetched_ahead_are_saved(mock_server):
+    apis = [mock_server(pages=3, page_size=10) for _ in range(2)]
+    streams = [make_stream(api.url, name=f"rewards_{index}", skip_unchanged_pages=True) for index, api in enumerate(apis)]
+    config = make_config(*streams, concurrent_sync={"max_workers": 2})
+
+    first = run_sync(config)
+    assert len(first.records) == 60
+    assert all(len(first.state["bookmarks"][f"rewards_{index}"]["page_hashes"]) == 3 for index in range(2))
+    assert run_sync(config, state=first.state).records == []
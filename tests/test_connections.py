@@ -0,0 +1,42 @@
+"""Shared connection pools."""
+
+import pytest
+import requests
+
+from conftest import make_config, make_stream, run_sync
+from tap_rest_api_post.connections import HTTP2Adapter
+
+
+@pytest.mark.skipif(not HTTP2Adapter.available(), reason="httpx with HTTP/2 support is not installed")
+@pytest.mark.parametrize("options", [{"stream_parsing": True}, {"spool": {"threshold_mb": 0.001}}])
+def test_http2_responses_can_be_streamed(mock_server, options):
+    api = mock_server(pages=3, page_size=10)
+    config = make_config(make_stream(api.url, **options), connection_pool={"http2": True})
+
+    result = run_sync(config)
+
+    assert [record["epoch"] for record in result.records] == list(range(30))
+
+
+@pytest.mark.skipif(not HTTP2Adapter.available(), reason="httpx with HTTP/2 support is not installed")
+def test_http2_adapter_uses_the_session_proxy_and_drops_encoding_headers(mock_server):
+    api = mock_server(pages=1, page_size=5, gzip=True)
+    adapter = HTTP2Adapter()
+    # Only reachable through the proxy, which the mock API stands in for
+    request = requests.Request(
+        "POST",
+        "http://rewards.invalid/rewards/daily?page=1&limit=5",
+        json={"stake_account_address": "test"},
+        headers={"Accept-Encoding": "gzip"},
+    ).prepare()
+
+    try:
+        response = adapter.send(request, timeout=5, proxies={"http": api.url})
+    finally:
+        adapter.close()
+
+    assert response.status_code == 200
+    # httpx has decoded the body, so the headers must not describe its gzip encoding
+    assert "Content-Encoding" not in response.headers
+    assert "Content-Length" not in response.headers
+    assert len(response.json()["data"]["rewards"]) == 5
@@ -0,0 +1,107 @@
+"""Primary-key deduplication."""
+
+import pytest
+
+from conftest import make_config, make_stream, run_sync
+from tap_rest_api_post.dedupe import BloomFilter, LRUKeySet, RecordDeduplicator
+
+
+@pytest.mark.parametrize("dedupe", [{"strategy": "lru"}, {"strategy": "bloom", "expected_keys": 1000}])
+def test_duplicates_across_pages_are_dropped(mock_server, dedupe):
+    api = mock_server(pages=6, page_size=10)
+    # 13 validators: every page repeats validators already emitted by earlier pages
+    stream = make_stream(api.url, primary_keys=["validator"], dedupe=dedupe)
+
+    result = run_sync(make_config(stream))
+
+    assert [record["epoch"] for record in result.records] == list(range(13))
+
+
+@pytest.mark.parametrize("dedupe", [{"strategy": "lru"}, {"strategy": "bloom"}])
+def test_distinct_records_are_kept(mock_server, dedupe):
+    api = mock_server(pages=6, page_size=10)
+
+    result = run_sync(make_config(make_stream(api.url, dedupe=dedupe)))
+
+    assert [record["epoch"] for record in result.records] == list(range(60))
+
+
+def test_lru_set_forgets_the_least_recently_seen_key():
+    keys = LRUKeySet(max_keys=2)
+    assert [keys.add(key) for key in ("a", "b", "a", "c")] == [False, False, True, False]
+    # "b" was the least recently seen when "c" came in
+    assert keys.add("a") is True
+    assert keys.add("b") is False
+
+
+def test_bloom_filter_never_forgets_and_bounds_false_positives():
+    bloom = BloomFilter(expected_keys=1000, false_positive_rate=0.01)
+    new = sum(not bloom.add(f"key{i}") for i in range(1000))
+    assert new > 980
+    assert bloom.count == new
+    assert all(bloom.add(f"key{i}") for i in range(1000))
+
+    # Adding a key also inserts it, so probe with few enough keys not to fill the filter
+    false_positives = sum(bloom.add(f"other{i}") for i in range(200))
+    assert false_positives < 10
+
+
+def test_bloom_filter_false_positive_drops_a_record_and_is_counted():
+    # Far more keys than the filter is sized for: distinct records start looking seen
+    bloom = BloomFilter(expected_keys=8, false_positive_rate=0.5)
+    deduplicator = RecordDeduplicator("rewards", ["epoch"], bloom)
+
+    kept = [i for i in range(100) if not deduplicator.is_duplicate({"epoch": i})]
+
+    assert deduplicator.records == 100
+    assert 0 < deduplicator.dropped == 100 - len(kept) == 100 - bloom.count
+
+
+def test_bloom_filter_warns_past_its_expected_keys(tap_log):
+    bloom = BloomFilter(expected_keys=10, false_positive_rate=0.001)
+    for i in range(10):
+        bloom.add(f"key{i}")
+    assert "Bloom filter" not in tap_log.text
+
+    for i in range(10, 20):
+        bloom.add(f"key{i}")
+    assert "more than its expected 10 keys" in tap_log.text
+
+    tap_log.clear()
+    for i in range(20, 30):
+        bloom.add(f"key{i}")
+    assert "Bloom filter" not in tap_log.text
+
+
+def test_keys_are_built_from_every_primary_key():
+    deduplicator = RecordDeduplicator("rewards", ["epoch", "validator"], LRUKeySet())
+
+    assert deduplicator.key({"epoch": 1, "validator": "v1"}) == deduplicator.key({"validator": "v1", "epoch": 1})
+    assert deduplicator.key({"epoch": 1, "validator": "v1"}) != deduplicator.key({"epoch": 1, "validator": "v2"})
+    # Values that repr() the same but differ in type stay apart
+    assert deduplicator.key({"epoch": 1}) != deduplicator.key({"epoch": "1"})
+    assert deduplicator.key({"epoch": 1}) == deduplicator.key({"epoch": 1, "validator": None})
+    # Non-scalar keys are encoded as JSON, independent of dict order
+    assert deduplicator.key({"epoch": {"a": 1, "b": 2}}) == deduplicator.key({"epoch": {"b": 2, "a": 1}})
+
+    assert not deduplicator.is_duplicate({"epoch": 1, "validator": "v1", "other": "x"})
+    assert deduplicator.is_duplicate({"epoch": 1, "validator": "v1", "other": "y"})
+    assert not deduplicator.is_duplicate({"epoch": 1, "validator": "v2"})
+
+
+def test_from_config():
+    assert RecordDeduplicator.from_config("rewards", ["epoch"], None) is None
+    assert RecordDeduplicator.from_config("rewards", ["epoch"], {"strategy": ""}) is None
+    assert RecordDeduplicator.from_config("rewards", [], {"strategy": "lru"}) is None
+
+    lru = RecordDeduplicator.from_config("rewards", ["epoch"], {"strategy": "lru", "max_keys": 5})
+    assert isinstance(lru.keys, LRUKeySet) and lru.keys.max_keys == 5
+
+    bloom = RecordDeduplicator.from_config(
+        "rewards", ["epoch"], {"strategy": "bloom", "expected_keys": 100, "false_positive_rate": 0.05}
+    )
+    assert isinstance(bloom.keys, BloomFilter)
+    assert (bloom.keys.expected_keys, bloom.keys.false_positive_rate) == (100, 0.05)
+
+    with pytest.raises(ValueError, match="Unknown dedupe strategy"):
+        RecordDeduplicator.from_config("rewards", ["epoch"], {"strategy": "exact"})
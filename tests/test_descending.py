@@ -0,0 +1,28 @@
+"""Stopping newest-first pagination at the bookmark."""
+
+import pytest
+from conftest import make_config, make_stream, run_sync
+
+
+@pytest.mark.parametrize("concurrency", [1, 2])
+def test_descending_pages_stop_at_mapped_bookmark(mock_server, concurrency):
+    # The replication key only exists once `timestamp` is renamed by the field mappings
+    api = mock_server(pages=5, page_size=10, descending=True)
+    stream = make_stream(
+        api.url,
+        replication_key="updated_at",
+        pagination={"sort_order": "desc"},
+        transformations={"field_mappings": {"timestamp": "updated_at"}},
+        fan_out={"field": "stake_account_address", "values": ["a", "b"], "concurrency": concurrency},
+    )
+    config = make_config(stream)
+
+    first = run_sync(config)
+    # Without bookmarks every page of both partitions is read
+    assert api.requests == 10
+    assert len(first.records) == 100
+
+    # Each partition's bookmark is its newest record, so its first page reaches it
+    second = run_sync(config, state=first.state)
+    assert api.requests == 12
+    assert len(second.records) == 20
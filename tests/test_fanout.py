@@ -0,0 +1,95 @@
+"""Fanning a stream out over request body values."""
+
+import json
+from collections import Counter
+
+import pytest
+
+from conftest import make_config, make_stream, run_sync
+from tap_rest_api_post.fanout import fan_out_contexts, fan_out_values
+
+ACCOUNTS = [f"account{index:02d}" for index in range(10)]
+
+
+def sent_values(api, field):
+    """Return every value of `field` sent to the API, flattening chunks of values."""
+    values = []
+    for body in api.settings.bodies:
+        value = body[field]
+        values.extend(value if isinstance(value, list) else [value])
+    return values
+
+
+@pytest.mark.parametrize("values_per_partition", [1, 3, 10, 25])
+def test_partitions_cover_every_value_exactly_once(values_per_partition):
+    contexts = fan_out_contexts("account", ACCOUNTS, values_per_partition)
+
+    if values_per_partition == 1:
+        values = [context["account"] for context in contexts]
+    else:
+        assert all(len(context["account"]) <= values_per_partition for context in contexts)
+        values = [value for context in contexts for value in context["account"]]
+    assert values == ACCOUNTS
+    assert len(contexts) == -(-len(ACCOUNTS) // values_per_partition)
+
+
+def test_values_per_partition_must_be_positive():
+    with pytest.raises(ValueError, match="at least 1"):
+        fan_out_contexts("account", ACCOUNTS, 0)
+
+
+def test_values_and_values_files_are_merged_without_repeats(tmp_path, tap_log):
+    json_file = tmp_path / "accounts.json"
+    json_file.write_text(json.dumps(ACCOUNTS[3:6] + [{"id": 1}]))
+    text_file = tmp_path / "accounts.txt"
+    text_file.write_text("# accounts\n" + "\n".join(ACCOUNTS[5:]) + "\n\n")
+
+    assert fan_out_values({"field": "account", "values": ACCOUNTS[:4], "values_file": str(json_file)}) == (
+        ACCOUNTS[:6] + [{"id": 1}]
+    )
+    assert "Ignoring 1 repeated fan-out values" in tap_log.text
+    assert fan_out_values({"field": "account", "values": ACCOUNTS[:6], "values_file": str(text_file)}) == ACCOUNTS
+
+
+@pytest.mark.parametrize(
+    "fan_out",
+    [
+        {"values_per_partition": 1, "concurrency": 1},
+        {"values_per_partition": 1, "concurrency": 4},
+        {"values_per_partition": 3, "concurrency": 3},
+    ],
+    ids=["sequential", "concurrent", "chunked"],
+)
+def test_synced_partitions_request_every_value_exactly_once(mock_server, fan_out):
+    api = mock_server(pages=2, page_size=10)
+    stream = make_stream(
+        api.url,
+        replication_key="date",
+        fan_out=dict(fan_out, field="stake_account_address", values=ACCOUNTS + ACCOUNTS[:2]),
+    )
+
+    result = run_sync(make_config(stream))
+
+    partitions = -(-len(ACCOUNTS) // fan_out["values_per_partition"])
+    # Every value is sent with both pages of exactly one partition
+    assert Counter(sent_values(api, "stake_account_address")) == {account: 2 for account in ACCOUNTS}
+    assert api.requests == partitions * 2
+    assert len(result.records) == partitions * 20
+    assert len(result.state["bookmarks"]["rewards"]["partitions"]) == partitions
+
+
+def test_fan_out_covers_every_value_in_every_window(mock_server):
+    api = mock_server(pages=1, page_size=10)
+    date_handling = {"type": "date_string", "start_field": "start_date", "end_field": "end_date", "window": "month"}
+    stream = make_stream(
+        api.url,
+        replication_key="date",
+        date_handling=dict(date_handling, window_concurrency=2),
+        fan_out={"field": "stake_account_address", "values": ACCOUNTS[:4], "concurrency": 2},
+    )
+
+    run_sync(make_config(stream))
+
+    # November, December and January for each account
+    requests = Counter((body["stake_account_address"], body["start_date"][:7]) for body in api.settings.bodies)
+    assert requests == {(account, month): 1 for account in ACCOUNTS[:4] for month in ("2020-11", "2020-12", "2021-01")}
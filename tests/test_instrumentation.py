@@ -0,0 +1,26 @@
+"""Stage timings and METRIC output."""
+
+import json
+
+from conftest import make_config, make_stream, run_sync
+
+from tap_rest_api_post.instrumentation import StreamInstrumentation
+from tap_rest_api_post.tap import TapRestApiPost
+
+
+def test_streams_are_not_instrumented_without_config(mock_server):
+    api = mock_server(pages=1)
+    tap = TapRestApiPost(config=make_config(make_stream(api.url)))
+    assert tap.streams["rewards"].instrumentation is None
+    assert StreamInstrumentation.from_config("rewards", {"profile_path": "profile.txt"}) is None
+
+
+def test_summary_written_when_configured(mock_server, tmp_path):
+    api = mock_server(pages=3, page_size=10)
+    config = make_config(make_stream(api.url), instrumentation={"summary_dir": str(tmp_path)})
+
+    run_sync(config)
+    summary = json.loads((tmp_path / "rewards.json").read_text())
+    assert summary["records"] == 30
+    assert summary["pages"] == 3
+    assert summary["stages"]["emit"]["calls"] == 30
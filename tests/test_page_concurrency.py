@@ -0,0 +1,45 @@
+"""Pages fetched on worker threads or prefetched."""
+
+import io
+import threading
+from contextlib import redirect_stdout
+
+import pytest
+from conftest import SyncResult, make_config, make_stream, run_sync
+from singer_sdk.exceptions import FatalAPIError
+
+from tap_rest_api_post.tap import TapRestApiPost
+
+PAGINATIONS = [{"concurrency": 4}, {"prefetch": 3}]
+
+
+@pytest.mark.parametrize("pagination", PAGINATIONS)
+def test_pages_are_written_in_order_once(mock_server, pagination):
+    api = mock_server(pages=12, page_size=10, latency=0.005)
+    result = run_sync(make_config(make_stream(api.url, pagination=pagination)))
+
+    assert [record["epoch"] for record in result.records] == list(range(120))
+    assert api.requests == 12
+
+
+@pytest.mark.parametrize("pagination", PAGINATIONS)
+def test_failing_page_raises_instead_of_hanging(mock_server, pagination):
+    api = mock_server(pages=12, page_size=10, latency=0.005, error_status=404, fail_pages=[7])
+    config = make_config(make_stream(api.url, pagination=pagination))
+    output = io.StringIO()
+    errors = []
+
+    def sync():
+        try:
+            with redirect_stdout(output):
+                TapRestApiPost(config=config).sync_all()
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=sync, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+    assert not thread.is_alive(), "the sync hung on the failed page"
+    assert len(errors) == 1 and isinstance(errors[0], FatalAPIError)
+    # Every page before the failed one is written, and nothing after it
+    assert [record["epoch"] for record in SyncResult(output.getvalue()).records] == list(range(60))
@@ -0,0 +1,59 @@
+"""Skipping pages unchanged since the last sync."""
+
+import json
+
+from conftest import make_config, make_stream, run_sync
+
+
+def test_unchanged_pages_skipped_with_hashes_in_state(mock_server):
+    api = mock_server(pages=3, page_size=10)
+    config = make_config(make_stream(api.url, skip_unchanged_pages=True))
+
+    first = run_sync(config)
+    assert len(first.records) == 30
+    assert len(first.state["bookmarks"]["rewards"]["page_hashes"]) == 3
+
+    # Every page is still requested, but none of their records are emitted
+    second = run_sync(config, state=first.state)
+    assert api.requests == 6
+    assert second.records == []
+
+    # One more page changes the totals in every body, so every page is new again
+    api.settings.pages = 4
+    third = run_sync(config, state=second.state)
+    assert [record["epoch"] for record in third.records] == list(range(40))
+
+
+def test_unchanged_pages_skipped_with_hashes_in_file(mock_server, tmp_path):
+    api = mock_server(pages=3, page_size=10)
+    path = tmp_path / "page_hashes.json"
+    config = make_config(
+        make_stream(api.url, skip_unchanged_pages=True),
+        page_hashes={"path": str(path)},
+    )
+
+    first = run_sync(config)
+    assert len(first.records) == 30
+    assert len(json.loads(path.read_text())) == 3
+    assert "page_hashes" not in first.state.get("bookmarks", {}).get("rewards", {})
+
+    # The file alone is enough, without the last sync's state
+    second = run_sync(config)
+    assert api.requests == 6
+    assert second.records == []
+
+
+def test_page_hash_file_keeps_streams_and_credentials_apart(mock_server, tmp_path):
+    api = mock_server(pages=3, page_size=10)
+    path = tmp_path / "page_hashes.json"
+
+    def sync(**overrides):
+        stream = make_stream(api.url, skip_unchanged_pages=True, **overrides)
+        return run_sync(make_config(stream, page_hashes={"path": str(path)}))
+
+    sync()
+    # The same requests under another API key or stream name are new pages
+    assert len(sync(api_key="other").records) == 30
+    assert len(sync(name="rewards_copy").records) == 30
+    assert len(sync().records) == 0
+    assert sorted(key.split(":")[0] for key in json.loads(path.read_text())) == ["rewards"] * 6 + ["rewards_copy"] * 3
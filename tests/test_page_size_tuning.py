@@ -0,0 +1,18 @@
+"""Automatic page sizes."""
+
+from conftest import make_config, make_stream, run_sync
+
+
+def test_tuned_page_sizes_read_every_record_once(mock_server, tap_log):
+    # Latency makes larger pages faster, so the tuner grows 6 -> 12 -> 24, and
+    # pages of more than 20 records fail, so it backs off and restarts at the page it failed on
+    api = mock_server(pages=10, page_size=10, max_limit=20, latency=0.01)
+    stream = make_stream(
+        api.url,
+        pagination={"page_size": 6, "auto_page_size": {"enabled": True, "min_page_size": 3, "max_page_size": 48}},
+    )
+
+    result = run_sync(make_config(stream))
+    assert "Page size of stream 'rewards': 6 -> 12" in tap_log.text
+    assert "failed to fetch a page of 24 records; backing off" in tap_log.text
+    assert [record["epoch"] for record in result.records] == list(range(100))
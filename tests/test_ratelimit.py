@@ -0,0 +1,147 @@
+"""The adaptive rate limiter."""
+
+import time
+from email.utils import formatdate
+
+import pytest
+import requests
+
+from tap_rest_api_post.ratelimit import AdaptiveRateLimiter, parse_reset, parse_retry_after
+
+
+def make_response(status_code=200, **headers):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update({name.replace("_", "-"): value for name, value in headers.items()})
+    return response
+
+
+def complete(limiter, response):
+    limiter.release(limiter.acquire(), response)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("", None),
+        ("120", 120.0),
+        ("1.5", 1.5),
+        ("-3", 0.0),
+        ("soon", None),
+        (formatdate(1_000_030, usegmt=True), 30.0),
+        (formatdate(999_990, usegmt=True), 0.0),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value, now=1_000_000) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, None),
+        ("later", None),
+        ("60", 60.0),
+        ("60, 3600", 60.0),
+        ("1700000045", 45.0),
+        ("1699999990", 0.0),
+    ],
+)
+def test_parse_reset(value, expected):
+    assert parse_reset(value, now=1_700_000_000) == expected
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_throttling_halves_the_concurrency_limit(status):
+    limiter = AdaptiveRateLimiter(max_concurrency=16, min_concurrency=1)
+    for _ in range(3):
+        complete(limiter, make_response(200))
+    assert limiter.concurrency == 4  # slow start adds one per success
+
+    complete(limiter, make_response(status))
+    assert limiter.concurrency == 2
+    assert limiter.throttled == 1
+
+    # Back in congestion avoidance, successes grow the limit by about one per round
+    complete(limiter, make_response(200))
+    assert limiter.concurrency == 2.5
+
+
+def test_throttled_requests_sent_before_a_decrease_count_once():
+    limiter = AdaptiveRateLimiter(max_concurrency=8)
+    for _ in range(7):
+        complete(limiter, make_response(200))
+    assert limiter.concurrency == 8
+
+    started = [limiter.acquire() for _ in range(4)]
+    for start in started:
+        limiter.release(start, make_response(429))
+
+    assert limiter.concurrency == 4
+    assert limiter.throttled == 4
+
+
+def test_concurrency_limit_stays_within_bounds():
+    limiter = AdaptiveRateLimiter(max_concurrency=3, min_concurrency=2)
+    for _ in range(10):
+        complete(limiter, make_response(200))
+    assert limiter.concurrency == 3
+
+    for _ in range(5):
+        complete(limiter, make_response(429))
+        time.sleep(0.001)
+    assert limiter.concurrency == 2
+
+
+def test_errors_other_than_throttling_leave_the_limit_alone():
+    limiter = AdaptiveRateLimiter(max_concurrency=8)
+    complete(limiter, make_response(500))
+    complete(limiter, make_response(404))
+    complete(limiter, None)
+    assert limiter.concurrency == 1
+    assert limiter.throttled == 0
+
+
+def test_retry_after_pauses_requests():
+    limiter = AdaptiveRateLimiter()
+    complete(limiter, make_response(429, Retry_After="0.3"))
+    assert 0.2 < limiter.pause_remaining() <= 0.3
+
+    started = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.25
+
+
+def test_exhausted_rate_limit_pauses_until_the_reset():
+    limiter = AdaptiveRateLimiter()
+    complete(limiter, make_response(200, X_RateLimit_Remaining="0", X_RateLimit_Reset="0.3"))
+    assert 0.2 < limiter.pause_remaining() <= 0.3
+
+    complete(limiter, make_response(200, X_RateLimit_Remaining="0", X_RateLimit_Reset=str(int(time.time()) + 60)))
+    assert limiter.pause_remaining() > 55
+
+
+def test_remaining_budget_is_spread_over_the_window():
+    limiter = AdaptiveRateLimiter(burst=1)
+    complete(limiter, make_response(200, RateLimit_Remaining="10", RateLimit_Reset="1"))
+
+    started = time.monotonic()
+    for _ in range(3):
+        complete(limiter, make_response(200))
+    # 10 requests per second: the bucket of one refills every 0.1s
+    assert time.monotonic() - started >= 0.25
+
+
+def test_token_bucket_allows_a_burst_then_paces():
+    limiter = AdaptiveRateLimiter(requests_per_second=20, burst=3, max_concurrency=10)
+
+    started = time.monotonic()
+    for _ in range(3):
+        complete(limiter, make_response(200))
+    assert time.monotonic() - started < 0.05
+
+    for _ in range(4):
+        complete(limiter, make_response(200))
+    assert time.monotonic() - started >= 0.18
+    assert limiter.requests == 7
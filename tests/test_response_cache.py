@@ -0,0 +1,27 @@
+"""The on-disk response cache."""
+
+from conftest import make_config, make_stream, run_sync
+
+
+def test_cached_responses_are_kept_apart_by_credentials(mock_server, tmp_path):
+    api = mock_server(pages=2, page_size=10)
+    cache = {"directory": str(tmp_path), "closed_windows_only": False, "ttl_seconds": 3600}
+
+    first = run_sync(make_config(make_stream(api.url), response_cache=cache))
+    requests = api.requests
+    second = run_sync(make_config(make_stream(api.url), response_cache=cache))
+    assert api.requests == requests
+    assert second.records == first.records
+
+    run_sync(make_config(make_stream(api.url, api_key="other"), response_cache=cache))
+    assert api.requests == 2 * requests
+
+
+def test_open_date_ranges_are_not_cached_by_default(mock_server, tmp_path):
+    api = mock_server(pages=2, page_size=10)
+    config = make_config(make_stream(api.url), response_cache={"directory": str(tmp_path)})
+
+    run_sync(config)
+    requests = api.requests
+    run_sync(config)
+    assert api.requests == 2 * requests
@@ -0,0 +1,75 @@
+"""Spooling of oversized response bodies."""
+
+import io
+import os
+import random
+
+import pytest
+import requests
+
+from tap_rest_api_post import spool
+from tap_rest_api_post.jsonstream import CHUNK_SIZE
+from tap_rest_api_post.spool import SPOOLED_BODY_ATTR, SpooledBody, spool_response
+
+
+def streamed_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    return response
+
+
+BODY = random.Random(0).randbytes(5 * CHUNK_SIZE + 123)
+
+
+@pytest.mark.parametrize("release_bytes", [spool.RELEASE_BYTES, 4096])
+def test_spooled_body_round_trips_byte_for_byte(tmp_path, monkeypatch, release_bytes):
+    monkeypatch.setattr(spool, "RELEASE_BYTES", release_bytes)
+    response = streamed_response(BODY)
+
+    assert spool_response(response, threshold=CHUNK_SIZE, directory=str(tmp_path))
+    assert isinstance(response.raw, SpooledBody)
+    assert getattr(response, SPOOLED_BODY_ATTR) == len(BODY)
+
+    assert b"".join(response.iter_content(chunk_size=1000)) == BODY
+    # Reading to the end unmaps and closes the file
+    assert response.raw._map.closed and response.raw._file.closed
+    assert os.listdir(tmp_path) == []
+
+
+def test_spooled_file_is_removed_when_closed_early(tmp_path):
+    response = streamed_response(BODY)
+    spool_response(response, threshold=CHUNK_SIZE, directory=str(tmp_path))
+    body = response.raw
+
+    assert body.read(10) == BODY[:10]
+    body.close()
+
+    assert body._file.closed
+    assert body.read(10) == b""
+    assert os.listdir(tmp_path) == []
+
+
+def test_small_body_stays_in_memory(tmp_path):
+    response = streamed_response(BODY)
+
+    assert not spool_response(response, threshold=len(BODY), directory=str(tmp_path))
+    assert response.content == BODY
+    assert not hasattr(response, SPOOLED_BODY_ATTR)
+    assert os.listdir(tmp_path) == []
+
+
+def test_failed_read_closes_the_spool(tmp_path):
+    class BrokenBody(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() >= 2 * CHUNK_SIZE:
+                raise requests.exceptions.ConnectionError("connection reset")
+            return super().read(size)
+
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = BrokenBody(BODY)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        spool_response(response, threshold=CHUNK_SIZE, directory=str(tmp_path))
+    assert os.listdir(tmp_path) == []
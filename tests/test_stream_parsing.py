@@ -0,0 +1,84 @@
+"""Incremental parsing of response bodies (`stream_parsing`)."""
+
+import json
+
+import pytest
+from jsonpath_ng.ext import parse as jsonpath_parse
+
+from conftest import make_config, make_stream, run_sync
+from tap_rest_api_post.jsonstream import iter_json_path
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [
+        {"pagination": {"total_pages_path": "$..totalPages"}},
+        # The page count is decoded with the record holding it
+        {"records_path": "$.data", "pagination": {"total_pages_path": "$.data.pagination.totalPages"}},
+    ],
+)
+def test_unstreamable_total_pages_path_parses_whole_responses(mock_server, tap_log, paths):
+    api = mock_server(pages=3, page_size=10)
+    stream = make_stream(api.url, stream_parsing=True, **paths)
+
+    run_sync(make_config(stream))
+
+    assert "Parsing whole responses instead of streaming them" in tap_log.text
+    assert api.requests == 3
+
+
+def chunked_text(text, size):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+DOCUMENTS = [
+    {"data": {"rewards": [{"epoch": 1, "amount": 1.5e-7}, {"epoch": 2, "amount": -12}], "pagination": {"totalPages": 3}}},
+    {"data": {"pagination": {"totalPages": 2}, "meta": [1, {"rewards": []}], "rewards": [{"text": "café ☃ \"q\""}]}},
+    {"data": {"rewards": [], "pagination": {"totalPages": 0}}},
+    {"data": {"rewards": {"epoch": 5}, "pagination": {}}},
+    {"data": {"rewards": None}},
+    {"data": {"other": [1, 2, 3]}},
+    {"data": {"rewards": [[1, 2], "x", 10000000000000000000000, True, None, {"nested": {"rewards": [9]}}]}},
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("records_path", ["$.data.rewards[*]", "$.data.rewards", "$.data[*]", "$"])
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_iter_json_path_matches_jsonpath_ng(document, records_path, chunk_size, indent):
+    text = json.dumps(document, indent=indent, ensure_ascii=False)
+    captures = {}
+
+    records = list(
+        iter_json_path(chunked_text(text, chunk_size), records_path, ["$.data.pagination.totalPages"], captures)
+    )
+
+    assert records == [match.value for match in jsonpath_parse(records_path).find(document)]
+    if records_path.startswith("$.data.rewards"):
+        # Streams only capture paths outside records_path; see test_unstreamable_total_pages_path_parses_whole_responses
+        total_pages = [match.value for match in jsonpath_parse("$.data.pagination.totalPages").find(document)]
+        assert list(captures.values()) == total_pages
+
+
+def test_iter_json_path_root_array():
+    text = json.dumps([{"epoch": 1}, {"epoch": 2}])
+    assert list(iter_json_path(chunked_text(text, 3), "$[*]")) == [{"epoch": 1}, {"epoch": 2}]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"stream_parsing": True},
+        {"stream_parsing": True, "compression": {"response_encodings": ["gzip"]}},
+        {"spool": {"threshold_mb": 0.001}},
+    ],
+)
+def test_streamed_sync_matches_whole_response_sync(mock_server, options):
+    api = mock_server(pages=4, page_size=25, gzip=True)
+
+    expected = run_sync(make_config(make_stream(api.url)))
+    streamed = run_sync(make_config(make_stream(api.url, **options)))
+
+    assert len(expected.records) == 100
+    assert streamed.records == expected.records
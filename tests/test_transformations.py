@@ -0,0 +1,191 @@
+"""Compiled record transformations."""
+
+import copy
+
+import pytest
+
+from tap_rest_api_post.transformations import (
+    NUMPY_MIN_VALUES,
+    compile_batch_transformations,
+    compile_transformations,
+)
+
+
+def reference_post_process(row, transformations):
+    """The per-row transformations as the stream applied them before they were compiled."""
+    if "field_mappings" in transformations:
+        for old_field, new_field in transformations["field_mappings"].items():
+            if old_field in row:
+                row[new_field] = row.pop(old_field)
+
+    if "value_transformations" in transformations:
+        for field, transform_config in transformations["value_transformations"].items():
+            if field in row and transform_config.get("type") == "divide":
+                try:
+                    divisor = transform_config["divisor"]
+                    original_value = row[field]
+                    if isinstance(original_value, (int, float, str)):
+                        row[field] = float(original_value) / divisor
+                    else:
+                        row[field] = None
+                except (ValueError, TypeError, ZeroDivisionError):
+                    row[field] = None
+
+    if "field_extractions" in transformations:
+        for new_field, extraction_config in transformations["field_extractions"].items():
+            source_field = extraction_config.get("source_field")
+            extraction_type = extraction_config.get("type")
+            if source_field in row and extraction_type == "nested_array":
+                array_data = row.get(source_field, [])
+                if isinstance(array_data, list):
+                    for item in array_data:
+                        if isinstance(item, dict) and item.get("type", "") == extraction_config.get("filter_type", ""):
+                            if "numeric" in item and "exp" in item:
+                                row[new_field] = item["numeric"] / (10 ** item["exp"])
+                            elif "text" in item:
+                                row[new_field] = float(item["text"])
+                            break
+            elif source_field in row and extraction_type == "first_array_item":
+                array_data = row.get(source_field, [])
+                if isinstance(array_data, list) and len(array_data) > 0:
+                    item = array_data[0]
+                    if isinstance(item, dict):
+                        if "numeric" in item and "exp" in item:
+                            row[new_field] = item["numeric"] / (10 ** item["exp"])
+                        elif "text" in item:
+                            row[new_field] = float(item["text"])
+    return row
+
+
+REWARDS = [
+    {"type": "protocol", "numeric": 5003, "exp": 9},
+    {"type": "mev", "numeric": 211, "exp": 3},
+    {"type": "protocol", "numeric": 1, "exp": 0},
+    {"type": "fee", "text": "0.000005"},
+    {"type": "empty"},
+    "not an item",
+]
+
+CASES = {
+    "mappings": (
+        {"field_mappings": {"epochReward": "reward", "reward": "reward_again", "missing": "absent"}},
+        {"epochReward": "10", "other": 1},
+    ),
+    "divide numbers and numeric strings": (
+        {"value_transformations": {"a": {"type": "divide", "divisor": 4}, "b": {"type": "divide", "divisor": 1e9}}},
+        {"a": 10, "b": "123456789012"},
+    ),
+    "divide a bad type": (
+        {"value_transformations": {"a": {"type": "divide", "divisor": 2}, "b": {"type": "divide", "divisor": 2}}},
+        {"a": [1, 2], "b": {"nested": 1}},
+    ),
+    "divide a bad string": (
+        {"value_transformations": {"a": {"type": "divide", "divisor": 2}}},
+        {"a": "not a number"},
+    ),
+    "divide by zero": (
+        {"value_transformations": {"a": {"type": "divide", "divisor": 0}, "b": {"type": "other"}}},
+        {"a": 5, "b": 5},
+    ),
+    "divide after a mapping": (
+        {"field_mappings": {"raw": "a"}, "value_transformations": {"a": {"type": "divide", "divisor": 8}}},
+        {"raw": "2"},
+    ),
+    "nested_array": (
+        {
+            "field_extractions": {
+                "protocol": {"type": "nested_array", "source_field": "rewards", "filter_type": "protocol"},
+                "protocol_again": {"type": "nested_array", "source_field": "rewards", "filter_type": "protocol"},
+                "mev": {"type": "nested_array", "source_field": "rewards", "filter_type": "mev"},
+                "fee": {"type": "nested_array", "source_field": "rewards", "filter_type": "fee"},
+                "empty": {"type": "nested_array", "source_field": "rewards", "filter_type": "empty"},
+                "unknown": {"type": "nested_array", "source_field": "rewards", "filter_type": "unknown"},
+                "not_a_list": {"type": "nested_array", "source_field": "scalar", "filter_type": "protocol"},
+            }
+        },
+        {"rewards": REWARDS, "scalar": 3},
+    ),
+    "first_array_item": (
+        {
+            "field_extractions": {
+                "first": {"type": "first_array_item", "source_field": "rewards"},
+                "first_text": {"type": "first_array_item", "source_field": "fees"},
+                "empty": {"type": "first_array_item", "source_field": "none"},
+                "not_a_dict": {"type": "first_array_item", "source_field": "strings"},
+            }
+        },
+        {"rewards": REWARDS, "fees": [{"text": "1.5"}], "none": [], "strings": ["a"]},
+    ),
+    "extraction reading another extraction's target": (
+        {
+            "field_extractions": {
+                "rewards": {"type": "first_array_item", "source_field": "balances"},
+                "protocol": {"type": "nested_array", "source_field": "rewards", "filter_type": "protocol"},
+            }
+        },
+        {"rewards": REWARDS, "balances": [{"numeric": 7, "exp": 1}]},
+    ),
+}
+
+
+@pytest.mark.parametrize("transformations, row", CASES.values(), ids=CASES.keys())
+def test_compiled_pipeline_matches_the_per_row_transformations(transformations, row):
+    expected = reference_post_process(copy.deepcopy(row), transformations)
+
+    actual = copy.deepcopy(row)
+    for step in compile_transformations(transformations):
+        step(actual)
+
+    assert actual == expected
+
+
+def test_divide_without_divisor_fails_when_compiled():
+    with pytest.raises(ValueError, match="missing 'divisor'"):
+        compile_transformations({"value_transformations": {"a": {"type": "divide"}}})
+
+
+def column(count):
+    """Rows with clean columns of ints, floats and numeric strings, and columns with a bad value or a missing field."""
+    rows = [
+        {"a": index, "b": f"{index}.5", "c": float(index), "e": index * 7_919, "f": f"{index}.25", "g": index / 3}
+        for index in range(count)
+    ]
+    rows[count // 2]["a"] = "not a number"
+    rows[count // 3]["b"] = [1]
+    del rows[count // 4]["c"]
+    return rows
+
+
+COLUMN_TRANSFORMATIONS = {
+    "field_mappings": {"raw": "a"},
+    "value_transformations": {
+        "a": {"type": "divide", "divisor": 3},
+        "b": {"type": "divide", "divisor": 1e9},
+        "c": {"type": "divide", "divisor": 0},
+        "d": {"type": "divide", "divisor": 2},
+        "e": {"type": "divide", "divisor": 1e9},
+        "f": {"type": "divide", "divisor": 7},
+        "g": {"type": "divide", "divisor": 0.5},
+    },
+    "field_extractions": {"first": {"type": "first_array_item", "source_field": "b"}},
+}
+
+
+@pytest.mark.parametrize("use_numpy", [True, False], ids=["numpy", "python"])
+@pytest.mark.parametrize(
+    "transformations, rows",
+    [(transformations, [copy.deepcopy(row) for _ in range(3)]) for transformations, row in CASES.values()]
+    + [(COLUMN_TRANSFORMATIONS, column(NUMPY_MIN_VALUES - 1)), (COLUMN_TRANSFORMATIONS, column(500))],
+    ids=[*CASES.keys(), "short columns", "long columns"],
+)
+def test_batch_transformations_match_the_row_transformations(transformations, rows, use_numpy):
+    expected = copy.deepcopy(rows)
+    for row in expected:
+        for step in compile_transformations(transformations):
+            step(row)
+
+    actual = copy.deepcopy(rows)
+    for step in compile_batch_transformations(transformations, use_numpy=use_numpy):
+        step(actual)
+
+    assert actual == expected
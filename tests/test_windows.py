@@ -0,0 +1,25 @@
+"""Date window partitions."""
+
+from conftest import make_config, make_stream, run_sync
+
+
+def test_incremental_sync_skips_finished_windows(mock_server):
+    api = mock_server(pages=3, page_size=10)
+    stream = make_stream(
+        api.url,
+        replication_key="date",
+        date_handling={"type": "date_string", "start_field": "start_date", "end_field": "end_date", "window": "month"},
+    )
+    config = make_config(stream)
+
+    first = run_sync(config)
+    # November, December and January, three pages each
+    assert api.requests == 9
+    assert len(first.records) == 90
+
+    # The mock ignores the date range, so every window's bookmark is its newest
+    # record, 2021-01-18: November and December are finished, January is not
+    second = run_sync(config, state=first.state)
+    assert api.requests == 12
+    assert len(second.records) == 30
+